@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""
+Backup benchmark. Starts fake Cisco, Juniper and Mikrotik SSH servers
+on loopback addresses and runs TaskHandler.exec_task against them.
+With --connection restconf, netconf, api, scp or sftp stand-in RESTCONF,
+NETCONF, RouterOS API or file transfer servers are started instead.
+
+Example:
+    python3 benchmarks/bench_backup.py --devices 300 --latency 0.05
+    python3 benchmarks/bench_backup.py --devices 300 --connection netconf
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from threading import Lock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_ssh_server import FakeNetwork, FakeVendor  # noqa: E402
+from fake_api_server import (  # noqa: E402
+    FakeNetconfVendor,
+    FakeRestconfVendor,
+    FakeRouterOSVendor,
+    FakeTransferVendor,
+)
+
+VENDOR_PORTS: dict[str, int] = {
+    "cisco": 2201,
+    "juniper": 2202,
+    "mikrotik": 2203,
+}
+# stand-in servers and ports added to VENDOR_PORTS, by the connection
+SERVERS: dict[str, tuple[type[FakeVendor], int]] = {
+    "ssh": (FakeVendor, 0),
+    "restconf": (FakeRestconfVendor, 6000),
+    "netconf": (FakeNetconfVendor, 6100),
+    "api": (FakeRouterOSVendor, 6200),
+    "scp": (FakeTransferVendor, 6300),
+    "sftp": (FakeTransferVendor, 6300),
+}
+
+
+class PhaseTimer:
+    """
+    An object that collects time spent in wrapped functions.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = defaultdict(float)
+        self.devices: list[float] = []
+        self._lock: Lock = Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def wrap(self, owner: object, name: str, phase: str) -> None:
+        """The function replaces owner.name with a timed version."""
+        func = getattr(owner, name)
+        timer: PhaseTimer = self
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed(*args, **kwargs):
+                start: float = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timer.add(phase, time.perf_counter() - start)
+
+        else:
+
+            @functools.wraps(func)
+            def timed(*args, **kwargs):
+                start: float = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timer.add(phase, time.perf_counter() - start)
+
+        setattr(owner, name, timed)
+
+    def wrap_device(self, owner: object, name: str) -> None:
+        """The function records the latency of every device task."""
+        func = getattr(owner, name)
+        timer: PhaseTimer = self
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed(*args, **kwargs):
+                start: float = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    with timer._lock:
+                        timer.devices.append(time.perf_counter() - start)
+
+        else:
+
+            @functools.wraps(func)
+            def timed(*args, **kwargs):
+                start: float = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    with timer._lock:
+                        timer.devices.append(time.perf_counter() - start)
+
+        setattr(owner, name, timed)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """The function returns the percentile of the values."""
+    if len(values) == 0:
+        return 0.0
+    values = sorted(values)
+    index: int = min(
+        len(values) - 1, int(round(pct / 100 * (len(values) - 1)))
+    )
+    return values[index]
+
+
+def build_network(args: argparse.Namespace) -> tuple[FakeNetwork, dict]:
+    """
+    The function creates fake vendors and the devices file content.
+    Every device gets its own 127.x.y.z address.
+    """
+    vendors: list[str] = args.vendors.split(",")
+    server, port_offset = SERVERS[args.connection]
+    hosts: dict[str, list[str]] = {vendor: [] for vendor in vendors}
+    devices_data: dict[str, dict] = {}
+    for i in range(args.devices):
+        vendor: str = vendors[i % len(vendors)]
+        index: int = vendors.index(vendor) + 1
+        host: str = f"127.{index}.{i // 250}.{i % 250 + 1}"
+        hosts[vendor].append(host)
+        devices_data[host] = {
+            "name": f"bench-{i}",
+            "vendor": vendor,
+            "port": VENDOR_PORTS[vendor] + port_offset,
+            "connection": args.connection,
+            "username": "bench",
+            "password": "bench",
+            "privilege": None,
+            "key_file": None,
+            "passphrase": None,
+        }
+    fake_vendors: list[FakeVendor] = [
+        server(
+            vendor,
+            hosts[vendor],
+            VENDOR_PORTS[vendor] + port_offset,
+            args.config_lines,
+            args.latency,
+            args.fail_rate,
+        )
+        for vendor in vendors
+        if len(hosts[vendor]) > 0
+    ]
+    return FakeNetwork(fake_vendors), devices_data
+
+
+def instrument(timer: PhaseTimer) -> None:
+    """
+    The function wraps the backup path to measure its phases.
+    """
+    from netinfscript.task.task_handler import TaskHandler
+    from netinfscript.task.backup_task import BackupTask
+    from netinfscript.connections.conn_ssh import ConnSSH
+    from netinfscript.connections.conn_async_ssh import ConnAsyncSSH
+    from netinfscript.connections.conn_restconf import ConnRESTCONF
+    from netinfscript.connections.conn_netconf import ConnNETCONF
+    from netinfscript.connections.conn_routeros import ConnRouterOS
+    from netinfscript.connections.conn_transfer import ConnTransfer
+    from netinfscript.devices.base_device import BaseDevice
+
+    timer.wrap_device(TaskHandler, "devices_backup")
+    timer.wrap_device(TaskHandler, "devices_backup_async")
+    timer.wrap(ConnSSH, "_get_conection_and_send", "fetch")
+    timer.wrap(ConnAsyncSSH, "_get_conection_and_send", "fetch")
+    timer.wrap(ConnSSH, "_send", "command")
+    timer.wrap(ConnAsyncSSH, "_send", "command")
+    timer.wrap(ConnRESTCONF, "get_config", "fetch")
+    timer.wrap(ConnRESTCONF, "_request", "command")
+    timer.wrap(ConnNETCONF, "get_config", "fetch")
+    timer.wrap(ConnNETCONF, "_download", "command")
+    timer.wrap(ConnRouterOS, "get_config", "fetch")
+    timer.wrap(ConnRouterOS, "_download", "command")
+    timer.wrap(ConnTransfer, "get_config", "fetch")
+    timer.wrap(ConnTransfer, "_download", "command")
+    timer.wrap(BaseDevice, "write_filtered", "filter")
+    timer.wrap(BackupTask, "make_file_operations", "file_git")
+
+
+def count_outcomes(statuses: dict[str, int], configs_dir: Path) -> dict:
+    """
+    The function sorts the statuses of the run report into ok and
+    failed backups and counts stored configurations that are empty.
+    """
+    ok: int = statuses.get("changed", 0) + statuses.get("unchanged", 0)
+    empty: int = sum(
+        1
+        for path in configs_dir.rglob("*_conf.txt")
+        if ".git" not in path.parts and path.stat().st_size == 0
+    )
+    return {
+        "ok": ok,
+        "failed": sum(statuses.values()) - ok,
+        "empty": empty,
+        "statuses": statuses,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    """The function runs the benchmark and returns the report."""
+    work_dir: Path = Path(tempfile.mkdtemp(prefix="netinfscript-bench-"))
+    network, devices_data = build_network(args)
+    # host keys of the fake devices are trusted through a private HOME
+    (work_dir / ".ssh").mkdir()
+    (work_dir / ".ssh" / "known_hosts").write_text(network.known_hosts())
+    os.environ["HOME"] = str(work_dir)
+    devices_file: Path = work_dir / "devices.json"
+    devices_file.write_text(json.dumps(devices_data))
+    configs_dir: Path = work_dir / "configs"
+    configs_dir.mkdir()
+
+    from netinfscript.task.task_handler import TaskHandler
+
+    timer: PhaseTimer = PhaseTimer()
+    instrument(timer)
+    run_settings: dict = {
+        "engine": args.engine,
+        "max_concurrency": args.concurrency,
+        "git_mode": args.git_mode,
+        "hash_index": False,
+        # the stand-in RESTCONF server has a self-signed certificate
+        "verify_certificates": False,
+    }
+    network.start()
+    try:
+        task_handler: TaskHandler = TaskHandler(
+            devices_file, configs_dir, run_settings
+        )
+        task_handler.exe_func = "backup"
+        start: float = time.perf_counter()
+        task_handler.exec_task()
+        task_handler.close()
+        elapsed: float = time.perf_counter() - start
+        outcomes: dict = count_outcomes(
+            task_handler.report.summary()["statuses"], configs_dir
+        )
+    finally:
+        network.stop()
+    phases: dict[str, float] = dict(timer.phases)
+    phases["connect"] = phases.get("fetch", 0.0) - phases.get("command", 0.0)
+    return {
+        "devices": args.devices,
+        "engine": args.engine,
+        "connection": args.connection,
+        "failing": sum(len(vendor.failing) for vendor in network.vendors),
+        "outcomes": outcomes,
+        "elapsed_s": round(elapsed, 3),
+        "devices_per_s": round(args.devices / elapsed, 2),
+        "latency_p50_s": round(percentile(timer.devices, 50), 4),
+        "latency_p99_s": round(percentile(timer.devices, 99), 4),
+        "latency_mean_s": round(statistics.fmean(timer.devices or [0]), 4),
+        "phase_total_s": {
+            phase: round(phases.get(phase, 0.0), 3)
+            for phase in ["connect", "command", "filter", "file_git"]
+        },
+        "work_dir": str(work_dir),
+    }
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Benchmark backups against fake SSH devices."
+    )
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument(
+        "--vendors",
+        default=None,
+        help="Default: all vendors, only mikrotik for the api connection.",
+    )
+    parser.add_argument("--config-lines", type=int, default=1000)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds per command."
+    )
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.0,
+        help="Part of devices failing.",
+    )
+    parser.add_argument(
+        "--engine", choices=["async", "threading"], default="async"
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--connection", choices=list(SERVERS), default="ssh"
+    )
+    parser.add_argument(
+        "--git-mode", choices=["per_device", "shared"], default="shared"
+    )
+    args: argparse.Namespace = parser.parse_args()
+    if args.vendors is None:
+        # only RouterOS has the API connection
+        args.vendors = "cisco,juniper,mikrotik"
+        if args.connection == "api":
+            args.vendors = "mikrotik"
+    logging.basicConfig(
+        level=(
+            logging.CRITICAL
+            if not os.environ.get("BENCH_DEBUG")
+            else logging.WARNING
+        )
+    )
+    result: dict = run(args)
+    print(json.dumps(result, indent=2))
+    # throughput of failed backups means nothing, the run must
+    # back up every device except those set up to fail
+    outcomes: dict = result["outcomes"]
+    if (
+        outcomes["ok"] != args.devices - result["failing"]
+        or outcomes["failed"] != result["failing"]
+        or outcomes["empty"] > 0
+    ):
+        print(
+            f"Unexpected outcomes: {outcomes['ok']} ok, "
+            f"{outcomes['failed']} failed, {outcomes['empty']} empty, "
+            f"{result['failing']} set up to fail.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""
+Stand-in RESTCONF (HTTPS), NETCONF (SSH subsystem), RouterOS API
+and SCP/SFTP servers for the backup benchmark. Every loopback address
+is a device.
+"""
+
+import asyncio
+import base64
+import datetime
+import gzip
+import json
+import re
+import ssl
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from xml.sax.saxutils import escape
+import asyncssh
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from fake_ssh_server import FakeDeviceServer, FakeVendor, make_config
+from netinfscript.connections.conn_routeros import encode_sentence
+
+NETCONF_NS: str = "urn:ietf:params:xml:ns:netconf:base:1.0"
+EOM: str = "]]>]]>"
+RESTCONF_PATHS: dict[str, str] = {
+    "cisco": "/restconf/data/Cisco-IOS-XE-native:native",
+    "juniper": "/restconf/data",
+    "mikrotik": "/restconf/data",
+}
+
+
+def make_structured(vendor: str, name: str, lines: int) -> dict:
+    """
+    The function returns a structured configuration with about
+    the number of lines, when written as indented JSON or XML.
+    """
+    interfaces: list[dict] = [
+        {"name": f"{i}", "description": f"{name} link {i}"}
+        for i in range(lines // 4)
+    ]
+    return {"hostname": name, "vendor": vendor, "interface": interfaces}
+
+
+def structured_for(vendor: FakeVendor, host: str) -> dict:
+    """The function returns the configuration of the device."""
+    name: str = f"{vendor.vendor[0].upper()}{zlib.crc32(host.encode())}"
+    return make_structured(vendor.vendor, name, vendor.config_lines)
+
+
+def to_xml(value: object, tag: str) -> str:
+    """The function writes the value as XML elements."""
+    if isinstance(value, dict):
+        inner: str = "".join(to_xml(v, k) for k, v in value.items())
+        return f"<{tag}>{inner}</{tag}>"
+    if isinstance(value, list):
+        return "".join(to_xml(item, tag) for item in value)
+    return f"<{tag}>{escape(str(value))}</{tag}>"
+
+
+def make_certificate() -> ssl.SSLContext:
+    """
+    The function returns the server TLS context with a self-signed
+    certificate, so the client must not verify certificates.
+    """
+    key: ec.EllipticCurvePrivateKey = ec.generate_private_key(
+        ec.SECP256R1()
+    )
+    subject: x509.Name = x509.Name(
+        [x509.NameAttribute(NameOID.COMMON_NAME, "bench")]
+    )
+    now: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+    certificate: x509.Certificate = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    folder: Path = Path(tempfile.mkdtemp(prefix="netinfscript-tls-"))
+    (folder / "cert.pem").write_bytes(
+        certificate.public_bytes(serialization.Encoding.PEM)
+    )
+    (folder / "key.pem").write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(folder / "cert.pem", folder / "key.pem")
+    return context
+
+
+class FakeRestconfVendor(FakeVendor):
+    """
+    An object that emulates RESTCONF of all devices of one vendor.
+    Connections are kept alive, like on real devices.
+    """
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """The function answers requests of one connection."""
+        host: str = writer.get_extra_info("sockname")[0]
+        try:
+            while True:
+                request: bytes = await reader.readuntil(b"\r\n\r\n")
+                path: str = request.split(b" ")[1].decode()
+                auth: str = base64.b64encode(b"bench:bench").decode()
+                await asyncio.sleep(self.latency)
+                if host in self.failing or auth.encode() not in request:
+                    status, body = "401 Unauthorized", b""
+                elif path.partition("?")[0] != RESTCONF_PATHS[self.vendor]:
+                    status, body = "404 Not Found", b""
+                else:
+                    status = "200 OK"
+                    data: dict = structured_for(self, host)
+                    # like real devices, state is sent without the query
+                    if "content=config" not in path.partition("?")[2]:
+                        data["state"] = {"uptime": int(time.monotonic())}
+                    body = json.dumps(data).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/yang-data+json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    def known_hosts_line(self) -> str:
+        """The function returns no entry, the server doesn't use SSH."""
+        return ""
+
+    async def start(self) -> asyncio.AbstractServer:
+        """The function starts listening."""
+        return await asyncio.start_server(
+            self._serve,
+            self.hosts,
+            self.port,
+            ssl=make_certificate(),
+            reuse_address=True,
+        )
+
+
+class FakeNetconfVendor(FakeVendor):
+    """
+    An object that emulates the NETCONF subsystem of all devices
+    of one vendor. Both framings are used, like on real devices.
+    """
+
+    @staticmethod
+    async def _read(
+        process: asyncssh.SSHServerProcess, chunked: bool
+    ) -> str:
+        """The function returns the next message of the client."""
+        if not chunked:
+            return (await process.stdin.readuntil(EOM))[: -len(EOM)]
+        data: str = await process.stdin.readuntil("\n##\n")
+        return "".join(re.split(r"\n#\d+\n", data[: -len("\n##\n")])[1:])
+
+    @staticmethod
+    def _write(
+        process: asyncssh.SSHServerProcess, message: str, chunked: bool
+    ) -> None:
+        """The function writes the message with the framing."""
+        if chunked:
+            size: int = len(message.encode())
+            process.stdout.write(f"\n#{size}\n{message}\n##\n")
+        else:
+            process.stdout.write(message + EOM)
+
+    async def _handle(self, process: asyncssh.SSHServerProcess) -> None:
+        """The function serves the NETCONF subsystem."""
+        host: str = process.get_extra_info("sockname")[0]
+        if process.subsystem != "netconf":
+            process.exit(1)
+            return
+        try:
+            self._write(
+                process,
+                f'<hello xmlns="{NETCONF_NS}"><capabilities>'
+                "<capability>urn:ietf:params:netconf:base:1.0</capability>"
+                "<capability>urn:ietf:params:netconf:base:1.1</capability>"
+                "</capabilities><session-id>1</session-id></hello>",
+                False,
+            )
+            await self._read(process, False)
+            while True:
+                request: str = await self._read(process, True)
+                message_id: str = re.search(
+                    r'message-id="([^"]*)"', request
+                ).group(1)
+                if "close-session" in request:
+                    self._write(
+                        process,
+                        f'<rpc-reply message-id="{message_id}" '
+                        f'xmlns="{NETCONF_NS}"><ok/></rpc-reply>',
+                        True,
+                    )
+                    break
+                await asyncio.sleep(self.latency)
+                data: str = to_xml(
+                    structured_for(self, host), "configuration"
+                )
+                self._write(
+                    process,
+                    f'<rpc-reply message-id="{message_id}" '
+                    f'xmlns="{NETCONF_NS}"><data>{data}</data></rpc-reply>',
+                    True,
+                )
+            process.exit(0)
+        except (asyncio.IncompleteReadError, asyncssh.Error):
+            pass
+        except (BrokenPipeError, ConnectionError):
+            pass
+
+
+
+class FakeRouterOSVendor(FakeVendor):
+    """
+    An object that emulates the RouterOS API of all devices
+    of one vendor. Only some menus are known, print of other
+    menus is answered with !trap, like on older versions.
+    """
+
+    @staticmethod
+    async def _read_sentence(reader: asyncio.StreamReader) -> list[str]:
+        """The function returns words of the next sentence."""
+        words: list[str] = []
+        while True:
+            first: int = (await reader.readexactly(1))[0]
+            if first < 0x80:
+                length: int = first
+            elif first < 0xC0:
+                second: bytes = await reader.readexactly(1)
+                length = ((first & 0x3F) << 8) + second[0]
+            else:
+                raise ConnectionError("word too long for the stand-in")
+            if length == 0:
+                return words
+            words.append((await reader.readexactly(length)).decode())
+
+    def _items(self, host: str, command: str) -> list[dict[str, str]] | None:
+        """The function returns the items of the printed menu."""
+        structured: dict = structured_for(self, host)
+        if command == "/system/identity/print":
+            return [{"name": structured["hostname"]}]
+        if command == "/interface/ethernet/print":
+            return [
+                {
+                    ".id": f"*{i + 1}",
+                    "name": f"ether{interface['name']}",
+                    "default-name": f"ether{interface['name']}",
+                    "comment": interface["description"],
+                    "running": "true",
+                    "link-downs": str(i % 3),
+                }
+                for i, interface in enumerate(structured["interface"])
+            ]
+        if command == "/interface/wireguard/print":
+            return [
+                {
+                    ".id": "*1",
+                    "name": "wg1",
+                    "listen-port": "13231",
+                    "private-key": "c2VjcmV0LWtleS1vZi10aGUtYmVuY2htYXJr",
+                }
+            ]
+        if command == "/ip/dns/print":
+            return [{"servers": "192.0.2.1,192.0.2.2", "allow-remote": "no"}]
+        return None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """The function answers sentences of one connection."""
+        host: str = writer.get_extra_info("sockname")[0]
+        try:
+            login: list[str] = await self._read_sentence(reader)
+            if host in self.failing or "=password=bench" not in login:
+                writer.write(
+                    encode_sentence(["!trap", "=message=invalid user name"])
+                    + encode_sentence(["!done"])
+                )
+                await writer.drain()
+                return
+            writer.write(encode_sentence(["!done"]))
+            while True:
+                words: list[str] = await self._read_sentence(reader)
+                if words[0] == "/quit":
+                    writer.write(encode_sentence(["!fatal", "=message=bye"]))
+                    await writer.drain()
+                    return
+                tag: list[str] = [w for w in words if w.startswith(".tag=")]
+                items: list[dict[str, str]] | None = self._items(
+                    host, words[0]
+                )
+                if items is not None:
+                    await asyncio.sleep(self.latency)
+                else:
+                    writer.write(
+                        encode_sentence(
+                            ["!trap", "=message=no such command"] + tag
+                        )
+                    )
+                    items = []
+                for item in items:
+                    attributes: list[str] = [
+                        f"={key}={value}" for key, value in item.items()
+                    ]
+                    writer.write(encode_sentence(["!re"] + attributes + tag))
+                writer.write(encode_sentence(["!done"] + tag))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def known_hosts_line(self) -> str:
+        """The function returns no entry, the server doesn't use SSH."""
+        return ""
+
+    async def start(self) -> asyncio.AbstractServer:
+        """The function starts listening."""
+        return await asyncio.start_server(
+            self._serve, self.hosts, self.port, reuse_address=True
+        )
+
+
+
+class FakeTransferVendor(FakeVendor):
+    """
+    An object that emulates SCP and SFTP of all devices of one vendor.
+    Every device has its own folder with the configuration file
+    at the path used by the vendor class.
+    """
+
+    # file of the configuration, relative to the folder of the device
+    FILES: dict[str, str] = {
+        "cisco": "system:running-config",
+        "juniper": "config/juniper.conf.gz",
+        "mikrotik": "netinfscript-backup.rsc",
+    }
+
+    def _write_files(self) -> Path:
+        """The function writes config files of all devices."""
+        root: Path = Path(tempfile.mkdtemp(prefix="netinfscript-files-"))
+        for host in self.hosts:
+            file_path: Path = root / host / self.FILES[self.vendor]
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            data: bytes = self.config_for(host).encode()
+            if file_path.suffix == ".gz":
+                data = gzip.compress(data)
+            file_path.write_bytes(data)
+        return root
+
+    async def _handle(self, process: asyncssh.SSHServerProcess) -> None:
+        """
+        The function answers commands run before and after the copy,
+        the file already exists.
+        """
+        await asyncio.sleep(self.latency)
+        process.exit(0)
+
+    async def start(self) -> asyncssh.SSHAcceptor:
+        """The function starts listening."""
+        root: Path = self._write_files()
+
+        def sftp_factory(chan: asyncssh.SSHServerChannel):
+            host: str = chan.get_extra_info("sockname")[0]
+            return asyncssh.SFTPServer(chan, chroot=str(root / host))
+
+        return await asyncssh.create_server(
+            lambda: FakeDeviceServer(self.failing),
+            self.hosts,
+            self.port,
+            server_host_keys=[self.host_key],
+            process_factory=self._handle,
+            sftp_factory=sftp_factory,
+            allow_scp=True,
+            reuse_address=True,
+        )
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import asyncio
+import random
+import threading
+import zlib
+import asyncssh
+
+# prompt of the emulated device and the command that shows the config
+VENDORS: dict[str, dict] = {
+    "cisco": {
+        "prompt": "{name}#",
+        "show_config": "show running-config view full",
+        "replies": {
+            "show configuration id": "Configuration ID : 1736071200",
+        },
+    },
+    "juniper": {
+        "prompt": "bench@{name}> ",
+        "show_config": "show config | display set",
+        # netmiko checks the answers of the session setup commands
+        "replies": {
+            "set cli screen-width": "Screen width set to 511",
+            "set cli screen-length": "Screen length set to 0",
+            "set cli complete-on-space": "Disabling complete-on-space",
+            "show system commit": "0   2026-01-05 10:00:00 UTC by bench",
+        },
+    },
+    "mikrotik": {
+        "prompt": "[bench@{name}] > ",
+        "show_config": "/export",
+        "replies": {
+            "/system history print": "Flags: U - undoable",
+        },
+    },
+}
+
+
+def make_config(vendor: str, name: str, lines: int) -> str:
+    """
+    The function returns a configuration looking like the vendor's,
+    with headers the vendor filters remove.
+    """
+    body: list[str] = []
+    if vendor == "cisco":
+        body.append("Building configuration...")
+        body.append("")
+        body.append(f"Current configuration : {lines * 30} bytes")
+        body.append("!")
+        body.append(f"hostname {name}")
+        for i in range(lines // 3):
+            body.append(f"interface GigabitEthernet0/{i}")
+            body.append(f" description {name} link {i}")
+            body.append("!")
+        body.append("end")
+    elif vendor == "juniper":
+        body.append("## Last commit: 2025-01-01 00:00:00 UTC by bench")
+        body.append(f"set system host-name {name}")
+        for i in range(lines):
+            body.append(
+                f"set interfaces ge-0/0/{i} description " f'"{name} link {i}"'
+            )
+    else:
+        body.append("# jan/01/2025 00:00:00 by RouterOS 7.14")
+        body.append("# software id = BENCH")
+        body.append(f"/system identity set name={name}")
+        body.append("/interface ethernet")
+        for i in range(lines):
+            body.append(f'set [ find default-name=ether{i} ] comment="{i}"')
+    return "\r\n".join(body) + "\r\n"
+
+
+class FakeDeviceServer(asyncssh.SSHServer):
+    """
+    SSH server that accepts every user. Connections to failing
+    devices are refused during authentication.
+    """
+
+    def __init__(self, failing: set[str]) -> None:
+        self._failing: set[str] = failing
+        self._conn: asyncssh.SSHServerConnection | None = None
+
+    def connection_made(self, conn: asyncssh.SSHServerConnection) -> None:
+        self._conn = conn
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        host: str = self._conn.get_extra_info("sockname")[0]
+        return host not in self._failing
+
+
+class FakeVendor:
+    """
+    An object that emulates all devices of one vendor.
+    The server listens on one port of many loopback addresses,
+    every address is a different device.
+    """
+
+    def __init__(
+        self,
+        vendor: str,
+        hosts: list[str],
+        port: int,
+        config_lines: int = 1000,
+        latency: float = 0.05,
+        fail_rate: float = 0.0,
+    ) -> None:
+        self.vendor: str = vendor
+        self.hosts: list[str] = hosts
+        self.port: int = port
+        self.config_lines: int = config_lines
+        self.latency: float = latency
+        self.failing: set[str] = {
+            host for host in hosts if random.random() < fail_rate
+        }
+        self.host_key: asyncssh.SSHKey = asyncssh.generate_private_key(
+            "ssh-ed25519"
+        )
+        self._configs: dict[str, str] = {}
+
+    def config_for(self, host: str) -> str:
+        """The function returns the config of the device."""
+        if host not in self._configs:
+            name: str = f"{self.vendor[0].upper()}{zlib.crc32(host.encode())}"
+            self._configs[host] = make_config(
+                self.vendor, name, self.config_lines
+            )
+        return self._configs[host]
+
+    def known_hosts_line(self) -> str:
+        """The function returns the known_hosts entry for all hosts."""
+        names: str = ",".join(f"[{host}]:{self.port}" for host in self.hosts)
+        key: str = self.host_key.export_public_key().decode().strip()
+        return f"{names} {key}\n"
+
+    def _answer(self, command: str, host: str) -> str:
+        """The function returns the output of the command."""
+        if command.strip() == VENDORS[self.vendor]["show_config"]:
+            return self.config_for(host)
+        for prefix, reply in VENDORS[self.vendor].get("replies", {}).items():
+            if command.strip().startswith(prefix):
+                return reply + "\r\n"
+        return ""
+
+    async def _handle(self, process: asyncssh.SSHServerProcess) -> None:
+        """
+        The function serves the exec channel or the interactive shell.
+        """
+        host: str = process.get_extra_info("sockname")[0]
+        prompt: str = VENDORS[self.vendor]["prompt"].format(name=host)
+        try:
+            if process.command is not None:
+                await asyncio.sleep(self.latency)
+                process.stdout.write(self._answer(process.command, host))
+                process.exit(0)
+                return
+            process.stdout.write(prompt)
+            while not process.stdin.at_eof():
+                line: str = await process.stdin.readline()
+                # like a device, the typed line is echoed after the
+                # prompt, not while the previous command still runs
+                process.stdout.write(line.rstrip("\r\n") + "\r\n")
+                if line.strip() in ["exit", "quit", "/quit"]:
+                    break
+                await asyncio.sleep(self.latency)
+                process.stdout.write(self._answer(line, host))
+                process.stdout.write("\r\n" + prompt)
+            process.exit(0)
+        except (asyncssh.BreakReceived, asyncssh.TerminalSizeChanged):
+            process.exit(0)
+        except (BrokenPipeError, ConnectionError, asyncssh.Error):
+            pass
+
+    async def start(self) -> asyncssh.SSHAcceptor:
+        """The function starts listening."""
+        return await asyncssh.create_server(
+            lambda: FakeDeviceServer(self.failing),
+            self.hosts,
+            self.port,
+            server_host_keys=[self.host_key],
+            process_factory=self._handle,
+            line_editor=False,
+            reuse_address=True,
+        )
+
+
+class FakeNetwork:
+    """
+    An object that runs fake vendor servers in a background thread
+    with its own event loop.
+    """
+
+    def __init__(self, vendors: list[FakeVendor]) -> None:
+        self.vendors: list[FakeVendor] = vendors
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._loop.run_forever, daemon=True
+        )
+        self._servers: list[asyncssh.SSHAcceptor] = []
+
+    def start(self) -> None:
+        """The function starts all servers."""
+        self._thread.start()
+        for vendor in self.vendors:
+            server = asyncio.run_coroutine_threadsafe(
+                vendor.start(), self._loop
+            ).result()
+            self._servers.append(server)
+
+    def stop(self) -> None:
+        """The function stops all servers."""
+        for server in self._servers:
+            self._loop.call_soon_threadsafe(server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def known_hosts(self) -> str:
+        """The function returns the known_hosts file content."""
+        return "".join(vendor.known_hosts_line() for vendor in self.vendors)
+
+
+if __name__ == "__main__":
+    pass
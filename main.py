@@ -22,7 +22,9 @@ def main() -> None:
     try:
         initialized_system = InitSystem()
         option_handler = OptionHandler(
-            initialized_system.devices_path, initialized_system.configs_path
+            initialized_system.devices_path,
+            initialized_system.configs_path,
+            initialized_system.run_settings,
         )
         option_handler.execute_program()
     except Exception as e:
@@ -17,6 +17,7 @@ import logging
 from configparser import ConfigParser
 from pathlib import Path
 from netinfscript.utils import get_and_valid_path
+from netinfscript.devices.normalize_rules import NormalizeRules
 
 
 class Config_Load:
@@ -115,6 +116,381 @@ class Config_Load:
             print(f"Some error ocure: {e}")
             sys.exit(2)
 
+    def _load_execution(self) -> None:
+        """Load the settings of the engine that executes tasks."""
+        self.run_settings["engine"] = "async"
+        self.run_settings["max_concurrency"] = 200
+        try:
+            _engine: str = self._config["Execution"]["Engine"].lower()
+            if _engine not in ["async", "threading"]:
+                self.logger.warning("Not allowed engine. Using 'async'.")
+            else:
+                self.run_settings["engine"] = _engine
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default engine.")
+        try:
+            _max_concurrency: int = self._config["Execution"].getint(
+                "Max_Concurrency"
+            )
+            if _max_concurrency is not None and _max_concurrency > 0:
+                self.run_settings["max_concurrency"] = _max_concurrency
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default concurrency.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Max_Concurrency value: {e}. Using default."
+            )
+        self.run_settings["stream_devices"] = False
+        try:
+            self.run_settings["stream_devices"] = self._config[
+                "Execution"
+            ].getboolean("Stream_Devices", False)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Devices are not streamed.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Stream_Devices value: {e}. Using default."
+            )
+        self.run_settings["inventory_cache"] = False
+        try:
+            self.run_settings["inventory_cache"] = self._config[
+                "Execution"
+            ].getboolean("Inventory_Cache", False)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Inventory cache not used.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Inventory_Cache value: {e}. Using default."
+            )
+        self.run_settings["process_pool"] = False
+        self.run_settings["process_workers"] = None
+        try:
+            self.run_settings["process_pool"] = self._config[
+                "Execution"
+            ].getboolean("Process_Pool", False)
+            _workers: int | None = self._config["Execution"].getint(
+                "Process_Workers"
+            )
+            if _workers is not None and _workers > 0:
+                self.run_settings["process_workers"] = _workers
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Process pool not used.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong process pool value: {e}. Using default."
+            )
+
+    def _load_storage(self) -> None:
+        """Load the settings of the backup storage."""
+        self.run_settings["git_mode"] = "per_device"
+        try:
+            _git_mode: str = self._config["Storage"]["Git_Mode"].lower()
+            if _git_mode not in ["per_device", "shared"]:
+                self.logger.warning(
+                    "Not allowed git mode. Using 'per_device'."
+                )
+            else:
+                self.run_settings["git_mode"] = _git_mode
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default git mode.")
+        self.run_settings["hash_index"] = True
+        try:
+            self.run_settings["hash_index"] = self._config[
+                "Storage"
+            ].getboolean("Hash_Index", True)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default hash index.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Hash_Index value: {e}. Using default."
+            )
+        self.run_settings["storage_backend"] = "files"
+        try:
+            _backend: str = self._config["Storage"]["Backend"].lower()
+            if _backend not in ["files", "chunks"]:
+                self.logger.warning("Not allowed backend. Using 'files'.")
+            else:
+                self.run_settings["storage_backend"] = _backend
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default backend.")
+        self.run_settings["compression_level"] = 3
+        try:
+            self.run_settings["compression_level"] = self._config[
+                "Storage"
+            ].getint("Compression_Level", 3)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default compression.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Compression_Level value: {e}. Using default."
+            )
+
+    def _load_connections(self) -> None:
+        """Load the settings of the SSH connection pool."""
+        self.run_settings["pool"] = False
+        self.run_settings["pool_idle_timeout"] = 300
+        self.run_settings["pool_max_per_host"] = 2
+        self.run_settings["pool_max_idle"] = 100
+        try:
+            self.run_settings["pool"] = self._config[
+                "Connections"
+            ].getboolean("Pool", False)
+            for option in [
+                "Pool_Idle_Timeout",
+                "Pool_Max_Per_Host",
+                "Pool_Max_Idle",
+            ]:
+                _value: int | None = self._config["Connections"].getint(
+                    option
+                )
+                if _value is not None and _value > 0:
+                    self.run_settings[option.lower()] = _value
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default pool settings.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong connection pool value: {e}. Using default."
+            )
+        self.run_settings["pipeline"] = False
+        try:
+            self.run_settings["pipeline"] = self._config[
+                "Connections"
+            ].getboolean("Pipeline", False)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Pipeline not used.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong Pipeline value: {e}. Using default.")
+        self.run_settings["verify_certificates"] = True
+        try:
+            self.run_settings["verify_certificates"] = self._config[
+                "Connections"
+            ].getboolean("Verify_Certificates", True)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Certificates are verified.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Verify_Certificates value: {e}. Using default."
+            )
+        self.run_settings["transfer_compression"] = False
+        try:
+            self.run_settings["transfer_compression"] = self._config[
+                "Connections"
+            ].getboolean("Transfer_Compression", False)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No transfer compression.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Transfer_Compression value: {e}. Using default."
+            )
+        self.run_settings["change_probe"] = False
+        try:
+            self.run_settings["change_probe"] = self._config[
+                "Connections"
+            ].getboolean("Change_Probe", False)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Change probe not used.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong Change_Probe value: {e}. Using default."
+            )
+        self.run_settings["preflight"] = False
+        self.run_settings["preflight_timeout"] = 3
+        self.run_settings["preflight_concurrency"] = 500
+        try:
+            self.run_settings["preflight"] = self._config[
+                "Connections"
+            ].getboolean("Preflight", False)
+            _timeout: float | None = self._config["Connections"].getfloat(
+                "Preflight_Timeout"
+            )
+            if _timeout is not None and _timeout > 0:
+                self.run_settings["preflight_timeout"] = _timeout
+            _concurrency: int | None = self._config["Connections"].getint(
+                "Preflight_Concurrency"
+            )
+            if _concurrency is not None and _concurrency > 0:
+                self.run_settings["preflight_concurrency"] = _concurrency
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Pre-flight not used.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong pre-flight value: {e}. Using default."
+            )
+        self.run_settings["adaptive_timeout"] = True
+        self.run_settings["read_timeout"] = 60
+        self.run_settings["read_timeout_min"] = 10
+        self.run_settings["read_timeout_max"] = 300
+        self.run_settings["read_timeout_factor"] = 3.0
+        try:
+            self.run_settings["adaptive_timeout"] = self._config[
+                "Connections"
+            ].getboolean("Adaptive_Timeout", True)
+            for option in [
+                "Read_Timeout",
+                "Read_Timeout_Min",
+                "Read_Timeout_Max",
+                "Read_Timeout_Factor",
+            ]:
+                _value: float | None = self._config["Connections"].getfloat(
+                    option
+                )
+                if _value is not None and _value > 0:
+                    self.run_settings[option.lower()] = _value
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default read timeout.")
+        except ValueError as e:
+            self.logger.warning(
+                f"Wrong read timeout value: {e}. Using default."
+            )
+
+    def _load_retry(self) -> None:
+        """Load the settings of retries and device health."""
+        self.run_settings["retries"] = 2
+        self.run_settings["retry_backoff"] = 5
+        self.run_settings["retry_backoff_max"] = 60
+        self.run_settings["unhealthy_below"] = 0.3
+        self.run_settings["unhealthy_connect_timeout"] = 5
+        try:
+            _retries: int | None = self._config["Retry"].getint("Retries")
+            if _retries is not None and _retries >= 0:
+                self.run_settings["retries"] = _retries
+            for option, key in [
+                ("Backoff", "retry_backoff"),
+                ("Backoff_Max", "retry_backoff_max"),
+                ("Unhealthy_Connect_Timeout", "unhealthy_connect_timeout"),
+            ]:
+                _value: float | None = self._config["Retry"].getfloat(option)
+                if _value is not None and _value > 0:
+                    self.run_settings[key] = _value
+            _below: float | None = self._config["Retry"].getfloat(
+                "Unhealthy_Below"
+            )
+            if _below is not None and 0 <= _below <= 1:
+                self.run_settings["unhealthy_below"] = _below
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default retry setup.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong retry value: {e}. Using default.")
+
+    def _load_limits(self) -> None:
+        """Load the limits of sites and AAA servers."""
+        self.run_settings["limit_per_site"] = 0
+        self.run_settings["limit_per_aaa"] = 0
+        self.run_settings["connect_rate"] = 0
+        self.run_settings["connect_burst"] = 1
+        self.run_settings["site_limits"] = {}
+        try:
+            for option, key in [
+                ("Per_Site", "limit_per_site"),
+                ("Per_AAA", "limit_per_aaa"),
+                ("Connect_Burst", "connect_burst"),
+            ]:
+                _value: int | None = self._config["Limits"].getint(option)
+                if _value is not None and _value >= 0:
+                    self.run_settings[key] = _value
+            _rate: float | None = self._config["Limits"].getfloat(
+                "Connect_Rate"
+            )
+            if _rate is not None and _rate >= 0:
+                self.run_settings["connect_rate"] = _rate
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No limits.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong limit value: {e}. Using default.")
+        try:
+            for site, limit in self._config["Site_Limits"].items():
+                self.run_settings["site_limits"][site] = int(limit)
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No site limits.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong site limit: {e}. Skipping.")
+
+    def _load_daemon(self) -> None:
+        """Load the settings of the daemon mode."""
+        self.run_settings["daemon_interval"] = 86400
+        self.run_settings["daemon_jitter"] = 0.1
+        self.run_settings["daemon_group_intervals"] = {}
+        try:
+            _interval: int | None = self._config["Daemon"].getint("Interval")
+            if _interval is not None and _interval > 0:
+                self.run_settings["daemon_interval"] = _interval
+            _jitter: float | None = self._config["Daemon"].getfloat("Jitter")
+            if _jitter is not None and 0 <= _jitter < 1:
+                self.run_settings["daemon_jitter"] = _jitter
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Using default daemon setup.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong daemon value: {e}. Using default.")
+        try:
+            for group, interval in self._config["Daemon_Groups"].items():
+                self.run_settings["daemon_group_intervals"][group] = int(
+                    interval
+                )
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No group intervals.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong group interval: {e}. Skipping.")
+
+    def _load_filter_rules(self) -> None:
+        """
+        Load the filter rules added to the built-in vendor rules.
+        The key is <vendor>_<action>, the value is one regular
+        expression per line.
+        """
+        self.run_settings["filter_rules"] = {}
+        try:
+            for key, value in self._config["Filter_Rules"].items():
+                vendor, _, action = key.rpartition("_")
+                if len(vendor) == 0:
+                    self.logger.warning(f"Wrong filter rule key: {key}.")
+                    continue
+                patterns: list[str] = [
+                    pattern.strip()
+                    for pattern in value.splitlines()
+                    if len(pattern.strip()) > 0
+                ]
+                self.run_settings["filter_rules"].setdefault(vendor, {})[
+                    action
+                ] = patterns
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No filter rules added.")
+
+    def _load_normalize_rules(self) -> None:
+        """
+        Load the rules of volatile lines added to the built-in vendor
+        rules. The key is the vendor, the value is one rule per line.
+        """
+        self.run_settings["normalize_rules"] = {}
+        try:
+            for vendor, value in self._config["Normalize_Rules"].items():
+                self.run_settings["normalize_rules"][vendor] = (
+                    NormalizeRules.parse(value)
+                )
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. No normalize rules added.")
+
+    def _load_report(self) -> None:
+        """Load the settings of the run report."""
+        self.run_settings["report_json_path"] = None
+        self.run_settings["report_prometheus_path"] = None
+        self.run_settings["report_slowest"] = 10
+        try:
+            for option in ["Json_Path", "Prometheus_Path"]:
+                path_string: str = self._config["Report"].get(option, "")
+                if len(path_string.strip()) > 0:
+                    path: Path = Path(path_string.strip())
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self.run_settings[f"report_{option.lower()}"] = path
+            _slowest: int | None = self._config["Report"].getint("Slowest")
+            if _slowest is not None and _slowest >= 0:
+                self.run_settings["report_slowest"] = _slowest
+        except KeyError as e:
+            self.logger.debug(f"Key error: {e}. Reports are not written.")
+        except ValueError as e:
+            self.logger.warning(f"Wrong report value: {e}. Using default.")
+        except OSError as e:
+            self.logger.warning(f"Can't create report folder: {e}")
+
     def _create_file(self, path_str: str, file_type: str) -> Path:
         """
         The function will create folder or file and return Path object.
@@ -151,6 +527,16 @@ class Config_Load:
         self._load_configs_path()
         self._load_logging_path()
         self._load_logging_level()
+        self.run_settings: dict = {}
+        self._load_execution()
+        self._load_storage()
+        self._load_connections()
+        self._load_retry()
+        self._load_limits()
+        self._load_daemon()
+        self._load_report()
+        self._load_filter_rules()
+        self._load_normalize_rules()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+import time
+from netinfscript.task.device_state import DeviceState
+
+# seconds of the age units
+AGE_UNITS: dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_age(age: str) -> int:
+    """
+    The function returns the number of seconds of the age
+    written as a number with an optional unit, e.g. 90, 30m, 12h, 7d.
+
+    :raise ValueError: when the age is not valid.
+    """
+    age = age.strip().lower()
+    if len(age) > 0 and age[-1] in AGE_UNITS:
+        seconds: int = int(age[:-1]) * AGE_UNITS[age[-1]]
+    else:
+        seconds: int = int(age)
+    if seconds < 0:
+        raise ValueError(f"negative age '{age}'")
+    return seconds
+
+
+def split_values(values: list[str] | None) -> set[str]:
+    """
+    The function returns the set of values given many times or
+    separated by commas, in lower case.
+    """
+    result: set[str] = set()
+    for value in values or []:
+        result.update(
+            part.strip().lower() for part in value.split(",") if part.strip()
+        )
+    return result
+
+
+class InventoryIndex:
+    """
+    An object that indexes the devices file by ip, name, group and
+    vendor, so devices are selected without checking every entry.
+    """
+
+    def __init__(self, devices_data: dict[str, dict]) -> None:
+        self._ips: set[str] = set()
+        # ips in lower case, the same device can be written differently
+        self._by_ip: dict[str, set[str]] = {}
+        self._by_name: dict[str, set[str]] = {}
+        self._by_group: dict[str, set[str]] = {}
+        self._by_vendor: dict[str, set[str]] = {}
+        for ip, params in devices_data.items():
+            self._ips.add(ip)
+            self._by_ip.setdefault(ip.lower(), set()).add(ip)
+            if not isinstance(params, dict):
+                continue
+            for index, key in [
+                (self._by_name, "name"),
+                (self._by_group, "group"),
+                (self._by_vendor, "vendor"),
+            ]:
+                value: object = params.get(key)
+                if isinstance(value, str):
+                    index.setdefault(value.lower(), set()).add(ip)
+
+    @property
+    def ips(self) -> set[str]:
+        """Get ips of all devices."""
+        return self._ips
+
+    def by_device(self, devices: set[str]) -> set[str]:
+        """The function returns ips of devices with the ip or name."""
+        return set().union(
+            *(self._by_ip.get(d, set()) for d in devices),
+            *(self._by_name.get(d, set()) for d in devices),
+        )
+
+    def by_group(self, groups: set[str]) -> set[str]:
+        """The function returns ips of devices in the groups."""
+        return set().union(*(self._by_group.get(g, set()) for g in groups))
+
+    def by_vendor(self, vendors: set[str]) -> set[str]:
+        """The function returns ips of devices of the vendors."""
+        return set().union(*(self._by_vendor.get(v, set()) for v in vendors))
+
+
+class DeviceSelection:
+    """
+    An object that keeps the devices chosen for the run. Values of
+    one option are joined with 'or', options are joined with 'and'.
+    Options that use the state need the hash index.
+    """
+
+    def __init__(
+        self,
+        devices: list[str] | None = None,
+        groups: list[str] | None = None,
+        vendors: list[str] | None = None,
+        since_last_failure: bool = False,
+        stale_older_than: int | None = None,
+    ) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.agent.deviceselection"
+        )
+        self._devices: set[str] = split_values(devices)
+        self._groups: set[str] = split_values(groups)
+        self._vendors: set[str] = split_values(vendors)
+        self._since_last_failure: bool = since_last_failure
+        self._stale_older_than: int | None = stale_older_than
+
+    @property
+    def uses_state(self) -> bool:
+        """Get if the selection needs the devices state."""
+        return self._since_last_failure or self._stale_older_than is not None
+
+    def _state_matches(self, ip: str, state: DeviceState | None) -> bool:
+        """
+        The function checks the options that use the last result
+        of the device backup.
+        """
+        if state is None:
+            return True
+        if self._since_last_failure:
+            if state.get(ip, "last_status") != "failed":
+                return False
+        if self._stale_older_than is not None:
+            last_success: float = state.get(ip, "last_success", 0)
+            if time.time() - last_success < self._stale_older_than:
+                return False
+        return True
+
+    def select(
+        self, index: InventoryIndex, state: DeviceState | None = None
+    ) -> set[str]:
+        """
+        The function returns ips of the selected devices.
+
+        :param index: index of the devices file.
+        :param state: devices state with the last results.
+        """
+        ips: set[str] = index.ips
+        if len(self._devices) > 0:
+            ips = ips & index.by_device(self._devices)
+        if len(self._groups) > 0:
+            ips = ips & index.by_group(self._groups)
+        if len(self._vendors) > 0:
+            ips = ips & index.by_vendor(self._vendors)
+        if self.uses_state:
+            ips = {ip for ip in ips if self._state_matches(ip, state)}
+        return ips
+
+    def matches(
+        self, ip: str, params: dict, state: DeviceState | None = None
+    ) -> bool:
+        """
+        The function checks one entry of the devices file,
+        used when the file is streamed.
+
+        :param ip: ip of the device.
+        :param params: parameters of the device from the file.
+        :param state: devices state with the last results.
+        """
+        if len(self._devices) > 0:
+            name: object = params.get("name")
+            if ip.lower() not in self._devices and not (
+                isinstance(name, str) and name.lower() in self._devices
+            ):
+                return False
+        for values, key in [
+            (self._groups, "group"),
+            (self._vendors, "vendor"),
+        ]:
+            if len(values) > 0:
+                value: object = params.get(key)
+                if not isinstance(value, str) or value.lower() not in values:
+                    return False
+        return self._state_matches(ip, state)
+
+
+if __name__ == "__main__":
+    pass
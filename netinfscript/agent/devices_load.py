@@ -16,11 +16,30 @@ import logging
 import json
 import sys
 from pathlib import Path
-from netinfscript.utils import get_and_valid_path
+from typing import Callable, Iterator
+from netinfscript.utils import get_and_valid_path, stream_json_object
 from netinfscript.devices.base_device import BaseDevice
 from netinfscript.devices.cisco import Cisco
 from netinfscript.devices.mikrotik import Mikrotik
 from netinfscript.devices.juniper import Juniper
+from netinfscript.agent.inventory_cache import InventoryCache
+
+# device classes of the supported vendors
+VENDOR_CLASSES: dict[str, type[BaseDevice]] = {
+    "cisco": Cisco,
+    "mikrotik": Mikrotik,
+    "juniper": Juniper,
+}
+# port used when the device entry has no port, by the connection
+DEFAULT_PORTS: dict[str, int] = {
+    "ssh": 22,
+    "restconf": 443,
+    "netconf": 830,
+    "api": 8728,
+    "api-ssl": 8729,
+    "scp": 22,
+    "sftp": 22,
+}
 
 
 class Devices_Load:
@@ -29,12 +48,27 @@ class Devices_Load:
     needed to create device objects.
     """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        stream: bool = False,
+        cache: InventoryCache | None = None,
+    ) -> None:
         try:
             self.logger: logging = logging.getLogger(
                 "netinfscript.devices.Devices_Load"
             )
             self.devices_path: Path = path
+            self.cache: InventoryCache | None = cache
+            self._cached_parametrs: list[dict] | None = None
+            # in the streaming mode devices are read by iter_devices
+            if stream:
+                return
+            if self.cache is not None:
+                cached: tuple[dict, list[dict]] | None = self.cache.load()
+                if cached is not None:
+                    self.devices_data, self._cached_parametrs = cached
+                    return
             self._load_devices_file()
         except Exception as e:
             self.logger.critical(
@@ -62,19 +96,99 @@ class Devices_Load:
             self.logger.critical(f"{e}")
             sys.exit(2)
 
+    def iter_devices(self) -> Iterator[tuple[str, dict]]:
+        """
+        This function reads devices from device.json file one by one,
+        without loading the whole file.
+
+        :return: iterator of (ip, device parameters).
+        """
+        try:
+            self.logger.debug("Streaming devices list.")
+            with open(self.devices_path, "r") as f:
+                yield from stream_json_object(f)
+        except FileNotFoundError as e:
+            self.logger.critical(f"Loading devices error: {e}")
+        except json.decoder.JSONDecodeError as e:
+            self.logger.critical(
+                f"Loading devices error: {e}. Next devices skipped."
+            )
+
+    def iter_created_devices(
+        self, selected: Callable[[str, dict], bool] | None = None
+    ) -> Iterator[BaseDevice]:
+        """
+        This function creates device objects on demand,
+        when the next device is needed.
+
+        :param selected: function that checks the ip and parameters,
+            only devices that pass are created.
+        :return: iterator of device objects.
+        """
+        for device in self.iter_devices():
+            if selected is not None and not selected(*device):
+                continue
+            _dev_obj: BaseDevice | None = self.create_devices(device)
+            if _dev_obj is not None:
+                yield _dev_obj
+
+    def create_all_devices(
+        self, ips: set[str] | None = None
+    ) -> list[BaseDevice]:
+        """
+        The function creates objects of all loaded devices.
+        Parameters are taken from the cache when it is valid,
+        otherwise they are resolved and the cache is rebuilt.
+
+        :param ips: only these devices are created, when given.
+            The cache isn't rebuilt from a part of the devices.
+        """
+        if self._cached_parametrs is not None:
+            parametrs_list: list[dict] = self._cached_parametrs
+            if ips is not None:
+                parametrs_list = [p for p in parametrs_list if p["ip"] in ips]
+        else:
+            parametrs_list: list[dict] = []
+            for device in self.devices_data.items():
+                if ips is not None and device[0] not in ips:
+                    continue
+                self.logger.debug(f"{device[0]}:Creating device objects...")
+                device_parametrs: dict | None = self.resolve_parametrs(device)
+                if device_parametrs is not None:
+                    parametrs_list.append(device_parametrs)
+            if self.cache is not None and ips is None:
+                self.cache.save(self.devices_data, parametrs_list)
+        devices: list[BaseDevice] = []
+        for device_parametrs in parametrs_list:
+            _dev_obj: BaseDevice | None = self.build_device(device_parametrs)
+            if _dev_obj is not None:
+                devices.append(_dev_obj)
+        return devices
+
     def create_devices(self, device: tuple[str, dict]) -> BaseDevice:
         """
         The function is responsible for creating
         device object.
         """
         self.logger.debug(f"{device[0]}:Creating device objects...")
+        device_parametrs: dict | None = self.resolve_parametrs(device)
+        if device_parametrs is None:
+            return None
+        return self.build_device(device_parametrs)
+
+    def resolve_parametrs(self, device: tuple[str, dict]) -> dict | None:
+        """
+        The function validates the device entry and returns
+        parameters used to create the device object.
+        """
+        device_parametrs: dict | None = None
         try:
             self.logger.debug(
                 f"{device[0]}:Setup device_parametrs to create."
             )
-            device_parametrs: dict = {
+            device_parametrs = {
                 "ip": device[0],
-                "port": 22,
+                "port": DEFAULT_PORTS.get(device[1]["connection"], 22),
                 "name": device[1]["name"],
                 "vendor": device[1]["vendor"],
                 "connection": device[1]["connection"],
@@ -90,7 +204,7 @@ class Devices_Load:
                 f"{device[0]}:Checking additional privilege parametrs."
             )
             if isinstance(device[1]["port"], int):
-                device_parametrs = device[1]["port"]
+                device_parametrs["port"] = device[1]["port"]
             if "privilege" in device[1].keys():
                 if device[1]["privilege"] != None:
                     privilege: list[str | None] | None = device[1][
@@ -125,24 +239,28 @@ class Devices_Load:
                 device_parametrs["passphrase"] = device[1]["passphrase"]
         except KeyError as e:
             self.logger.warning(f"{device[0]}:KeyError in device file: {e}")
-            pass
         except Exception as e:
             self.logger.critical(f"Error ocure {e}")
             sys.exit(2)
+        return device_parametrs
+
+    def build_device(self, device_parametrs: dict) -> BaseDevice | None:
+        """
+        The function creates the vendor device object
+        from resolved parameters.
+        """
+        ip: str = device_parametrs["ip"]
         try:
-            self.logger.debug(f"{device[0]}:Creating device object.")
-            if device[1]["vendor"] == "cisco":
-                return Cisco(**device_parametrs)
-            elif device[1]["vendor"] == "mikrotik":
-                return Mikrotik(**device_parametrs)
-            elif device[1]["vendor"] == "juniper":
-                return Juniper(**device_parametrs)
+            self.logger.debug(f"{ip}:Creating device object.")
+            if device_parametrs["vendor"] in VENDOR_CLASSES:
+                return VENDOR_CLASSES[device_parametrs["vendor"]](
+                    **device_parametrs
+                )
             else:
-                self.logger.warning(f"{device[0]}:Device is not supported.")
-                pass
+                self.logger.warning(f"{ip}:Device is not supported.")
         except Exception as e:
             self.logger.warning(
-                f"{device[0]}:Error when creating device object: {e}"
+                f"{ip}:Error when creating device object: {e}"
             )
 
 
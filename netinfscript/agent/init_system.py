@@ -37,6 +37,7 @@ class InitSystem:
             self._configs_path: Path = self._config_loaded.configs_path
             self._logging_path: Path = self._config_loaded.logging_path
             self._logging_level: Path = self._config_loaded.logging_level
+            self._run_settings: dict = self._config_loaded.run_settings
             self.set_logging()
         except Exception as e:
             logging.error(f"Error ocure: {e}")
@@ -57,6 +58,11 @@ class InitSystem:
         """Return the path to the logging directory."""
         return self._logging_path
 
+    @property
+    def run_settings(self) -> dict:
+        """Return the settings of the task execution."""
+        return self._run_settings
+
     def set_logging(self) -> None:
         """
         The function responsible for setting the logging system to do
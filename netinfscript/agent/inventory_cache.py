@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Iterable
+
+CACHE_VERSION: int = 1
+
+
+class InventoryCache:
+    """
+    An object that keeps the devices file compiled to a binary file.
+    The cache holds parameters already validated and resolved,
+    so they can be used to create device objects without work.
+    The cache is rebuilt when mtime and hash of the source change.
+
+    The cache holds passwords like the devices file, so it is written
+    next to it, readable only by the owner, and never in the configs
+    path that may be a git repository.
+    """
+
+    def __init__(self, devices_path: Path) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.agent.inventorycache"
+        )
+        self._devices_path: Path = devices_path
+        self._cache_path: Path = devices_path.with_name(
+            f".{devices_path.name}.cache"
+        )
+
+    @property
+    def devices_path(self) -> Path:
+        """Get path of the source devices file."""
+        return self._devices_path
+
+    @property
+    def cache_path(self) -> Path:
+        """Get path of the cache file."""
+        return self._cache_path
+
+    def _file_hash(self) -> str:
+        """The function returns sha256 of the devices file."""
+        sha256 = hashlib.sha256()
+        with open(self.devices_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1048576), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _header(self) -> dict:
+        """The function returns values that must match to use the cache."""
+        stat = self.devices_path.stat()
+        return {
+            "version": CACHE_VERSION,
+            "python": list(sys.version_info[:2]),
+            "source": str(self.devices_path.resolve()),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def _key_files(self, paths: Iterable[str]) -> dict[str, int | None]:
+        """
+        The function returns mtime of every key file,
+        None for files that don't exist.
+        """
+        key_files: dict[str, int | None] = {}
+        for path in paths:
+            try:
+                key_files[path] = Path(path).stat().st_mtime_ns
+            except OSError:
+                key_files[path] = None
+        return key_files
+
+    def load(self) -> tuple[dict, list[dict]] | None:
+        """
+        The function returns the cached devices data and resolved
+        device parameters. When mtime of the source changed but its
+        hash didn't, the cache is still used and its mtime updated.
+        Key files are checked once each, not for every device.
+
+        :return: (devices data, list of parameters) or None.
+        """
+        try:
+            with open(self.cache_path, "rb") as f:
+                cache: dict = marshal.load(f)
+            header: dict = self._header()
+        except FileNotFoundError:
+            self.logger.debug("Inventory cache doesn't exist.")
+            return None
+        except Exception as e:
+            self.logger.warning(f"Can't read inventory cache: {e}")
+            return None
+        for key in ["version", "python", "source"]:
+            if cache.get(key) != header[key]:
+                self.logger.info("Inventory cache is outdated.")
+                return None
+        if (
+            cache.get("mtime_ns") != header["mtime_ns"]
+            or cache.get("size") != header["size"]
+        ):
+            if cache.get("sha256") != self._file_hash():
+                self.logger.info("Devices file changed. Rebuilding cache.")
+                return None
+            self.logger.debug("Devices file touched, content unchanged.")
+            cache.update(header)
+            self._write(cache)
+        key_files: dict | None = cache.get("key_files")
+        if key_files is None or key_files != self._key_files(key_files):
+            self.logger.info("Key files changed. Rebuilding cache.")
+            return None
+        self.logger.debug("Using inventory cache.")
+        parametrs_list: list[dict] = cache["parametrs"]
+        for device_parametrs in parametrs_list:
+            if device_parametrs["key_file"] is not None:
+                device_parametrs["key_file"] = Path(
+                    device_parametrs["key_file"]
+                )
+        return cache["devices_data"], parametrs_list
+
+    def save(self, devices_data: dict, parametrs_list: list[dict]) -> bool:
+        """
+        The function writes the cache.
+
+        :param devices_data: devices file content.
+        :param parametrs_list: resolved parameters of the devices.
+        :return: bool done or not.
+        """
+        try:
+            cache: dict = self._header()
+            cache["sha256"] = self._file_hash()
+            cache["devices_data"] = devices_data
+            # key files are resolved once, a created, changed or
+            # removed key file rebuilds the cache
+            cache["key_files"] = self._key_files(
+                {
+                    params["key_file"]
+                    for params in devices_data.values()
+                    if isinstance(params, dict)
+                    and isinstance(params.get("key_file"), str)
+                }
+            )
+            # marshal supports only builtin types
+            cache["parametrs"] = [
+                {
+                    **device_parametrs,
+                    "key_file": (
+                        None
+                        if device_parametrs["key_file"] is None
+                        else str(device_parametrs["key_file"])
+                    ),
+                }
+                for device_parametrs in parametrs_list
+            ]
+            return self._write(cache)
+        except Exception as e:
+            self.logger.warning(f"Can't build inventory cache: {e}")
+            return False
+
+    def _write(self, cache: dict) -> bool:
+        """
+        The function replaces the cache file at once. The file is
+        created readable only by the owner.
+        """
+        tmp_path: Path = self.cache_path.with_suffix(".tmp")
+        try:
+            tmp_path.unlink(missing_ok=True)
+            fd: int = os.open(
+                tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600
+            )
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(cache, f)
+            tmp_path.replace(self.cache_path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't write inventory cache: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import asyncio
+import logging
+import time
+from typing import Callable
+from netinfscript.devices.base_device import BaseDevice
+
+try:
+    import asyncssh
+
+    ASYNCSSH_AVAILABLE: bool = True
+except ImportError:
+    asyncssh = None
+    ASYNCSSH_AVAILABLE: bool = False
+
+# size of the output chunks read from the channel
+CHUNK_SIZE: int = 65536
+
+
+class ConnAsyncSSH:
+    """
+    An object responsible for asynchronous SSH connections.
+    Commands are sent over exec channels, so one event loop
+    can keep hundreds of sessions open at once.
+    """
+
+    def __init__(
+        self,
+        dev: BaseDevice,
+        commands: str | list[str],
+        connect_timeout: float = 30,
+        read_timeout: float = 60,
+        probe: Callable[[str], bool] | None = None,
+        pipeline: bool = False,
+    ) -> None:
+        """
+        :param probe: function that gets the output of the probe
+            command of the device and returns True when the
+            configuration didn't change, then it isn't downloaded.
+        :param pipeline: open the exec channels of all commands at
+            once instead of one after another.
+        """
+        self.logger = logging.getLogger(
+            f"netinfscript.connections.conn_async_ssh"
+        )
+        self._ip: str = dev.ip
+        # seconds spent in the connect and command phases
+        self.timings: dict[str, float] = {}
+        self._connect_started: float = 0.0
+        self._username: str = dev.username
+        self._port: int = dev.port
+        self._password: str = dev.password
+        self._passphrase: str = dev.passphrase
+        self._key_file: str = dev.key_file
+        self._connect_timeout: float = connect_timeout
+        self._read_timeout: float = read_timeout
+        self._probe: Callable[[str], bool] | None = probe
+        self._probe_command: str | None = dev.probe_command
+        self._pipeline: bool = pipeline
+        # True when the probe found no change and nothing was downloaded
+        self.skipped: bool = False
+        # output chunks of every command, filled by the last download
+        self.outputs: dict[str, list[str]] = {}
+        # True when the command didn't finish in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        if isinstance(commands, list):
+            self._commands: list[str] = commands
+        elif isinstance(commands, str):
+            self._commands: list = list()
+            self._commands.append(commands)
+        else:
+            self.logger.debug(f"{self.ip}:Wrong commands variable.")
+            self._commands: list = list()
+
+    @property
+    def ip(self) -> str:
+        """Get the device's IP address."""
+        return self._ip
+
+    @property
+    def username(self) -> str:
+        """Get the username for the device connection."""
+        return self._username
+
+    @property
+    def port(self) -> int:
+        """Get the port for the device connection."""
+        return self._port
+
+    @property
+    def password(self) -> str:
+        """Get the password for the device connection."""
+        return self._password
+
+    @property
+    def passphrase(self) -> str:
+        """Get the passphrase for the device's key file."""
+        return self._passphrase
+
+    @property
+    def key_file(self) -> str:
+        """Get the path to the device's key file."""
+        return self._key_file
+
+    @property
+    def commands(self) -> list[str]:
+        """Get the commands to send."""
+        return self._commands
+
+    def _conn_parametrs(self) -> dict:
+        """
+        The function returns the parameters for asyncssh.connect.
+        Host keys are verified against the user's known_hosts file,
+        same as the netmiko connection.
+        """
+        conn_parametrs: dict = {
+            "host": self.ip,
+            "port": self.port,
+            "username": self.username,
+            "connect_timeout": self._connect_timeout,
+        }
+        if self.key_file is not None:
+            self.logger.debug(f"{self.ip}:Connecting with public key.")
+            conn_parametrs["client_keys"] = [str(self.key_file)]
+            conn_parametrs["passphrase"] = self.passphrase
+            conn_parametrs["password"] = None
+        else:
+            self.logger.debug(f"{self.ip}:Attempting connect with password.")
+            conn_parametrs["client_keys"] = None
+            conn_parametrs["password"] = self.password
+        return conn_parametrs
+
+    async def _read_chunks(
+        self, connection: "asyncssh.SSHClientConnection", command: str
+    ) -> list[str]:
+        """
+        The function reads the output of the command in chunks,
+        as they arrive from the device.
+
+        :param connection: asyncssh connection object.
+        :param command: command to execute.
+        """
+        chunks: list[str] = []
+        async with connection.create_process(
+            command, stderr=asyncssh.DEVNULL
+        ) as process:
+            while True:
+                chunk: str = await process.stdout.read(CHUNK_SIZE)
+                if len(chunk) == 0:
+                    return chunks
+                chunks.append(chunk)
+
+    async def _read_all(
+        self, connection: "asyncssh.SSHClientConnection", commands: list[str]
+    ) -> dict[str, list[str]]:
+        """
+        The function opens the exec channels of all commands at once,
+        so the batch costs about one round trip.
+
+        :param connection: asyncssh connection object.
+        :param commands: commands to execute.
+        :return: dict of command and its output chunks.
+        """
+        self.logger.debug(f"{self.ip}:Sending {len(commands)} commands.")
+        outputs: list[list[str]] = await asyncio.wait_for(
+            asyncio.gather(
+                *(self._read_chunks(connection, cmd) for cmd in commands)
+            ),
+            self._read_timeout,
+        )
+        return dict(zip(commands, outputs))
+
+    async def _send(
+        self, connection: "asyncssh.SSHClientConnection"
+    ) -> list[str]:
+        """
+        The function sends every command over its own exec channel.
+
+        :param connection: asyncssh connection object.
+        :return: chunks of the commands output.
+        """
+        send_started: float = time.perf_counter()
+        self.timings["connect"] = send_started - self._connect_started
+        chunks: list[str] = []
+        probing: bool = (
+            self._probe is not None and self._probe_command is not None
+        )
+        commands: list[str] = self.commands
+        if probing:
+            commands = [self._probe_command, *commands]
+        pipelined: bool = self._pipeline and len(commands) > 1
+        try:
+            if pipelined:
+                # the probe is answered in the same round trip as the
+                # configuration, so the configuration is always read
+                self.outputs = await self._read_all(connection, commands)
+            if probing:
+                self.logger.debug(f"{self.ip}:Probing for changes.")
+                if pipelined:
+                    probe_output: list[str] = self.outputs.pop(
+                        self._probe_command
+                    )
+                else:
+                    probe_output: list[str] = await asyncio.wait_for(
+                        self._read_chunks(connection, self._probe_command),
+                        self._read_timeout,
+                    )
+                if self._probe("".join(probe_output)):
+                    self.skipped = True
+                    self.timings["command"] = (
+                        time.perf_counter() - send_started
+                    )
+                    return chunks
+            if pipelined:
+                for command in self.commands:
+                    chunks.extend(self.outputs[command])
+                self.timings["command"] = time.perf_counter() - send_started
+                return chunks
+            for command in self.commands:
+                self.logger.debug(f"{self.ip}:Sending command.")
+                self.outputs[command] = await asyncio.wait_for(
+                    self._read_chunks(connection, command),
+                    self._read_timeout,
+                )
+                chunks.extend(self.outputs[command])
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            raise
+        self.timings["command"] = time.perf_counter() - send_started
+        return chunks
+
+    async def _get_conection_and_send(self) -> list[str] | bool:
+        """
+        The function connects to the device and executes functions
+        that send commands.
+
+        :return: chunks of the commands output or False.
+        """
+        try:
+            self.logger.info(
+                f"{self.ip}:Trying download configuration from the device."
+            )
+            async with asyncssh.connect(
+                **self._conn_parametrs()
+            ) as connection:
+                self.logger.debug(f"{self.ip}:Connection created.")
+                output: list[str] = await self._send(connection)
+            self.logger.debug(f"{self.ip}:Connection completend sucessfully.")
+            return output
+        except asyncssh.HostKeyNotVerifiable:
+            self.logger.warning(f"{self.ip}:Can't connect. Device not found.")
+            self.error = "host_key"
+            return False
+        except asyncssh.PermissionDenied as e:
+            self.logger.warning(f"{self.ip}:Can't connect.")
+            self.logger.warning(f"{self.ip}:Error {e}")
+            self.error = "auth"
+            return False
+        except (asyncio.TimeoutError, asyncssh.TimeoutError, OSError):
+            if self.timed_out:
+                self.logger.warning(
+                    f"{self.ip}:Command not finished after "
+                    f"{self._read_timeout}s. Read timeout."
+                )
+                self.error = "timeout"
+                return False
+            self.logger.warning(
+                f"{self.ip}:Can't connect. TCP connection to device failed."
+            )
+            self.error = "unreachable"
+            return False
+        except asyncssh.Error as e:
+            self.logger.warning(f"{self.ip}:Can't connect.")
+            self.logger.warning(f"{self.ip}:Error {e}")
+            self.error = "error"
+            return False
+        except Exception as e:
+            self.logger.error(f"{self.ip}:Exceptation - {e}")
+            self.error = "error"
+            return False
+
+    async def get_config(self) -> list[str] | None:
+        """
+        The function returns the device configuration.
+
+        :return: device configuration in chunks, not joined,
+            so it can be filtered as a stream.
+        """
+        self.logger.debug(f"{self.ip}:Trying download config.")
+        self._connect_started = time.perf_counter()
+        output: list[str] | bool = await self._get_conection_and_send()
+        if "connect" not in self.timings:
+            self.timings["connect"] = (
+                time.perf_counter() - self._connect_started
+            )
+        if self.skipped:
+            return None
+        if not output or not any(output):
+            self.logger.warning(f"{self.ip}:No output config.")
+            return None
+        return output
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+import socket
+import time
+import xml.etree.ElementTree as ET
+import paramiko
+from netinfscript.devices.base_device import BaseDevice
+from netinfscript.connections.conn_pool import ConnectionPool
+
+NETCONF_NS: str = "urn:ietf:params:xml:ns:netconf:base:1.0"
+BASE_10: str = "urn:ietf:params:netconf:base:1.0"
+BASE_11: str = "urn:ietf:params:netconf:base:1.1"
+# end of message of the NETCONF 1.0 framing
+EOM: bytes = b"]]>]]>"
+HELLO: str = (
+    f'<?xml version="1.0" encoding="UTF-8"?><hello xmlns="{NETCONF_NS}">'
+    f"<capabilities><capability>{BASE_10}</capability>"
+    f"<capability>{BASE_11}</capability></capabilities></hello>"
+)
+GET_CONFIG: str = (
+    '<rpc message-id="{message_id}" xmlns="' + NETCONF_NS + '">'
+    "<get-config><source><running/></source></get-config></rpc>"
+)
+
+
+class NetconfError(Exception):
+    """The device answered with rpc-error or broke the protocol."""
+
+
+class NetconfSession:
+    """
+    An object that keeps one NETCONF session over SSH. The session
+    can be kept in the ConnectionPool and used for many RPCs.
+    Both framings are supported: the end of message of base:1.0
+    and the chunks of base:1.1, used when the device supports it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        device_type: str,
+        password: str | None = None,
+        key_file: str | None = None,
+        passphrase: str | None = None,
+        conn_timeout: float | None = None,
+        read_timeout: float = 60,
+    ) -> None:
+        """
+        The session is opened when the object is created. Only hosts
+        from the known_hosts file are accepted.
+
+        :raise paramiko.SSHException: when the SSH session fails.
+        :raise NetconfError: when the hello is wrong.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_netconf"
+        )
+        self.host: str = host
+        self._message_id: int = 0
+        self._buffer: bytes = b""
+        self._client: paramiko.SSHClient = paramiko.SSHClient()
+        self._client.load_system_host_keys()
+        self._client.set_missing_host_key_policy(paramiko.RejectPolicy())
+        self._client.connect(
+            host,
+            port=port,
+            username=username,
+            password=password,
+            key_filename=key_file,
+            passphrase=passphrase,
+            timeout=conn_timeout,
+            look_for_keys=key_file is not None,
+            allow_agent=False,
+        )
+        try:
+            self._channel: paramiko.Channel = (
+                self._client.get_transport().open_session()
+            )
+            self._channel.settimeout(read_timeout)
+            self._channel.invoke_subsystem("netconf")
+            self._chunked: bool = False
+            self._send(HELLO)
+            capabilities: list[str] = [
+                capability.text
+                for capability in ET.fromstring(self._read()).iter(
+                    f"{{{NETCONF_NS}}}capability"
+                )
+            ]
+        except Exception:
+            self._client.close()
+            raise
+        if BASE_11 in capabilities:
+            self._chunked = True
+        elif BASE_10 not in capabilities:
+            self._client.close()
+            raise NetconfError("device doesn't support NETCONF base")
+
+    def _send(self, message: str) -> None:
+        """The function writes the message with the session framing."""
+        data: bytes = message.encode()
+        if self._chunked:
+            data = b"\n#%d\n" % len(data) + data + b"\n##\n"
+        else:
+            data += EOM
+        self._channel.sendall(data)
+
+    def _fill(self) -> None:
+        """The function reads the next data from the channel."""
+        data: bytes = self._channel.recv(65536)
+        if len(data) == 0:
+            raise NetconfError("session closed by the device")
+        self._buffer += data
+
+    def _read_until(self, marker: bytes) -> bytes:
+        """The function returns data up to the marker, without it."""
+        while marker not in self._buffer:
+            self._fill()
+        data, self._buffer = self._buffer.split(marker, 1)
+        return data
+
+    def _read_exactly(self, size: int) -> bytes:
+        """The function returns the next size bytes."""
+        while len(self._buffer) < size:
+            self._fill()
+        data: bytes = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+    def _read(self) -> str:
+        """The function returns the next message of the device."""
+        if not self._chunked:
+            return self._read_until(EOM).decode("utf-8", errors="replace")
+        parts: list[bytes] = []
+        while True:
+            header: bytes = self._read_until(b"\n#")
+            if header.strip() != b"":
+                raise NetconfError("wrong chunk framing")
+            size: bytes = self._read_until(b"\n")
+            if size == b"#":
+                return b"".join(parts).decode("utf-8", errors="replace")
+            parts.append(self._read_exactly(int(size)))
+
+    def rpc(self, request: str) -> ET.Element:
+        """
+        The function sends the RPC and returns the rpc-reply.
+
+        :param request: RPC with the '{message_id}' placeholder.
+        :raise NetconfError: when the device answered with rpc-error.
+        """
+        self._message_id += 1
+        self._send(request.format(message_id=self._message_id))
+        reply: ET.Element = ET.fromstring(self._read())
+        error: ET.Element | None = reply.find(f"{{{NETCONF_NS}}}rpc-error")
+        if error is not None:
+            message: str | None = error.findtext(
+                f"{{{NETCONF_NS}}}error-message"
+            )
+            raise NetconfError(message or "rpc-error")
+        return reply
+
+    def get_config(self) -> str:
+        """
+        The function returns the running configuration, as indented
+        XML of the data element, one element per line.
+        """
+        reply: ET.Element = self.rpc(GET_CONFIG)
+        data: ET.Element | None = reply.find(f"{{{NETCONF_NS}}}data")
+        if data is None:
+            raise NetconfError("no data in the reply")
+        ET.indent(data)
+        return ET.tostring(data, encoding="unicode")
+
+    def is_alive(self) -> bool:
+        """The function checks if the session can be used."""
+        return (
+            self._client.get_transport() is not None
+            and self._client.get_transport().is_active()
+            and not self._channel.closed
+        )
+
+    def disconnect(self) -> None:
+        """The function closes the session, ignoring errors."""
+        try:
+            self._message_id += 1
+            self._send(
+                f'<rpc message-id="{self._message_id}" '
+                f'xmlns="{NETCONF_NS}"><close-session/></rpc>'
+            )
+        except Exception as e:
+            self.logger.debug(f"{self.host}:Can't close session: {e}")
+        finally:
+            self._client.close()
+
+
+class ConnNETCONF:
+    """
+    An object responsible for NETCONF downloads. The configuration
+    comes back in one get-config RPC.
+    """
+
+    def __init__(
+        self,
+        dev: BaseDevice,
+        pool: ConnectionPool | None = None,
+        read_timeout: float = 60,
+        connect_timeout: float | None = None,
+    ) -> None:
+        """
+        :param dev: device object.
+        :param pool: connection pool, sessions are reused when given.
+        :param read_timeout: float max seconds of waiting for data.
+        :param connect_timeout: float max seconds of connecting.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_netconf"
+        )
+        self._pool: ConnectionPool | None = pool
+        self._read_timeout: float = read_timeout
+        self._ip: str = dev.ip
+        self._conn_parametrs: dict = {
+            "host": dev.ip,
+            "port": dev.port,
+            "username": dev.username,
+            "device_type": "netconf",
+            "password": dev.password,
+            "key_file": dev.key_file,
+            "passphrase": dev.passphrase,
+            "conn_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+        }
+        # True when the device didn't answer in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        # seconds spent in the connect and command phases
+        self.timings: dict[str, float] = {}
+
+    @property
+    def ip(self) -> str:
+        """Get the device's IP address."""
+        return self._ip
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Get the connection pool, if used."""
+        return self._pool
+
+    def _download(self, session: NetconfSession, started: float) -> str:
+        """The function sends get-config in the open session."""
+        command_started: float = time.perf_counter()
+        self.timings["connect"] = command_started - started
+        output: str = session.get_config()
+        self.timings["command"] = time.perf_counter() - command_started
+        return output
+
+    def get_config(self) -> str | None:
+        """
+        The function downloads the configuration.
+
+        :return: device configuration.
+        """
+        self.logger.debug(f"{self.ip}:Trying download config.")
+        started: float = time.perf_counter()
+        try:
+            if self.pool is not None:
+                with self.pool.connection(
+                    self._conn_parametrs, NetconfSession
+                ) as session:
+                    self.logger.debug(f"{self.ip}:Pooled session taken.")
+                    return self._download(session, started)
+            session: NetconfSession = NetconfSession(**self._conn_parametrs)
+            try:
+                return self._download(session, started)
+            finally:
+                session.disconnect()
+        except socket.timeout:
+            if "connect" in self.timings:
+                self.logger.warning(
+                    f"{self.ip}:No answer after {self._read_timeout}s. "
+                    "Read timeout."
+                )
+                self.timed_out = True
+                self.error = "timeout"
+            else:
+                self.logger.warning(f"{self.ip}:Can't connect. Timeout.")
+                self.error = "unreachable"
+        except paramiko.AuthenticationException as e:
+            self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+            self.error = "auth"
+        except paramiko.BadHostKeyException:
+            self.logger.warning(f"{self.ip}:Can't connect. Wrong host key.")
+            self.error = "host_key"
+        except paramiko.SSHException as e:
+            if "not found in known_hosts" in str(e):
+                self.logger.warning(
+                    f"{self.ip}:Can't connect. Device not found."
+                )
+                self.error = "host_key"
+            else:
+                self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+                self.error = "error"
+        except OSError:
+            self.logger.warning(
+                f"{self.ip}:Can't connect. TCP connection to device failed."
+            )
+            self.error = "unreachable"
+        except (NetconfError, ET.ParseError) as e:
+            self.logger.warning(f"{self.ip}:NETCONF error {e}")
+            self.error = "error"
+        if "connect" not in self.timings:
+            self.timings["connect"] = time.perf_counter() - started
+        self.logger.warning(f"{self.ip}:No output config.")
+        return None
+
+
+if __name__ == "__main__":
+    pass
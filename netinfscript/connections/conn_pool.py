@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+from typing import Callable
+from netmiko import ConnectHandler, BaseConnection
+
+
+class ConnectionPool:
+    """
+    An object that keeps authenticated netmiko connections open,
+    so next commands or tasks for the same device can reuse them.
+    Connections are keyed by (host, port, username, device_type).
+    Other sessions (e.g. NETCONF) can be pooled too, when they have
+    the host attribute and the is_alive and disconnect methods.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: int = 300,
+        max_per_host: int = 2,
+        max_idle: int = 100,
+    ) -> None:
+        """
+        :param idle_timeout: int seconds after which an unused
+                             connection is closed.
+        :param max_per_host: int maximum number of connections
+                             open to one host at the same time.
+        :param max_idle: int maximum number of unused connections
+                         kept in the pool.
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.connections.conn_pool"
+        )
+        self._idle_timeout: int = idle_timeout
+        self._max_per_host: int = max_per_host
+        self._max_idle: int = max_idle
+        self._lock: Lock = Lock()
+        # key -> list of (connection, time of release)
+        self._idle: OrderedDict[tuple, list] = OrderedDict()
+        self._host_limits: dict[str, BoundedSemaphore] = {}
+
+    @property
+    def idle_timeout(self) -> int:
+        """Get seconds after which an unused connection is closed."""
+        return self._idle_timeout
+
+    @property
+    def max_per_host(self) -> int:
+        """Get maximum number of connections to one host."""
+        return self._max_per_host
+
+    @staticmethod
+    def make_key(conn_parametrs: dict) -> tuple:
+        """The function returns the pool key for the parameters."""
+        return (
+            conn_parametrs["host"],
+            conn_parametrs["port"],
+            conn_parametrs["username"],
+            conn_parametrs["device_type"],
+        )
+
+    def _host_limit(self, host: str) -> BoundedSemaphore:
+        """The function returns the semaphore limiting the host."""
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def _idle_count(self) -> int:
+        """The function returns number of unused connections."""
+        return sum(len(conns) for conns in self._idle.values())
+
+    def _disconnect(self, connection: BaseConnection) -> None:
+        """The function closes the connection, ignoring errors."""
+        try:
+            connection.disconnect()
+        except Exception as e:
+            self.logger.debug(f"Error while closing connection: {e}")
+
+    def _is_healthy(
+        self, connection: BaseConnection, released: float
+    ) -> bool:
+        """
+        The function checks if the unused connection can be reused.
+        """
+        if time.monotonic() - released > self.idle_timeout:
+            self.logger.debug(f"{connection.host}:Connection expired.")
+            return False
+        try:
+            return connection.is_alive()
+        except Exception:
+            return False
+
+    def _take_idle(self, key: tuple) -> BaseConnection | None:
+        """
+        The function returns a healthy unused connection for the key.
+        Broken and expired ones are closed.
+        """
+        while True:
+            with self._lock:
+                conns: list = self._idle.get(key, [])
+                if len(conns) == 0:
+                    return None
+                connection, released = conns.pop()
+                if len(conns) == 0:
+                    del self._idle[key]
+            if self._is_healthy(connection, released):
+                return connection
+            self._disconnect(connection)
+
+    def acquire(
+        self,
+        conn_parametrs: dict,
+        connect: Callable[..., BaseConnection] | None = None,
+        **kwargs,
+    ) -> BaseConnection:
+        """
+        The function returns a connection for the parameters.
+        Blocks while the host already has max_per_host connections.
+
+        :param conn_parametrs: netmiko connection parameters.
+        :param connect: function opening a new connection,
+            ConnectHandler when not given.
+        :param kwargs: additional ConnectHandler arguments.
+        :return: netmiko connection object.
+        """
+        key: tuple = self.make_key(conn_parametrs)
+        self._host_limit(key[0]).acquire()
+        try:
+            connection: BaseConnection | None = self._take_idle(key)
+            if connection is not None:
+                self.logger.debug(f"{key[0]}:Reusing connection.")
+                return connection
+            self.logger.debug(f"{key[0]}:Opening new connection.")
+            return (connect or ConnectHandler)(**conn_parametrs, **kwargs)
+        except Exception:
+            self._host_limit(key[0]).release()
+            raise
+
+    def release(
+        self, key: tuple, connection: BaseConnection, broken: bool = False
+    ) -> None:
+        """
+        The function returns the connection to the pool.
+        Broken connections are closed.
+        """
+        try:
+            if broken:
+                self._disconnect(connection)
+                return
+            with self._lock:
+                self._idle.setdefault(key, []).append(
+                    (connection, time.monotonic())
+                )
+                self._idle.move_to_end(key)
+                oldest: list = []
+                while self._idle_count() > self._max_idle:
+                    _key, conns = next(iter(self._idle.items()))
+                    oldest.append(conns.pop(0)[0])
+                    if len(conns) == 0:
+                        del self._idle[_key]
+            for old_connection in oldest:
+                self._disconnect(old_connection)
+        finally:
+            self._host_limit(key[0]).release()
+
+    @contextmanager
+    def connection(
+        self,
+        conn_parametrs: dict,
+        connect: Callable[..., BaseConnection] | None = None,
+        **kwargs,
+    ):
+        """
+        The context manager that takes a connection from the pool
+        and gives it back. On error the connection is closed.
+        """
+        key: tuple = self.make_key(conn_parametrs)
+        connection: BaseConnection = self.acquire(
+            conn_parametrs, connect, **kwargs
+        )
+        try:
+            yield connection
+        except BaseException:
+            self.release(key, connection, broken=True)
+            raise
+        self.release(key, connection)
+
+    def close_expired(self) -> None:
+        """The function closes unused connections that expired."""
+        now: float = time.monotonic()
+        expired: list = []
+        with self._lock:
+            for key in list(self._idle.keys()):
+                conns: list = self._idle[key]
+                expired.extend(
+                    conn
+                    for conn, released in conns
+                    if now - released > self.idle_timeout
+                )
+                conns[:] = [
+                    (conn, released)
+                    for conn, released in conns
+                    if now - released <= self.idle_timeout
+                ]
+                if len(conns) == 0:
+                    del self._idle[key]
+        for connection in expired:
+            self._disconnect(connection)
+
+    def close_all(self) -> None:
+        """The function closes all unused connections."""
+        with self._lock:
+            conns: list = [
+                conn for key in self._idle for conn, _ in self._idle[key]
+            ]
+            self._idle.clear()
+        self.logger.debug(f"Closing {len(conns)} pooled connections.")
+        for connection in conns:
+            self._disconnect(connection)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import json
+import logging
+import time
+import urllib3
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    HTTPError,
+    MaxRetryError,
+    NewConnectionError,
+    ReadTimeoutError,
+)
+from netinfscript.devices.base_device import BaseDevice
+
+RESTCONF_ACCEPT: str = "application/yang-data+json"
+
+
+def make_http_pool(
+    max_per_host: int = 2, verify: bool = True
+) -> urllib3.PoolManager:
+    """
+    The function returns the pool of keep-alive HTTPS connections
+    shared by all RESTCONF downloads. Every host keeps up to
+    max_per_host open connections, next requests wait for them.
+
+    :param max_per_host: int max connections to one host.
+    :param verify: bool check certificates of the devices.
+    """
+    if not verify:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return urllib3.PoolManager(
+        maxsize=max_per_host,
+        block=True,
+        cert_reqs="CERT_REQUIRED" if verify else "CERT_NONE",
+        retries=False,
+    )
+
+
+class ConnRESTCONF:
+    """
+    An object responsible for RESTCONF downloads. The configuration
+    comes back in one GET request of the device's data path.
+    """
+
+    def __init__(
+        self,
+        dev: BaseDevice,
+        http_pool: urllib3.PoolManager | None = None,
+        read_timeout: float = 60,
+        connect_timeout: float | None = None,
+    ) -> None:
+        """
+        :param dev: device object.
+        :param http_pool: shared pool of HTTPS connections, a pool
+            for this object only is created when not given.
+        :param read_timeout: float max seconds of waiting for data.
+        :param connect_timeout: float max seconds of connecting.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_restconf"
+        )
+        self._http_pool: urllib3.PoolManager = http_pool or make_http_pool()
+        self._read_timeout: float = read_timeout
+        self._connect_timeout: float | None = connect_timeout
+        self._ip: str = dev.ip
+        self._port: int = dev.port
+        self._path: str = dev.restconf_path
+        self._username: str = dev.username
+        self._password: str = dev.password
+        # True when the device didn't answer in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        # seconds spent in the command phase
+        self.timings: dict[str, float] = {}
+
+    @property
+    def ip(self) -> str:
+        """Get the device's IP address."""
+        return self._ip
+
+    @property
+    def url(self) -> str:
+        """Get the url of the configuration."""
+        host: str = f"[{self._ip}]" if ":" in self._ip else self._ip
+        return f"https://{host}:{self._port}{self._path}"
+
+    def _request(self) -> str | None:
+        """
+        The function sends the request and returns the body
+        of the answer or None.
+        """
+        headers: dict = urllib3.make_headers(
+            basic_auth=f"{self._username}:{self._password}",
+            keep_alive=True,
+        )
+        headers["Accept"] = RESTCONF_ACCEPT
+        try:
+            response: urllib3.BaseHTTPResponse = self._http_pool.request(
+                "GET",
+                self.url,
+                headers=headers,
+                timeout=urllib3.Timeout(
+                    connect=self._connect_timeout, read=self._read_timeout
+                ),
+            )
+        except ReadTimeoutError:
+            self.logger.warning(
+                f"{self.ip}:No answer after {self._read_timeout}s. "
+                "Read timeout."
+            )
+            self.timed_out = True
+            self.error = "timeout"
+            return None
+        except (ConnectTimeoutError, NewConnectionError, MaxRetryError) as e:
+            self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+            self.error = "unreachable"
+            return None
+        except HTTPError as e:
+            self.logger.warning(f"{self.ip}:Can't download. Error {e}")
+            self.error = "error"
+            return None
+        if response.status in [401, 403]:
+            self.logger.warning(f"{self.ip}:Can't connect. Not authorized.")
+            self.error = "auth"
+            return None
+        if response.status != 200:
+            self.logger.warning(
+                f"{self.ip}:Can't download. HTTP status {response.status}."
+            )
+            self.error = "error"
+            return None
+        return response.data.decode("utf-8", errors="replace")
+
+    def get_config(self) -> str | None:
+        """
+        The function downloads the configuration. JSON is written
+        with one key per line and sorted keys, so the stored files
+        give readable diffs.
+
+        :return: device configuration.
+        """
+        self.logger.debug(f"{self.ip}:Trying download config.")
+        started: float = time.perf_counter()
+        body: str | None = self._request()
+        self.timings["command"] = time.perf_counter() - started
+        if body is None:
+            self.logger.warning(f"{self.ip}:No output config.")
+            return None
+        try:
+            return json.dumps(json.loads(body), indent=2, sort_keys=True)
+        except ValueError:
+            self.logger.debug(f"{self.ip}:Answer isn't JSON. Storing as is.")
+            return body
+
+
+if __name__ == "__main__":
+    pass
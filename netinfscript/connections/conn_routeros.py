@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import hashlib
+import logging
+import re
+import socket
+import ssl
+import time
+from netinfscript.devices.base_device import BaseDevice
+from netinfscript.connections.conn_pool import ConnectionPool
+
+# values written without quotes in the export format
+PLAIN_VALUE: re.Pattern = re.compile(r"^[\w.:/*+@,-]+$")
+
+
+def encode_length(length: int) -> bytes:
+    """The function returns the length of the API word."""
+    if length < 0x80:
+        return bytes([length])
+    if length < 0x4000:
+        return (length | 0x8000).to_bytes(2, "big")
+    if length < 0x200000:
+        return (length | 0xC00000).to_bytes(3, "big")
+    if length < 0x10000000:
+        return (length | 0xE0000000).to_bytes(4, "big")
+    return b"\xf0" + length.to_bytes(4, "big")
+
+
+def encode_sentence(words: list[str]) -> bytes:
+    """The function returns the API sentence of the words."""
+    data: bytearray = bytearray()
+    for word in words:
+        encoded: bytes = word.encode()
+        data += encode_length(len(encoded)) + encoded
+    return bytes(data + b"\x00")
+
+
+def export_value(value: str) -> str:
+    """The function returns the value written like in /export."""
+    if PLAIN_VALUE.match(value):
+        return value
+    escaped: str = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class RouterOSError(Exception):
+    """The device answered with !fatal or broke the protocol."""
+
+
+class RouterOSSession:
+    """
+    An object that keeps one RouterOS API session. Commands are
+    tagged, so many of them are sent at once and their replies
+    are read from the same socket. The session can be kept in
+    the ConnectionPool.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        device_type: str,
+        password: str | None = None,
+        use_ssl: bool = False,
+        verify: bool = True,
+        conn_timeout: float | None = None,
+        read_timeout: float = 60,
+    ) -> None:
+        """
+        The session is opened and logged in when the object
+        is created.
+
+        :raise OSError: when the connection fails.
+        :raise PermissionError: when the login is refused.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_routeros"
+        )
+        self.host: str = host
+        self._buffer: bytes = b""
+        self._tag: int = 0
+        self._socket: socket.socket = socket.create_connection(
+            (host, port), timeout=conn_timeout
+        )
+        try:
+            if use_ssl:
+                context: ssl.SSLContext = ssl.create_default_context()
+                if not verify:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                self._socket = context.wrap_socket(
+                    self._socket, server_hostname=host
+                )
+            self._socket.settimeout(read_timeout)
+            self._login(username, password or "")
+        except Exception:
+            self._socket.close()
+            raise
+
+    def _read_exactly(self, size: int) -> bytes:
+        """The function returns the next size bytes."""
+        while len(self._buffer) < size:
+            data: bytes = self._socket.recv(65536)
+            if len(data) == 0:
+                raise RouterOSError("connection closed by the device")
+            self._buffer += data
+        data: bytes = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+    def _read_length(self) -> int:
+        """The function returns the length of the next word."""
+        first: int = self._read_exactly(1)[0]
+        if first < 0x80:
+            return first
+        if first < 0xC0:
+            return ((first & 0x3F) << 8) + self._read_exactly(1)[0]
+        if first < 0xE0:
+            rest: bytes = self._read_exactly(2)
+            return ((first & 0x1F) << 16) + int.from_bytes(rest, "big")
+        if first < 0xF0:
+            rest: bytes = self._read_exactly(3)
+            return ((first & 0x0F) << 24) + int.from_bytes(rest, "big")
+        return int.from_bytes(self._read_exactly(4), "big")
+
+    def _read_sentence(self) -> list[str]:
+        """The function returns words of the next sentence."""
+        words: list[str] = []
+        while True:
+            length: int = self._read_length()
+            if length == 0:
+                return words
+            words.append(
+                self._read_exactly(length).decode("utf-8", errors="replace")
+            )
+
+    @staticmethod
+    def _attributes(words: list[str]) -> dict[str, str]:
+        """The function returns attributes of the reply words."""
+        attributes: dict[str, str] = {}
+        for word in words[1:]:
+            if word.startswith("="):
+                key, _, value = word[1:].partition("=")
+                attributes[key] = value
+            elif word.startswith(".tag="):
+                attributes[".tag"] = word[5:]
+        return attributes
+
+    def _login(self, username: str, password: str) -> None:
+        """
+        The function logs in. Devices older than 6.43 answer with
+        a challenge, the MD5 response is sent then.
+        """
+        self._socket.sendall(
+            encode_sentence(
+                ["/login", f"=name={username}", f"=password={password}"]
+            )
+        )
+        words: list[str] = self._read_sentence()
+        attributes: dict[str, str] = self._attributes(words)
+        if words[0] == "!done" and "ret" in attributes:
+            digest: str = hashlib.md5(
+                b"\x00"
+                + password.encode()
+                + bytes.fromhex(attributes["ret"])
+            ).hexdigest()
+            self._socket.sendall(
+                encode_sentence(
+                    [
+                        "/login",
+                        f"=name={username}",
+                        f"=response=00{digest}",
+                    ]
+                )
+            )
+            words = self._read_sentence()
+            attributes = self._attributes(words)
+        if words[0] != "!done":
+            raise PermissionError(attributes.get("message", "login failed"))
+
+    def print_sections(
+        self, sections: list[str]
+    ) -> dict[str, list[dict[str, str]] | None]:
+        """
+        The function sends print of all sections at once and
+        returns their items. Sections not known by the device
+        get None.
+
+        :param sections: menus like '/ip address'.
+        """
+        tags: dict[str, str] = {}
+        request: bytearray = bytearray()
+        for section in sections:
+            self._tag += 1
+            tags[str(self._tag)] = section
+            command: str = section.strip().replace(" ", "/") + "/print"
+            request += encode_sentence([command, f".tag={self._tag}"])
+        self._socket.sendall(bytes(request))
+        items: dict[str, list[dict[str, str]] | None] = {
+            section: [] for section in sections
+        }
+        pending: set[str] = set(tags)
+        while len(pending) > 0:
+            words: list[str] = self._read_sentence()
+            if len(words) == 0:
+                continue
+            attributes: dict[str, str] = self._attributes(words)
+            if words[0] == "!fatal":
+                raise RouterOSError(attributes.get("message", "fatal"))
+            tag: str | None = attributes.pop(".tag", None)
+            if tag not in tags:
+                continue
+            if words[0] == "!re" and items[tags[tag]] is not None:
+                items[tags[tag]].append(attributes)
+            elif words[0] == "!trap":
+                self.logger.debug(
+                    f"{self.host}:{tags[tag]}: {attributes.get('message')}"
+                )
+                items[tags[tag]] = None
+            elif words[0] == "!done":
+                pending.discard(tag)
+        return items
+
+    def is_alive(self) -> bool:
+        """
+        The function checks if the session can be used. The open
+        socket isn't enough, the device may have dropped the
+        session, so the identity is printed.
+        """
+        if self._socket.fileno() == -1:
+            return False
+        try:
+            self.print_sections(["/system identity"])
+        except (OSError, RouterOSError) as e:
+            self.logger.debug(f"{self.host}:Session is dead: {e}")
+            return False
+        return True
+
+    def disconnect(self) -> None:
+        """The function closes the session, ignoring errors."""
+        try:
+            self._socket.sendall(encode_sentence(["/quit"]))
+        except OSError as e:
+            self.logger.debug(f"{self.host}:Can't close session: {e}")
+        finally:
+            self._socket.close()
+
+
+class ConnRouterOS:
+    """
+    An object responsible for RouterOS API downloads. All sections
+    of the device are printed over one socket and written with the
+    syntax of /export. It isn't the export itself: all printed
+    properties are kept, also values equal to the defaults.
+    """
+
+    def __init__(
+        self,
+        dev: BaseDevice,
+        pool: ConnectionPool | None = None,
+        read_timeout: float = 60,
+        connect_timeout: float | None = None,
+        verify: bool = True,
+    ) -> None:
+        """
+        :param dev: device object.
+        :param pool: connection pool, sessions are reused when given.
+        :param read_timeout: float max seconds of waiting for data.
+        :param connect_timeout: float max seconds of connecting.
+        :param verify: bool check the certificate with 'api-ssl'.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_routeros"
+        )
+        self._pool: ConnectionPool | None = pool
+        self._read_timeout: float = read_timeout
+        self._ip: str = dev.ip
+        self._sections: list[str] = dev.api_sections
+        self._skip_properties: set[str] = dev.api_skip_properties
+        self._sensitive_properties: set[str] = dev.api_sensitive_properties
+        self._volatile_properties: dict[str, set[str]] = (
+            dev.api_volatile_properties
+        )
+        self._find_properties: dict[str, str] = dev.api_find_properties
+        self._conn_parametrs: dict = {
+            "host": dev.ip,
+            "port": dev.port,
+            "username": dev.username,
+            "device_type": "routeros_api",
+            "password": dev.password,
+            "use_ssl": dev.connection == "api-ssl",
+            "verify": verify,
+            "conn_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+        }
+        # True when the device didn't answer in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        # seconds spent in the connect and command phases
+        self.timings: dict[str, float] = {}
+
+    @property
+    def ip(self) -> str:
+        """Get the device's IP address."""
+        return self._ip
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Get the connection pool, if used."""
+        return self._pool
+
+    def _command(self, section: str, entry: dict[str, str]) -> str:
+        """
+        The function returns the command of the entry. Built-in
+        items can't be added, they are found like in /export.
+        """
+        if "default-name" in entry:
+            value: str = export_value(entry["default-name"])
+            return f"set [ find default-name={value} ]"
+        key: str | None = self._find_properties.get(section.strip())
+        if key is not None and key in entry:
+            return f"set [ find {key}={export_value(entry[key])} ]"
+        if entry.get("default") == "true":
+            return "set [ find default=yes ]"
+        return "add" if ".id" in entry else "set"
+
+    def render(self, items: dict[str, list[dict[str, str]] | None]) -> str:
+        """
+        The function writes the sections with the syntax of
+        /export. Items without id are settings of the menu ('set'),
+        built-in items are found by their name ('set [ find ... ]'),
+        other are entries ('add'). It is a dump of the printed
+        properties: values equal to the defaults are kept, while
+        dynamic and built-in entries, read-only, volatile and
+        sensitive properties are skipped.
+        """
+        lines: list[str] = []
+        for section, entries in items.items():
+            if not entries:
+                continue
+            name: str = section.strip()
+            skipped: set[str] = (
+                self._skip_properties
+                | self._sensitive_properties
+                | self._volatile_properties.get(name, set())
+                | {"default-name", self._find_properties.get(name, "")}
+            )
+            section_lines: list[str] = []
+            for entry in entries:
+                if (
+                    entry.get("dynamic") == "true"
+                    or entry.get("builtin") == "true"
+                ):
+                    continue
+                values: str = " ".join(
+                    f"{key}={export_value(value)}"
+                    for key, value in entry.items()
+                    if not key.startswith(".") and key not in skipped
+                )
+                command: str = self._command(section, entry)
+                section_lines.append(f"{command} {values}".rstrip())
+            if len(section_lines) > 0:
+                lines.append(name)
+                lines.extend(section_lines)
+        return "\n".join(lines)
+
+    def _download(self, session: RouterOSSession, started: float) -> str:
+        """The function prints all sections in the open session."""
+        command_started: float = time.perf_counter()
+        self.timings["connect"] = command_started - started
+        output: str = self.render(session.print_sections(self._sections))
+        self.timings["command"] = time.perf_counter() - command_started
+        return output
+
+    def get_config(self) -> str | None:
+        """
+        The function downloads the configuration.
+
+        :return: device configuration.
+        """
+        self.logger.debug(f"{self.ip}:Trying download config.")
+        started: float = time.perf_counter()
+        try:
+            if self.pool is not None:
+                with self.pool.connection(
+                    self._conn_parametrs, RouterOSSession
+                ) as session:
+                    self.logger.debug(f"{self.ip}:Pooled session taken.")
+                    return self._download(session, started)
+            session: RouterOSSession = RouterOSSession(**self._conn_parametrs)
+            try:
+                return self._download(session, started)
+            finally:
+                session.disconnect()
+        except socket.timeout:
+            if "connect" in self.timings:
+                self.logger.warning(
+                    f"{self.ip}:No answer after {self._read_timeout}s. "
+                    "Read timeout."
+                )
+                self.timed_out = True
+                self.error = "timeout"
+            else:
+                self.logger.warning(f"{self.ip}:Can't connect. Timeout.")
+                self.error = "unreachable"
+        except PermissionError as e:
+            self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+            self.error = "auth"
+        except ssl.SSLError as e:
+            self.logger.warning(f"{self.ip}:Can't connect. TLS error {e}")
+            self.error = "error"
+        except OSError:
+            self.logger.warning(
+                f"{self.ip}:Can't connect. TCP connection to device failed."
+            )
+            self.error = "unreachable"
+        except RouterOSError as e:
+            self.logger.warning(f"{self.ip}:RouterOS API error {e}")
+            self.error = "error"
+        if "connect" not in self.timings:
+            self.timings["connect"] = time.perf_counter() - started
+        self.logger.warning(f"{self.ip}:No output config.")
+        return None
+
+
+if __name__ == "__main__":
+    pass
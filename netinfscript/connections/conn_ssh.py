@@ -13,13 +13,18 @@
 # License, Version 3.0.
 
 import logging
+import re
+import time
+from typing import Callable
 from netmiko import (
     ConnectHandler,
     NetmikoBaseException,
     NetmikoAuthenticationException,
     NetmikoTimeoutException,
+    ReadTimeout,
 )
 from netinfscript.devices.base_device import BaseDevice
+from netinfscript.connections.conn_pool import ConnectionPool
 
 
 class ConnSSH:
@@ -27,9 +32,40 @@ class ConnSSH:
     An object responsible for SSH connections and their validation.
     """
 
-    def __init__(self, dev: BaseDevice, commands: str | list[str]) -> None:
+    def __init__(
+        self,
+        dev: BaseDevice,
+        commands: str | list[str],
+        pool: ConnectionPool | None = None,
+        read_timeout: float = 60,
+        pipeline: bool = False,
+        connect_timeout: float | None = None,
+        probe: Callable[[str], bool] | None = None,
+    ) -> None:
+        """
+        :param probe: function that gets the output of the probe
+            command of the device and returns True when the
+            configuration didn't change, then it isn't downloaded.
+        """
         self.logger = logging.getLogger(f"netinfscript.connections.conn_ssh")
+        self._pool: ConnectionPool | None = pool
+        self._read_timeout: float = read_timeout
+        self._pipeline: bool = pipeline
+        # output of every command, filled by the last download
+        self.outputs: dict[str, str] = {}
+        # True when the device didn't return the prompt in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        self._connect_timeout: float | None = connect_timeout
+        self._probe: Callable[[str], bool] | None = probe
+        self._probe_command: str | None = dev.probe_command
+        # True when the probe found no change and nothing was downloaded
+        self.skipped: bool = False
         self._ip: str = dev.ip
+        # seconds spent in the connect and command phases
+        self.timings: dict[str, float] = {}
+        self._connect_started: float = 0.0
         self._username: str = dev.username
         self._port: int = dev.port
         self._device_type: str = dev.device_type
@@ -90,18 +126,33 @@ class ConnSSH:
     @property
     def privilege_cmd(self) -> str:
         """Get the privilege command for device access."""
-        return self._privilege_cmd
+        return self._mode_cmd
 
     @property
     def privilege_password(self) -> str:
         """Get the privilege password for elevated access."""
-        return self._privilege_password
+        return self._secret
 
     @property
     def commands(self) -> list[str]:
         """Get the privilege password for elevated access."""
         return self._commands
 
+    @property
+    def read_timeout(self) -> float:
+        """Get the max seconds of waiting for the prompt."""
+        return self._read_timeout
+
+    @property
+    def pipeline(self) -> bool:
+        """Get if all commands are written to the channel at once."""
+        return self._pipeline
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Get the connection pool, if used."""
+        return self._pool
+
     def _set_privilege(self) -> None:
         """
         This function change privilge level if device support it.
@@ -111,22 +162,59 @@ class ConnSSH:
         self.logger.debug(f"{self.ip}:Check privilege mode.")
         if not self._connection.check_enable_mode():
             self.logger.debug(f"{self.ip}:Change privilege mode.")
-            if len(self.mode_cmd) > 0:
-                self._connection.enable(cmd=self.mode_cmd)
+            if len(self._mode_cmd) > 0:
+                self._connection.enable(cmd=self._mode_cmd)
 
     def _send_command(self, command: str) -> object:
         """
-        This function send command to device.
+        This function send command to device. Netmiko stops reading
+        as soon as the prompt appears, the read timeout is only
+        the limit for devices that hang.
 
         :param _connection: netmiko connection object.
         :param command_lst: command to send.
         """
         self.logger.debug(f"{self.ip}:Sending command.")
         output: str = self._connection.send_command(
-            command_string=command, read_timeout=60
+            command_string=command, read_timeout=self.read_timeout
         )
         return output
 
+    def _send_pipelined(self, commands: list[str]) -> dict[str, str]:
+        """
+        This function writes all commands to the channel at once and
+        splits the output by the prompt, so the batch costs about
+        one round trip. The device must show the echo of the next
+        command only after the prompt, like Cisco IOS does.
+
+        :param commands: commands to send, in order.
+        :return: dict of command and its output.
+        """
+        self.logger.debug(f"{self.ip}:Sending commands in pipeline.")
+        prompt: str = self._connection.find_prompt()
+        # the echo of the next command follows the prompt on its line
+        pattern: str = rf"^{re.escape(prompt)}"
+        self._connection.write_channel(
+            "".join(
+                command + self._connection.RETURN for command in commands
+            )
+        )
+        outputs: dict[str, str] = {}
+        for command in commands:
+            # netmiko keeps data after the pattern for the next read,
+            # prompts left by the session setup come before the echo
+            self._connection.read_until_pattern(
+                pattern=re.escape(command), read_timeout=self.read_timeout
+            )
+            stdout: str = self._connection.read_until_pattern(
+                pattern=pattern, re_flags=re.M, read_timeout=self.read_timeout
+            )
+            stdout = self._connection.normalize_linefeeds(stdout)
+            # the rest of the echo line
+            stdout = stdout.split("\n", 1)[-1]
+            outputs[command] = self._connection.strip_prompt(stdout)
+        return outputs
+
     def _send(self) -> str:
         """
         the function decide how send commands.
@@ -134,11 +222,38 @@ class ConnSSH:
         :param _connection: netmiko connection object.
         :param command_lst: str or list of command(s) to send.
         """
-        stdout_lst = []
-        for command in self.commands:
-            stdout: str = self._send_command(command)
-            stdout_lst.append(stdout)
-        output = "".join(stdout_lst)
+        send_started: float = time.perf_counter()
+        self.timings["connect"] = send_started - self._connect_started
+        probing: bool = (
+            self._probe is not None and self._probe_command is not None
+        )
+        commands: list[str] = self.commands
+        if probing:
+            commands = [self._probe_command, *commands]
+        if self.pipeline and len(commands) > 1:
+            # the probe is answered in the same round trip as the
+            # configuration, so the configuration is always read
+            self.outputs = self._send_pipelined(commands)
+            probe_output: str | None = (
+                self.outputs.pop(self._probe_command) if probing else None
+            )
+        else:
+            probe_output: str | None = (
+                self._send_command(self._probe_command) if probing else None
+            )
+        if probe_output is not None:
+            self.logger.debug(f"{self.ip}:Probing for changes.")
+            if self._probe(probe_output):
+                self.skipped = True
+                self.timings["command"] = time.perf_counter() - send_started
+                return ""
+        if not self.pipeline or len(commands) == 1:
+            self.outputs = {
+                command: self._send_command(command)
+                for command in self.commands
+            }
+        output = "".join(self.outputs[command] for command in self.commands)
+        self.timings["command"] = time.perf_counter() - send_started
         return output
 
     def _get_conection_and_send(self) -> str | bool:
@@ -162,6 +277,8 @@ class ConnSSH:
                 "key_file": self.key_file,
                 "passphrase": self.passphrase,
             }
+            if self._connect_timeout is not None:
+                conn_parametrs["conn_timeout"] = self._connect_timeout
         except Exception as e:
             self.logger.warning(
                 f"{self.ip}:Can't setup connection parametrs."
@@ -172,57 +289,80 @@ class ConnSSH:
             )
             if conn_parametrs["key_file"] != None:
                 self.logger.debug(f"{self.ip}:Connecting with public key.")
-                with ConnectHandler(
-                    **conn_parametrs,
-                    use_keys=True,
-                    ssh_strict=True,
-                    system_host_keys=True,
-                ) as self._connection:
-                    self.logger.debug(f"{self.ip}:Connection created.")
-                    self._set_privilege()
-                    output = self._send()
+                connect_kwargs: dict = {
+                    "use_keys": True,
+                    "ssh_strict": True,
+                    "system_host_keys": True,
+                }
             else:
                 self.logger.debug(
                     f"{self.ip}:Attempting " "connect with password."
                 )
+                connect_kwargs: dict = {
+                    "ssh_strict": True,
+                    "system_host_keys": True,
+                }
+            if self.pool is not None:
+                with self.pool.connection(
+                    conn_parametrs, **connect_kwargs
+                ) as self._connection:
+                    self.logger.debug(f"{self.ip}:Pooled connection taken.")
+                    self._set_privilege()
+                    output = self._send()
+            else:
                 with ConnectHandler(
-                    **conn_parametrs, ssh_strict=True, system_host_keys=True
+                    **conn_parametrs, **connect_kwargs
                 ) as self._connection:
                     self.logger.debug(f"{self.ip}:Connection created.")
                     self._set_privilege()
                     output = self._send()
             self.logger.debug(f"{self.ip}:Connection completend sucessfully.")
             return output
+        except ReadTimeout:
+            self.logger.warning(
+                f"{self.ip}:No prompt after {self.read_timeout}s. "
+                "Read timeout."
+            )
+            self.timed_out = True
+            self.error = "timeout"
+            return False
         except NetmikoTimeoutException as e:
             if "known_hosts" in str(e):
                 self.logger.warning(
                     f"{self.ip}:Can't connect. Device not found."
                 )
+                self.error = "host_key"
                 return False
             else:
                 self.logger.warning(
                     f"{self.ip}:Can't connect. TCP connection to device failed."
                 )
+                self.error = "unreachable"
                 return False
         except NetmikoBaseException as e:
             self.logger.warning(f"{self.ip}:Can't connect.")
             self.logger.warning(f"{self.ip}:Error {e}")
+            self.error = "error"
             return False
         except NetmikoAuthenticationException as e:
             self.logger.warning(f"{self.ip}:Can't connect.")
             self.logger.warning(f"{self.ip}:Error {e}")
+            self.error = "auth"
             return False
         except ValueError as e:
             if "enable mode" in str(e):
                 self.logger.warning(
                     f"{self.ip}:Failed enter enable mode. Check password."
                 )
+                self.error = "auth"
                 return False
             else:
                 self.logger.warning(f"{self.ip}:Unsuported device type.")
+                self.error = "error"
                 return False
         except Exception as e:
             self.logger.error(f"{self.ip}:Exceptation - {e}")
+            self.error = "error"
             return False
 
     def get_config(self) -> str:
@@ -234,12 +374,30 @@ class ConnSSH:
         """
         self.logger.debug(f"{self.ip}:Get command.")
         self.logger.debug(f"{self.ip}:Trying download config.")
+        self._connect_started = time.perf_counter()
         output: str = self._get_conection_and_send()
+        if "connect" not in self.timings:
+            self.timings["connect"] = (
+                time.perf_counter() - self._connect_started
+            )
+        if self.skipped:
+            return None
         if not output:
             self.logger.warning(f"{self.ip}:No output config.")
             return None
         return output
 
+    def get_outputs(self) -> dict[str, str] | None:
+        """
+        The function downloads the output of every command.
+
+        :return: dict of command and its output, in order
+            of the commands.
+        """
+        if self.get_config() is None:
+            return None
+        return self.outputs
+
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import codecs
+import logging
+import socket
+import time
+import zlib
+import paramiko
+from netinfscript.devices.base_device import BaseDevice
+
+# size of the blocks read from the channel
+BLOCK_SIZE: int = 65536
+
+
+class TransferError(Exception):
+    """The device refused the file or broke the SCP protocol."""
+
+
+class ChunkSink:
+    """
+    An object that receives blocks of the file and keeps them as
+    text chunks for the filter. Gzip files are decompressed while
+    they are received, the whole file is never joined in memory.
+    """
+
+    def __init__(self, gzip: bool = False) -> None:
+        """:param gzip: bool the file is gzip compressed."""
+        self._decompressor: object | None = (
+            zlib.decompressobj(16 + zlib.MAX_WBITS) if gzip else None
+        )
+        self._decoder: codecs.IncrementalDecoder = (
+            codecs.getincrementaldecoder("utf-8")(errors="replace")
+        )
+        self.chunks: list[str] = []
+        self.size: int = 0
+
+    def write(self, data: bytes) -> None:
+        """The function adds the next block of the file."""
+        self.size += len(data)
+        if self._decompressor is not None:
+            data = self._decompressor.decompress(data)
+        text: str = self._decoder.decode(data)
+        if len(text) > 0:
+            self.chunks.append(text)
+
+    def finish(self) -> list[str]:
+        """The function returns all text chunks of the file."""
+        data: bytes = b""
+        if self._decompressor is not None:
+            data = self._decompressor.flush()
+        text: str = self._decoder.decode(data, final=True)
+        if len(text) > 0:
+            self.chunks.append(text)
+        return self.chunks
+
+
+class ConnTransfer:
+    """
+    An object responsible for downloads of the configuration file
+    over SCP or SFTP, instead of the output of the show command.
+    Devices that must write the file first (e.g. Mikrotik export)
+    get the prepare command in an exec channel.
+    """
+
+    def __init__(
+        self,
+        dev: BaseDevice,
+        protocol: str = "scp",
+        read_timeout: float = 60,
+        connect_timeout: float | None = None,
+        compress: bool = False,
+    ) -> None:
+        """
+        :param dev: device object.
+        :param protocol: str 'scp' or 'sftp'.
+        :param read_timeout: float max seconds of waiting for data.
+        :param connect_timeout: float max seconds of connecting.
+        :param compress: bool use the compression of the SSH session.
+        """
+        self.logger = logging.getLogger(
+            "netinfscript.connections.conn_transfer"
+        )
+        self._dev: BaseDevice = dev
+        self._ip: str = dev.ip
+        self._protocol: str = protocol
+        self._read_timeout: float = read_timeout
+        self._connect_timeout: float | None = connect_timeout
+        self._compress: bool = compress
+        # True when the device didn't answer in time
+        self.timed_out: bool = False
+        # kind of the error of the last download, see RetryQueue
+        self.error: str | None = None
+        # seconds spent in the connect and command phases
+        self.timings: dict[str, float] = {}
+
+    @property
+    def ip(self) -> str:
+        """Get the device's IP address."""
+        return self._ip
+
+    def _connect(self) -> paramiko.SSHClient:
+        """
+        The function opens the SSH session. Only hosts from
+        the known_hosts file are accepted.
+        """
+        client: paramiko.SSHClient = paramiko.SSHClient()
+        client.load_system_host_keys()
+        client.set_missing_host_key_policy(paramiko.RejectPolicy())
+        client.connect(
+            self._dev.ip,
+            port=self._dev.port,
+            username=self._dev.username,
+            password=self._dev.password,
+            key_filename=self._dev.key_file,
+            passphrase=self._dev.passphrase,
+            timeout=self._connect_timeout,
+            look_for_keys=self._dev.key_file is not None,
+            allow_agent=False,
+            compress=self._compress,
+        )
+        return client
+
+    def _exec(self, client: paramiko.SSHClient, command: str) -> None:
+        """The function runs the command and waits for its end."""
+        self.logger.debug(f"{self.ip}:Running '{command}'.")
+        channel: paramiko.Channel = client.get_transport().open_session()
+        channel.settimeout(self._read_timeout)
+        channel.exec_command(command)
+        while channel.recv(BLOCK_SIZE):
+            pass
+        channel.close()
+
+    def _scp_get(
+        self, client: paramiko.SSHClient, path: str, sink: ChunkSink
+    ) -> None:
+        """
+        The function reads the file with the source side of the SCP
+        protocol: one 'C' record with the size, then the data.
+        """
+        channel: paramiko.Channel = client.get_transport().open_session()
+        channel.settimeout(self._read_timeout)
+        channel.exec_command(f"scp -f {path}")
+        try:
+            channel.sendall(b"\x00")
+            header: bytes = b""
+            while not header.endswith(b"\n"):
+                data: bytes = channel.recv(1)
+                if len(data) == 0:
+                    raise TransferError("no file header")
+                header += data
+            if not header.startswith(b"C"):
+                raise TransferError(header[1:].decode(errors="replace"))
+            remaining: int = int(header.split(b" ")[1])
+            channel.sendall(b"\x00")
+            while remaining > 0:
+                data = channel.recv(min(BLOCK_SIZE, remaining))
+                if len(data) == 0:
+                    raise TransferError("file truncated")
+                sink.write(data)
+                remaining -= len(data)
+            channel.recv(1)
+            channel.sendall(b"\x00")
+        finally:
+            channel.close()
+
+    def _sftp_get(
+        self, client: paramiko.SSHClient, path: str, sink: ChunkSink
+    ) -> None:
+        """The function reads the file over SFTP with prefetch."""
+        sftp: paramiko.SFTPClient = client.open_sftp()
+        try:
+            sftp.get_channel().settimeout(self._read_timeout)
+            sftp.getfo(path, sink, prefetch=True)
+        finally:
+            sftp.close()
+
+    def _download(self, client: paramiko.SSHClient) -> list[str]:
+        """The function writes the file, if needed, and reads it."""
+        path: str = self._dev.transfer_path
+        sink: ChunkSink = ChunkSink(gzip=path.endswith(".gz"))
+        if self._dev.transfer_prepare is not None:
+            self._exec(client, self._dev.transfer_prepare)
+        try:
+            if self._protocol == "sftp":
+                self._sftp_get(client, path, sink)
+            else:
+                self._scp_get(client, path, sink)
+        finally:
+            if self._dev.transfer_cleanup is not None:
+                self._exec(client, self._dev.transfer_cleanup)
+        self.logger.debug(f"{self.ip}:Received {sink.size} bytes.")
+        return sink.finish()
+
+    def get_config(self) -> list[str] | None:
+        """
+        The function downloads the configuration file.
+
+        :return: device configuration in chunks.
+        """
+        self.logger.debug(f"{self.ip}:Trying download config file.")
+        started: float = time.perf_counter()
+        try:
+            client: paramiko.SSHClient = self._connect()
+            try:
+                command_started: float = time.perf_counter()
+                self.timings["connect"] = command_started - started
+                output: list[str] = self._download(client)
+                self.timings["command"] = (
+                    time.perf_counter() - command_started
+                )
+                return output
+            finally:
+                client.close()
+        except socket.timeout:
+            if "connect" in self.timings:
+                self.logger.warning(
+                    f"{self.ip}:No data after {self._read_timeout}s. "
+                    "Read timeout."
+                )
+                self.timed_out = True
+                self.error = "timeout"
+            else:
+                self.logger.warning(f"{self.ip}:Can't connect. Timeout.")
+                self.error = "unreachable"
+        except paramiko.AuthenticationException as e:
+            self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+            self.error = "auth"
+        except paramiko.BadHostKeyException:
+            self.logger.warning(f"{self.ip}:Can't connect. Wrong host key.")
+            self.error = "host_key"
+        except paramiko.SSHException as e:
+            if "not found in known_hosts" in str(e):
+                self.logger.warning(
+                    f"{self.ip}:Can't connect. Device not found."
+                )
+                self.error = "host_key"
+            else:
+                self.logger.warning(f"{self.ip}:Can't connect. Error {e}")
+                self.error = "error"
+        except FileNotFoundError:
+            self.logger.warning(
+                f"{self.ip}:File {self._dev.transfer_path} not found."
+            )
+            self.error = "error"
+        except OSError:
+            self.logger.warning(
+                f"{self.ip}:Can't connect. TCP connection to device failed."
+            )
+            self.error = "unreachable"
+        except (TransferError, ValueError, zlib.error) as e:
+            self.logger.warning(f"{self.ip}:File transfer error {e}")
+            self.error = "error"
+        if "connect" not in self.timings:
+            self.timings["connect"] = time.perf_counter() - started
+        self.logger.warning(f"{self.ip}:No output config.")
+        return None
+
+
+if __name__ == "__main__":
+    pass
@@ -13,13 +13,75 @@
 # License, Version 3.0.
 
 
+import hashlib
+import re
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, TextIO
+from netinfscript.utils import iter_lines
+from netinfscript.devices.filter_rules import FilterRules
+from netinfscript.devices.normalize_rules import NormalizeRules
+
+
 class BaseDevice:
     """
     Main device object. Assigns all necessary information.
     Returns appropriate variables when the object's child
     does not support the given module.
+
+    Devices use __slots__, so a large inventory doesn't keep a dict
+    per object. Child classes must define empty __slots__ and keep
+    constant values (device_type, logger) as class attributes.
     """
 
+    __slots__ = (
+        "_name",
+        "_vendor",
+        "_ip",
+        "_username",
+        "_port",
+        "_connection",
+        "_passphrase",
+        "_key_file",
+        "_password",
+        "_privilege_cmd",
+        "_privilege_password",
+    )
+
+    device_type: str | None = None
+    # RESTCONF resource of the configuration; without the content
+    # query (RFC 8040) the operational state is returned too
+    restconf_path: str = "/restconf/data?content=config"
+    # menus printed by the RouterOS API, empty - API not supported
+    api_sections: list[str] = []
+    # read-only properties of the API items, not stored
+    api_skip_properties: set[str] = set()
+    # secret properties, never stored (like /export without
+    # 'show-sensitive')
+    api_sensitive_properties: set[str] = set()
+    # properties changing without a change of the configuration,
+    # skipped only in the given section
+    api_volatile_properties: dict[str, set[str]] = {}
+    # property finding the built-in items of the section, written
+    # with 'set [ find ... ]' instead of 'add'
+    api_find_properties: dict[str, str] = {}
+    # file of the configuration copied by SCP/SFTP, None - not supported
+    transfer_path: str | None = None
+    # commands run before and after the copy, e.g. to write the file
+    transfer_prepare: str | None = None
+    transfer_cleanup: str | None = None
+    # cheap command showing the last change, None - no change probe
+    probe_command: str | None = None
+    # regular expression of the marker in the probe output, the first
+    # group is used; None - hash of the whole output
+    probe_pattern: str | None = None
+    # built-in filter rules of the vendor, see FilterRules
+    filter_rules: dict[str, list[str]] = {}
+    _filter: FilterRules | None = None
+    # built-in rules of volatile lines, see NormalizeRules
+    normalize_rules: list[tuple[str, str | None]] = []
+    _normalizer: NormalizeRules | None = None
+
     def __init__(
         self,
         ip: str,
@@ -46,68 +108,116 @@ class BaseDevice:
         self._privilege_cmd = privilege_cmd
         self._privilege_password = privilege_password
 
-    @property
-    def name(self) -> str:
-        """Get the device's name."""
-        return self._name
-
-    @property
-    def vendor(self) -> str:
-        """Get the device's vendor."""
-        return self._vendor
-
-    @property
-    def ip(self) -> str:
-        """Get the device's IP address."""
-        return self._ip
-
-    @property
-    def username(self) -> str:
-        """Get the username for the device connection."""
-        return self._username
-
-    @property
-    def port(self) -> int:
-        """Get the port for the device connection."""
-        return self._port
-
-    @property
-    def connection(self) -> str:
-        """Get the type of connection for the device."""
-        return self._connection
-
-    @property
-    def passphrase(self) -> str:
-        """Get the passphrase for the device's key file."""
-        return self._passphrase
-
-    @property
-    def key_file(self) -> str:
-        """Get the path to the device's key file."""
-        return self._key_file
-
-    @property
-    def password(self) -> str:
-        """Get the password for the device connection."""
-        return self._password
-
-    @property
-    def privilege_cmd(self) -> str:
-        """Get the privilege command for device access."""
-        return self._privilege_cmd
-
-    @property
-    def privilege_password(self) -> str:
-        """Get the privilege password for elevated access."""
-        return self._privilege_password
+    # attrgetter runs in C, it is faster than a python getter
+    name = property(attrgetter("_name"), doc="Get the device's name.")
+    vendor = property(attrgetter("_vendor"), doc="Get the device's vendor.")
+    ip = property(attrgetter("_ip"), doc="Get the device's IP address.")
+    username = property(
+        attrgetter("_username"),
+        doc="Get the username for the device connection.",
+    )
+    port = property(
+        attrgetter("_port"), doc="Get the port for the device connection."
+    )
+    connection = property(
+        attrgetter("_connection"),
+        doc="Get the type of connection for the device.",
+    )
+    passphrase = property(
+        attrgetter("_passphrase"),
+        doc="Get the passphrase for the device's key file.",
+    )
+    key_file = property(
+        attrgetter("_key_file"), doc="Get the path to the device's key file."
+    )
+    password = property(
+        attrgetter("_password"),
+        doc="Get the password for the device connection.",
+    )
+    privilege_cmd = property(
+        attrgetter("_privilege_cmd"),
+        doc="Get the privilege command for device access.",
+    )
+    privilege_password = property(
+        attrgetter("_privilege_password"),
+        doc="Get the privilege password for elevated access.",
+    )
 
     def get_command_show_config(self):
         """Support for not supported devices."""
         return "show config"
 
-    def config_filternig(self, config):
-        """Support for not supported devices."""
-        return config
+    def change_marker(self, output: str) -> str | None:
+        """
+        The function returns the marker of the last change
+        of the configuration from the output of the probe command.
+
+        :return: marker or None when it can't be found.
+        """
+        if self.probe_pattern is None:
+            if len(output.strip()) == 0:
+                return None
+            return hashlib.sha256(output.strip().encode()).hexdigest()
+        found: re.Match | None = re.search(
+            self.probe_pattern, output, re.MULTILINE
+        )
+        if found is None:
+            return None
+        return found.group(1) if found.groups() else found.group(0)
+
+    @classmethod
+    def compile_filter(
+        cls,
+        extra_rules: dict[str, list[str]] | None = None,
+        extra_normalize: list[tuple[str, str | None]] | None = None,
+    ) -> None:
+        """
+        The function compiles the built-in filter and normalize rules
+        of the class together with rules loaded from the config.
+
+        :param extra_rules: dict of action and regular expressions.
+        :param extra_normalize: list of regular expression
+            and replacement.
+        """
+        cls._filter = FilterRules.merge(cls.filter_rules, extra_rules or {})
+        cls._normalizer = NormalizeRules.merge(
+            cls.normalize_rules, extra_normalize or []
+        )
+
+    def filter_lines(self, lines: Iterator[str]) -> Iterator[str]:
+        """
+        The function returns only the lines of the configuration
+        that are stored, with volatile lines normalized. Rules are
+        compiled on first use.
+        """
+        cls: type = type(self)
+        if "_filter" not in cls.__dict__:
+            cls.compile_filter()
+        return cls._normalizer.apply(cls._filter.apply(lines))
+
+    def config_filternig(self, config: str) -> str:
+        """Filters config from unnecessary information"""
+        return "\n".join(self.filter_lines(iter_lines([config])))
+
+    def write_filtered(
+        self, chunks: Iterable[str], sink: TextIO, batch_size: int = 1024
+    ) -> None:
+        """
+        The function filters the configuration read in chunks and
+        writes it to the sink in batches of lines. The written text
+        is the same as returned by config_filternig.
+
+        :param chunks: parts of the command output, in order.
+        :param sink: object with the write method, e.g. open file.
+        """
+        lines: Iterator[str] = self.filter_lines(iter_lines(chunks))
+        separator: str = ""
+        while True:
+            batch: list[str] = list(islice(lines, batch_size))
+            if len(batch) == 0:
+                return
+            sink.write(separator + "\n".join(batch))
+            separator = "\n"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+
+import logging
+import re
+from typing import Iterator
+
+# actions of the rules, in order of priority
+ACTIONS: list[str] = ["collapse", "drop"]
+
+logger = logging.getLogger("netinfscript.devices.filter_rules")
+
+
+class FilterRules:
+    """
+    An object that compiles the filter rules of a vendor into one
+    regular expression, so every line is checked once, whatever
+    the number of rules.
+
+    Rules are regular expressions searched in the line:
+    - drop: the line is not stored,
+    - collapse: the line and next matching lines are replaced
+      with one empty line (e.g. '!' lines of Cisco).
+    Collapse rules are checked before drop rules.
+    """
+
+    def __init__(self, rules: dict[str, list[str]]) -> None:
+        """
+        :param rules: dict of action and list of regular expressions.
+        """
+        self._rules: dict[str, list[str]] = {
+            action: list(rules.get(action, [])) for action in ACTIONS
+        }
+        # '^$' is checked without the regular expression,
+        # anchors make python's regex engine much slower
+        self._drop_empty: bool = "(?:^$)" in self._rules["drop"]
+        self._search = self._compile(
+            [
+                pattern
+                for action in ACTIONS
+                for pattern in self._rules[action]
+                if pattern != "(?:^$)"
+            ]
+        )
+        self._search_collapse = self._compile(self._rules["collapse"])
+
+    @staticmethod
+    def _compile(patterns: list[str]):
+        """
+        The function returns the search function of all patterns
+        joined, without capturing groups, or None.
+        """
+        if len(patterns) == 0:
+            return None
+        return re.compile("|".join(patterns)).search
+
+    @property
+    def rules(self) -> dict[str, list[str]]:
+        """Get the rules of the filter."""
+        return self._rules
+
+    @classmethod
+    def merge(cls, *rules_list: dict[str, list[str]]) -> "FilterRules":
+        """
+        The function returns the filter built from all the rules.
+        Rules that aren't valid regular expressions are skipped.
+        """
+        merged: dict[str, list[str]] = {action: [] for action in ACTIONS}
+        for rules in rules_list:
+            for action, patterns in rules.items():
+                if action not in merged:
+                    logger.warning(f"Unknown filter action '{action}'.")
+                    continue
+                for pattern in patterns:
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        logger.warning(
+                            f"Wrong filter rule '{pattern}': {e}. Skipping."
+                        )
+                        continue
+                    merged[action].append(f"(?:{pattern})")
+        return cls(merged)
+
+    def apply(self, lines: Iterator[str]) -> Iterator[str]:
+        """
+        The function returns the lines that are stored.
+
+        :param lines: lines of the configuration.
+        """
+        if self._search_collapse is not None:
+            return self._apply_collapse(lines)
+        search = self._search
+        if search is None:
+            if self._drop_empty:
+                return (line for line in lines if len(line) > 0)
+            return lines
+        if self._drop_empty:
+            return (
+                line for line in lines if len(line) > 0 and not search(line)
+            )
+        return (line for line in lines if not search(line))
+
+    def _apply_collapse(self, lines: Iterator[str]) -> Iterator[str]:
+        """
+        The function filters lines with collapse rules. Only lines
+        matched by any rule are checked again for the action.
+        """
+        search = self._search
+        search_collapse = self._search_collapse
+        drop_empty: bool = self._drop_empty
+        add_enter: bool = True
+        for line in lines:
+            if len(line) == 0:
+                if drop_empty:
+                    continue
+            elif search(line):
+                if add_enter and search_collapse(line):
+                    yield ""
+                    add_enter = False
+                continue
+            yield line
+            add_enter = True
+
+
+if __name__ == "__main__":
+    pass
@@ -20,55 +20,27 @@ from netinfscript.devices.base_device import BaseDevice
 class Juniper(BaseDevice):
     """Juniper device object."""
 
-    def __init__(
-        self,
-        ip: str,
-        port: int,
-        name: str,
-        vendor: str,
-        connection: str,
-        username: str,
-        password: str,
-        privilege_cmd: str,
-        privilege_password: str,
-        key_file: str,
-        passphrase: str,
-    ) -> "BaseDevice":
-        super().__init__(
-            ip,
-            port,
-            name,
-            vendor,
-            connection,
-            username,
-            password,
-            privilege_cmd,
-            privilege_password,
-            key_file,
-            passphrase,
-        )
-        self.logger = logging.getLogger(f"netinfscript.devices.juniper")
-        self.logger.debug(f"{self.ip}:Creatad.")
-        self.device_type = "juniper"
+    __slots__ = ()
+
+    device_type: str = "juniper"
+    filter_rules: dict[str, list[str]] = {"drop": ["#"]}
+    normalize_rules: list[tuple[str, str | None]] = [
+        # time and author of the last commit, on top of the config
+        ("^## Last commit: ", None),
+        ("^## Last changed: ", None),
+    ]
+    # the committed configuration, decompressed while it is copied
+    transfer_path: str = "/config/juniper.conf.gz"
+    # the newest commit is number 0
+    probe_command: str = "show system commit"
+    probe_pattern: str = r"^0\s+(.+?)\s*$"
+    logger: logging.Logger = logging.getLogger("netinfscript.devices.juniper")
 
     def get_command_show_config(self):
         """Returns a command that display the current configuration"""
         self.logger.debug(f"{self.ip}:Returning commands.")
         return "show config | display set"
 
-    def config_filternig(self, config):
-        """Filters config from unnecessary information"""
-        self.logger.debug(f"{self.ip}:Configuration filtering.")
-        _tmp_config: list = []
-        config: str = config.splitlines()
-        for line in config:
-            if "#" in line:
-                self.logger.debug(f"{self.ip}:Skiping line '{line}'.")
-                continue
-            _tmp_config.append(line)
-        config_to_return: str = "\n".join(_tmp_config)
-        return config_to_return
-
 
 if __name__ == "__main__":
     pass
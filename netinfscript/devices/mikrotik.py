@@ -20,59 +20,127 @@ from netinfscript.devices.base_device import BaseDevice
 class Mikrotik(BaseDevice):
     """Mikrotik device object."""
 
-    def __init__(
-        self,
-        ip: str,
-        port: int,
-        name: str,
-        vendor: str,
-        connection: str,
-        username: str,
-        password: str,
-        privilege_cmd: str,
-        privilege_password: str,
-        key_file: str,
-        passphrase: str,
-    ) -> "BaseDevice":
-        super().__init__(
-            ip,
-            port,
-            name,
-            vendor,
-            connection,
-            username,
-            password,
-            privilege_cmd,
-            privilege_password,
-            key_file,
-            passphrase,
-        )
-        self.logger = logging.getLogger(f"netinfscript.devices.Mikrotik")
-        self.logger.debug(f"{self.ip}:Creatad.")
-        self.device_type = "mikrotik_routeros"
+    __slots__ = ()
+
+    device_type: str = "mikrotik_routeros"
+    filter_rules: dict[str, list[str]] = {"drop": ["#"]}
+    normalize_rules: list[tuple[str, str | None]] = [
+        # time of the export, on top of the config
+        ("^# .* by RouterOS ", None),
+    ]
+    # the export is written to a file first and removed after the copy
+    transfer_path: str = "netinfscript-backup.rsc"
+    transfer_prepare: str = "/export file=netinfscript-backup"
+    transfer_cleanup: str = "/file remove netinfscript-backup.rsc"
+    # actions changing the configuration, empty after a reboot
+    probe_command: str = "/system history print without-paging"
+    api_sections: list[str] = [
+        "/system identity",
+        "/system clock",
+        "/system ntp client",
+        "/system logging",
+        "/interface ethernet",
+        "/interface bridge",
+        "/interface bridge port",
+        "/interface vlan",
+        "/interface bonding",
+        "/interface list",
+        "/interface list member",
+        "/interface wireguard",
+        "/interface wireguard peers",
+        "/ip pool",
+        "/ip address",
+        "/ip route",
+        "/ip dns",
+        "/ip dhcp-client",
+        "/ip dhcp-server",
+        "/ip dhcp-server network",
+        "/ip firewall address-list",
+        "/ip firewall filter",
+        "/ip firewall nat",
+        "/ip firewall mangle",
+        "/ip service",
+        "/ipv6 address",
+        "/ipv6 route",
+        "/ipv6 firewall filter",
+        "/routing ospf instance",
+        "/routing ospf area",
+        "/routing ospf interface-template",
+        "/routing bgp connection",
+        "/snmp",
+        "/snmp community",
+        "/user group",
+        "/user",
+    ]
+    api_skip_properties: set[str] = {
+        "dynamic",
+        "running",
+        "invalid",
+        "inactive",
+        "default",
+        "actual-mtu",
+        "actual-interface",
+        "l2mtu",
+        "mac-address",
+        "orig-mac-address",
+        "link-downs",
+        "last-link-up-time",
+        "last-link-down-time",
+        "last-logged-in",
+        "time",
+        "date",
+        "gmt-offset",
+        "status",
+        "active",
+        "active-address",
+        "active-gateway",
+        "immediate-gw",
+        "bytes",
+        "packets",
+        "expires-after",
+        "creation-time",
+        "builtin",
+    }
+    api_sensitive_properties: set[str] = {
+        "password",
+        "secret",
+        "private-key",
+        "preshared-key",
+        "wpa-pre-shared-key",
+        "wpa2-pre-shared-key",
+        "authentication-password",
+        "encryption-password",
+        "auth-key",
+        "tcp-md5-key",
+        "passphrase",
+    }
+    # leases of the dhcp client, "address" is configured elsewhere
+    api_volatile_properties: dict[str, set[str]] = {
+        "/ip dhcp-client": {
+            "address",
+            "gateway",
+            "dhcp-server",
+            "primary-dns",
+            "secondary-dns",
+            "primary-ntp",
+            "secondary-ntp",
+            "expires-after",
+        },
+    }
+    api_find_properties: dict[str, str] = {"/ip service": "name"}
+    logger: logging.Logger = logging.getLogger(
+        "netinfscript.devices.Mikrotik"
+    )
 
     def get_command_show_config(self):
         """
         Returns a command that display the current configuration.
-        The configuration will not show sensitive information
-        such as passwords etc.
+        The export doesn't show sensitive information such as
+        passwords, the API download skips them too.
         """
         self.logger.debug(f"{self.ip}:Returning commands.")
         return "/export"
 
-    def config_filternig(self, config):
-        """Filters config from unnecessary information"""
-        self.logger.debug(f"{self.ip}:Configuration filtering.")
-        _tmp_config: list = []
-        config: str = config.splitlines()
-        for line in config:
-            if "#" in line:
-                self.logger.debug(f"{self.ip}:Skiping line '{line}'.")
-                continue
-            _tmp_config.append(line)
-        config_to_return: str = "\n".join(_tmp_config)
-        return config_to_return
-
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+
+import logging
+import re
+from typing import Iterator
+
+logger = logging.getLogger("netinfscript.devices.normalize_rules")
+
+
+class NormalizeRules:
+    """
+    An object that normalizes volatile lines of the configuration,
+    the lines that change on every download (timestamps, counters,
+    hashes). Normalized lines are stored, so the hash of the file
+    and git see only real changes.
+
+    Every rule is a regular expression and a replacement:
+    - replacement is a string: matched part of the line is replaced,
+      groups like '\\1' can be used,
+    - replacement is None: the line is not stored.
+    All rules are compiled into one regular expression, only lines
+    matched by it are checked again for the rule.
+    """
+
+    def __init__(self, rules: list[tuple[str, str | None]]) -> None:
+        """
+        :param rules: list of regular expression and replacement.
+        """
+        self._rules: list[tuple[str, str | None]] = list(rules)
+        self._subs: list[tuple[re.Pattern, str | None]] = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in self._rules
+        ]
+        self._search = None
+        if len(self._rules) > 0:
+            # the group name tells which rule matched the line
+            self._search = re.compile(
+                "|".join(
+                    f"(?P<_n{i}>{pattern})"
+                    for i, (pattern, _) in enumerate(self._rules)
+                )
+            ).search
+
+    @property
+    def rules(self) -> list[tuple[str, str | None]]:
+        """Get the rules of the normalizer."""
+        return self._rules
+
+    @classmethod
+    def merge(
+        cls, *rules_list: list[tuple[str, str | None]]
+    ) -> "NormalizeRules":
+        """
+        The function returns the normalizer built from all the rules.
+        Rules that aren't valid regular expressions are skipped.
+        """
+        merged: list[tuple[str, str | None]] = []
+        for rules in rules_list:
+            for pattern, replacement in rules:
+                try:
+                    compiled: re.Pattern = re.compile(pattern)
+                    if replacement is not None:
+                        compiled.sub(replacement, "")
+                except (re.error, IndexError) as e:
+                    logger.warning(
+                        f"Wrong normalize rule '{pattern}': {e}. Skipping."
+                    )
+                    continue
+                merged.append((pattern, replacement))
+        return cls(merged)
+
+    @staticmethod
+    def parse(value: str) -> list[tuple[str, str | None]]:
+        """
+        The function parses rules written one per line as
+        'pattern => replacement'. A line with only the pattern
+        drops matching lines.
+
+        :param value: rules, one per line.
+        """
+        rules: list[tuple[str, str | None]] = []
+        for line in value.splitlines():
+            if len(line.strip()) == 0:
+                continue
+            pattern, separator, replacement = line.partition(" => ")
+            if len(separator) == 0:
+                rules.append((line.strip(), None))
+            else:
+                rules.append((pattern.strip(), replacement.strip()))
+        return rules
+
+    def apply(self, lines: Iterator[str]) -> Iterator[str]:
+        """
+        The function returns the normalized lines.
+
+        :param lines: lines of the configuration.
+        """
+        if self._search is None:
+            return lines
+        return self._apply(lines)
+
+    def _apply(self, lines: Iterator[str]) -> Iterator[str]:
+        """The function normalizes lines matched by any rule."""
+        search = self._search
+        subs: list[tuple[re.Pattern, str | None]] = self._subs
+        for line in lines:
+            match: re.Match | None = search(line)
+            if match is None:
+                yield line
+                continue
+            compiled, replacement = subs[int(match.lastgroup[2:])]
+            if replacement is None:
+                continue
+            yield compiled.sub(replacement, line)
+
+
+if __name__ == "__main__":
+    pass
@@ -17,6 +17,7 @@ import logging
 import argparse
 from pathlib import Path
 from netinfscript.task.task_handler import TaskHandler
+from netinfscript.agent.device_selection import DeviceSelection, parse_age
 
 PARSER_SETUP: dict[str:str] = {
     "prog": "NetInfScript",
@@ -31,7 +32,50 @@ PARAMETERS: dict[tuple[str] : dict[str:str]] = {
     ("-b", "--backup"): {
         "action": "store_true",
         "help": "The option start creating backups.",
-    }
+    },
+    ("-d", "--daemon"): {
+        "action": "store_true",
+        "help": "The option keeps running and creates backups "
+        "for every device in its interval.",
+    },
+    ("--device",): {
+        "action": "append",
+        "metavar": "IP_OR_NAME",
+        "help": "Backup only the device with the ip or name. "
+        "Can be given many times or separated by commas.",
+    },
+    ("--group",): {
+        "action": "append",
+        "metavar": "GROUP",
+        "help": "Backup only the devices of the group.",
+    },
+    ("--vendor",): {
+        "action": "append",
+        "metavar": "VENDOR",
+        "help": "Backup only the devices of the vendor.",
+    },
+    ("--since-last-failure",): {
+        "action": "store_true",
+        "help": "Backup only the devices whose last backup failed.",
+    },
+    ("--stale-older-than",): {
+        "metavar": "AGE",
+        "type": parse_age,
+        "help": "Backup only the devices without a successful backup "
+        "for the age, e.g. 90 (seconds), 30m, 12h, 7d.",
+    },
+    ("--export",): {
+        "metavar": "DIR",
+        "type": Path,
+        "help": "Write the last configurations from the chunk store "
+        "as plain files to the folder.",
+    },
+    ("--export-git",): {
+        "metavar": "DIR",
+        "type": Path,
+        "help": "Write the history from the chunk store as a git "
+        "repository with one commit per run to the folder.",
+    },
 }
 
 
@@ -42,16 +86,20 @@ class OptionHandler:
     """
 
     def __init__(
-        self, devices_parametrs: Path, configs_dir_path: Path
+        self,
+        devices_parametrs: Path,
+        configs_dir_path: Path,
+        run_settings: dict | None = None,
     ) -> None:
         self.logger: logging = logging.getLogger(
             f"netinfscript.option_handler"
         )
         self._devices_parametrs: Path = devices_parametrs
         self._configs_dir_path: Path = configs_dir_path
+        self._run_settings: dict = run_settings or {}
         self.setup_parser()
         self.task_handler: TaskHandler = TaskHandler(
-            self.devices_parametrs, self.configs_dir_path
+            self.devices_parametrs, self.configs_dir_path, self.run_settings
         )
         self.logger.debug("OptionHandler object created.")
 
@@ -65,6 +113,11 @@ class OptionHandler:
         """Get the initialized variables."""
         return self._configs_dir_path
 
+    @property
+    def run_settings(self) -> dict:
+        """Get the settings of the task execution."""
+        return self._run_settings
+
     def setup_parser(self) -> None:
         """The function setup arguments."""
         self.option_handler: argparse.ArgumentParser = (
@@ -83,14 +136,63 @@ class OptionHandler:
     def execute_program(self) -> None:
         """The function run tasks based on paramters."""
         self.logger.debug("Parsing the arguments")
-        if self.args.backup:
+        if self.args.daemon:
+            self.start_daemon()
+        elif self.args.backup:
             self.start_backup()
+        if self.args.export is not None:
+            self.task_handler.export_store(self.args.export)
+        if self.args.export_git is not None:
+            self.task_handler.export_store(self.args.export_git, git=True)
+
+    def get_selection(self) -> DeviceSelection | None:
+        """
+        The function returns the devices chosen by the arguments,
+        None when every device is backed up.
+        """
+        if (
+            self.args.device is None
+            and self.args.group is None
+            and self.args.vendor is None
+            and not self.args.since_last_failure
+            and self.args.stale_older_than is None
+        ):
+            return None
+        return DeviceSelection(
+            self.args.device,
+            self.args.group,
+            self.args.vendor,
+            self.args.since_last_failure,
+            self.args.stale_older_than,
+        )
 
     def start_backup(self) -> None:
         """The fuction that start creating backups."""
         self.logger.info(f"Start creating backup for devices.")
         self.task_handler.exe_func = "backup"
-        self.task_handler.exec_task()
+        self.task_handler.selection = self.get_selection()
+        try:
+            self.task_handler.exec_task()
+        finally:
+            self.task_handler.close()
+
+    def start_daemon(self) -> None:
+        """The fuction that start the daemon creating backups."""
+        self.logger.info(f"Start daemon creating backup for devices.")
+        selection: DeviceSelection | None = self.get_selection()
+        # the selection is made when the devices file is loaded,
+        # results of the last backups change after every cycle
+        if selection is not None and selection.uses_state:
+            self.option_handler.error(
+                "--since-last-failure and --stale-older-than "
+                "can't be used with --daemon"
+            )
+        self.task_handler.exe_func = "backup"
+        self.task_handler.selection = selection
+        try:
+            self.task_handler.run_daemon()
+        finally:
+            self.task_handler.close()
 
 
 if __name__ == "__main__":
@@ -12,18 +12,115 @@
 # <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
 # License, Version 3.0.
 
+import asyncio
 import logging
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Callable
+import urllib3
 from dulwich import porcelain
 from dulwich.repo import Repo
 from netinfscript.devices.base_device import BaseDevice
 from netinfscript.connections.conn_ssh import ConnSSH
+from netinfscript.connections.conn_async_ssh import ConnAsyncSSH
+from netinfscript.connections.conn_pool import ConnectionPool
+from netinfscript.connections.conn_restconf import ConnRESTCONF
+from netinfscript.connections.conn_netconf import ConnNETCONF
+from netinfscript.connections.conn_routeros import ConnRouterOS
+from netinfscript.connections.conn_transfer import ConnTransfer
+from netinfscript.task.git_store import GitStore
+from netinfscript.task.device_state import DeviceState
+from netinfscript.task.run_report import RunReport
+from netinfscript.task.timeout_model import TimeoutModel
+from netinfscript.task.process_stage import ProcessStage
+from netinfscript.task.chunk_store import ChunkStore
+from netinfscript.utils import HashingWriter
+
+
+def filter_config(
+    dev: BaseDevice,
+    configs_dir_path: Path,
+    output: str | list[str],
+    tmp_file_path: Path | None = None,
+) -> str | None:
+    """
+    The function filters the configuration to the temporary file
+    inside the worker process.
+
+    :param tmp_file_path: path of the temporary file, when it isn't
+        in the folder of the device.
+    :return: sha256 of the filtered configuration or None.
+    """
+    backup: BackupTask = BackupTask(dev, configs_dir_path)
+    if tmp_file_path is not None:
+        backup._tmp_file_path = tmp_file_path
+    return backup.filter_to_file(output)
+
+
+def hash_config(
+    dev: BaseDevice, configs_dir_path: Path, output: str | list[str]
+) -> str | None:
+    """
+    The function computes the hash of the filtered configuration
+    inside the worker process, nothing is written.
+
+    :return: sha256 of the filtered configuration or None.
+    """
+    return BackupTask(dev, configs_dir_path).filter_hash(output)
+
+
+def commit_config(dev: BaseDevice, configs_dir_path: Path) -> bool:
+    """
+    The function commits the configuration to the repository
+    of the device inside the worker process.
+
+    :return: bool done or not.
+    """
+    return BackupTask(dev, configs_dir_path).commit_to_git()
 
 
 class BackupTask:
-    def __init__(self, dev: BaseDevice, configs_dir_path: Path) -> None:
+    def __init__(
+        self,
+        dev: BaseDevice,
+        configs_dir_path: Path,
+        *,
+        git_store: GitStore | None = None,
+        state: DeviceState | None = None,
+        pool: ConnectionPool | None = None,
+        report: RunReport | None = None,
+        timeout_model: TimeoutModel | None = None,
+        read_timeout: float = 60,
+        pipeline: bool = False,
+        process_stage: ProcessStage | None = None,
+        connect_timeout: float | None = None,
+        chunk_store: ChunkStore | None = None,
+        http_pool: urllib3.PoolManager | None = None,
+        verify_certificates: bool = True,
+        transfer_compression: bool = False,
+        change_probe: bool = False,
+    ) -> None:
         self.logger = logging.getLogger(f"netinfscript.task.backuptask")
         self._dev: BaseDevice = dev
+        self._git_store: GitStore | None = git_store
+        self._state: DeviceState | None = state
+        self._pool: ConnectionPool | None = pool
+        self._report: RunReport | None = report
+        self._timeout_model: TimeoutModel | None = timeout_model
+        self._read_timeout: float = read_timeout
+        self._pipeline: bool = pipeline
+        self._process_stage: ProcessStage | None = process_stage
+        self._configs_dir_path: Path = configs_dir_path
+        self._connect_timeout: float | None = connect_timeout
+        self._chunk_store: ChunkStore | None = chunk_store
+        self._http_pool: urllib3.PoolManager | None = http_pool
+        self._verify_certificates: bool = verify_certificates
+        self._transfer_compression: bool = transfer_compression
+        self._change_probe: bool = change_probe
+        # marker of the last change reported by the probe command
+        self._change_marker: str | None = None
+        # kind of the connection error, None when the download worked
+        self.error: str | None = None
         if self._dev.name == None:
             self._config_dir_path: Path = configs_dir_path / f"{self._dev.ip}"
             self._config_file_path: Path = (
@@ -36,6 +133,15 @@ class BackupTask:
             self._config_file_path: Path = (
                 self._config_dir_path / f"{self._dev.ip}_conf.txt"
             )
+        if self._chunk_store is None:
+            self._tmp_file_path: Path = self._config_file_path.with_suffix(
+                ".tmp"
+            )
+        else:
+            # the folder of the device isn't created for the store
+            self._tmp_file_path: Path = (
+                self._chunk_store.tmp_dir_path / f"{self._dev.ip}.tmp"
+            )
 
     @property
     def dev(self) -> BaseDevice:
@@ -52,15 +158,181 @@ class BackupTask:
         """Get path where the config will be stored."""
         return self._config_file_path
 
-    def make_backup(self) -> bool:  ## to do
-        """Some day... Decide how make backup."""
+    @property
+    def tmp_file_path(self) -> Path:
+        """Get path where the filtered config is written first."""
+        return self._tmp_file_path
+
+    @property
+    def chunk_store(self) -> ChunkStore | None:
+        """Get the store of compressed chunks, if used."""
+        return self._chunk_store
+
+    @property
+    def store_key(self) -> str:
+        """Get the path of the config file relative to the configs."""
+        return f"{self.config_dir_path.name}/{self.config_file_path.name}"
+
+    @property
+    def storage_mode(self) -> str:
+        """Get where the configuration is stored, kept with its hash."""
+        if self.chunk_store is not None:
+            return "chunks"
+        if self.git_store is not None:
+            return "shared"
+        return "per_device"
+
+    @property
+    def git_store(self) -> GitStore | None:
+        """Get the shared git repository, if used."""
+        return self._git_store
+
+    @property
+    def state(self) -> DeviceState | None:
+        """Get the devices state stored between runs, if used."""
+        return self._state
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Get the SSH connection pool, if used."""
+        return self._pool
+
+    @property
+    def report(self) -> RunReport | None:
+        """Get the report of the run, if used."""
+        return self._report
+
+    @property
+    def process_stage(self) -> ProcessStage | None:
+        """Get the worker processes of the CPU-bound work, if used."""
+        return self._process_stage
+
+    @property
+    def timeout_model(self) -> TimeoutModel | None:
+        """Get the model of the adaptive read timeout, if used."""
+        return self._timeout_model
+
+    @property
+    def read_timeout(self) -> float:
+        """Get the read timeout of the device."""
+        if self.timeout_model is None:
+            return self._read_timeout
+        return self.timeout_model.read_timeout(self.dev.ip)
+
+    def _learn_timeout(
+        self,
+        connection: (
+            ConnSSH
+            | ConnAsyncSSH
+            | ConnRESTCONF
+            | ConnNETCONF
+            | ConnRouterOS
+            | ConnTransfer
+        ),
+        output: str | list[str] | None,
+        read_timeout: float,
+    ) -> None:
+        """
+        The function adds the time and size of the download
+        to the history of the device.
+        """
+        if self.timeout_model is None:
+            return
+        if connection.timed_out:
+            self.timeout_model.learn_timeout(self.dev.ip, read_timeout)
+        elif output is not None and "command" in connection.timings:
+            size: int = (
+                len(output)
+                if isinstance(output, str)
+                else sum(len(chunk) for chunk in output)
+            )
+            self.timeout_model.learn(
+                self.dev.ip, connection.timings["command"], size
+            )
+
+    def _span(self, phase: str):
+        """
+        The function returns the context manager that measures
+        the phase, or one doing nothing without a report.
+        """
+        if self.report is None:
+            return nullcontext()
+        return self.report.span(self.dev.ip, phase)
+
+    def _set_status(self, status: str) -> None:
+        """The function saves the result of the backup in the report."""
+        if self.report is not None:
+            self.report.set_status(self.dev.ip, status)
+
+    def _add_timings(self, timings: dict[str, float]) -> None:
+        """The function adds timings of the connection to the report."""
+        if self.report is not None:
+            for phase, seconds in timings.items():
+                self.report.add(self.dev.ip, phase, seconds)
+
+    def make_backup(self) -> bool:
+        """The function decides how to make the backup."""
         if "ssh" in self.dev.connection:
             return self.make_backup_ssh()
         elif "restconf" in self.dev.connection:
             return self.make_backup_restconf()
+        elif "netconf" in self.dev.connection:
+            return self.make_backup_netconf()
+        elif self.dev.connection in ["api", "api-ssl"]:
+            return self.make_backup_api()
+        elif self.dev.connection in ["scp", "sftp"]:
+            return self.make_backup_transfer()
         else:
-            self.logger(f"{self.dev.ip}:No connection defined.")
+            self.logger.warning(f"{self.dev.ip}:No connection defined.")
+            return False
+
+    @property
+    def probe(self) -> Callable[[str], bool] | None:
+        """Get the function checking the probe output, if used."""
+        if not self._change_probe or self.state is None:
+            return None
+        return self.probe_unchanged
+
+    def probe_unchanged(self, output: str) -> bool:
+        """
+        The function compares the marker of the last change from
+        the probe output with the marker of the last stored backup.
+
+        :param output: output of the probe command of the device.
+        :return: bool True if the download can be skipped.
+        """
+        self._change_marker = self.dev.change_marker(output)
+        if self._change_marker is None:
+            self.logger.debug(f"{self.dev.ip}:No change marker found.")
+            return False
+        if self.state.get(self.dev.ip, "change_marker") != self._change_marker:
             return False
+        stored_hash: str | None = self.state.get(self.dev.ip, "config_hash")
+        return stored_hash is not None and self.config_unchanged(stored_hash)
+
+    def _store_marker(self) -> None:
+        """
+        The function keeps the marker of the last change, once
+        the configuration it belongs to is stored.
+        """
+        if self._change_marker is not None and self.state is not None:
+            self.state.set(self.dev.ip, "change_marker", self._change_marker)
+
+    def _skip_probed(self) -> bool:
+        """The function ends the backup the probe found unchanged."""
+        self.logger.info(f"{self.dev.ip}:No change since last backup.")
+        self._set_status("unchanged")
+        return True
+
+    def _skip_unchanged(self) -> bool:
+        """
+        The function ends the backup whose filtered configuration
+        has the hash of the stored one.
+        """
+        self.logger.info(f"{self.dev.ip}:Configuration not changed.")
+        self._store_marker()
+        self._set_status("unchanged")
+        return True
 
     def make_backup_ssh(self) -> bool:
         """
@@ -70,15 +342,83 @@ class BackupTask:
         :return bool: done or not.
         """
         self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
         ssh_connection: ConnSSH = ConnSSH(
-            self.dev, self.dev.get_command_show_config()
+            self.dev,
+            self.dev.get_command_show_config(),
+            self.pool,
+            read_timeout,
+            self._pipeline,
+            self._connect_timeout,
+            self.probe,
         )
         output: str | None = ssh_connection.get_config()
+        self._add_timings(ssh_connection.timings)
+        self.error = ssh_connection.error
+        if ssh_connection.skipped:
+            return self._skip_probed()
+        self._learn_timeout(ssh_connection, output, read_timeout)
+        return self._process_output(output)
 
+    async def make_backup_async(self) -> bool:
+        """
+        The function creates the backup inside the event loop.
+        Devices that need a privilege command, or don't use ssh,
+        are handled by the blocking path in a worker thread.
+
+        :return bool: done or not.
+        """
+        if (
+            "ssh" not in self.dev.connection
+            or len(self.dev.privilege_cmd) > 0
+        ):
+            self.logger.debug(f"{self.dev.ip}:Using the blocking path.")
+            return await asyncio.to_thread(self.make_backup)
+        self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
+        timeouts: dict[str, float] = {"read_timeout": read_timeout}
+        if self._connect_timeout is not None:
+            timeouts["connect_timeout"] = self._connect_timeout
+        ssh_connection: ConnAsyncSSH = ConnAsyncSSH(
+            self.dev,
+            self.dev.get_command_show_config(),
+            probe=self.probe,
+            pipeline=self._pipeline,
+            **timeouts,
+        )
+        output: list[str] | None = await ssh_connection.get_config()
+        self._add_timings(ssh_connection.timings)
+        self.error = ssh_connection.error
+        if ssh_connection.skipped:
+            return self._skip_probed()
+        self._learn_timeout(ssh_connection, output, read_timeout)
+        return await asyncio.to_thread(self._process_output, output)
+
+    def _process_output(self, output: str | list[str] | None) -> bool:
+        """
+        The function filters the downloaded configuration
+        and saves it.
+
+        :param output: configuration downloaded from the device,
+            whole or in chunks.
+        :return bool: done or not.
+        """
         if output is not None:
             self.logger.debug(f"{self.dev.ip}:Filtering config file.")
-            self.config_string: str = self.dev.config_filternig(output)
-            _backup_created: bool = self.make_file_operations()
+            with self._span("filter"):
+                config_hash: str | None = self.filter_hash(output)
+            if config_hash is None:
+                self._set_status("failed")
+                return False
+            if self.config_unchanged(config_hash):
+                return self._skip_unchanged()
+            # only changed configurations are written to the file
+            with self._span("filter"):
+                written: str | None = self.filter_to_file(output)
+            if written is None:
+                self._set_status("failed")
+                return False
+            _backup_created: bool = self.make_file_operations(config_hash)
             if _backup_created:
                 self.logger.info(f"{self.dev.ip}:Backup created.")
                 return True
@@ -87,46 +427,274 @@ class BackupTask:
                 return False
         else:
             self.logger.warning(f"{self.dev.ip}:Unable to connect to device.")
+            self._set_status("unreachable")
             return False
 
+    def filter_hash(self, output: str | list[str]) -> str | None:
+        """
+        The function filters the configuration line by line and
+        computes its hash, nothing is written. The hash is checked
+        before the file is opened, so unchanged configurations
+        don't touch the disk.
+
+        :param output: configuration downloaded from the device,
+            whole or in chunks.
+        :return: sha256 of the filtered configuration or None.
+        """
+        if self.process_stage is not None:
+            try:
+                return self.process_stage.run(
+                    hash_config, self.dev, self._configs_dir_path, output
+                )
+            except Exception as e:
+                self.logger.error(f"{self.dev.ip}:Worker error: {e}")
+                return None
+        chunks: list[str] = [output] if isinstance(output, str) else output
+        try:
+            sink: HashingWriter = HashingWriter()
+            self.dev.write_filtered(chunks, sink)
+            return sink.hexdigest()
+        except Exception as e:
+            self.logger.error(f"{self.dev.ip}:Error: {e}")
+            return None
+
+    def filter_to_file(self, output: str | list[str]) -> str | None:
+        """
+        The function filters the configuration line by line and
+        writes it straight to the temporary file, computing its hash.
+        The filtered configuration is never kept in memory.
+
+        :param output: configuration downloaded from the device,
+            whole or in chunks.
+        :return: sha256 of the filtered configuration or None.
+        """
+        if self.process_stage is not None:
+            try:
+                return self.process_stage.run(
+                    filter_config,
+                    self.dev,
+                    self._configs_dir_path,
+                    output,
+                    self.tmp_file_path,
+                )
+            except Exception as e:
+                self.logger.error(f"{self.dev.ip}:Worker error: {e}")
+                return None
+        chunks: list[str] = [output] if isinstance(output, str) else output
+        try:
+            if self.tmp_file_path.parent == self.config_dir_path:
+                self.make_config_dir()
+            with open(self.tmp_file_path, "w") as f:
+                sink: HashingWriter = HashingWriter(f)
+                self.dev.write_filtered(chunks, sink)
+            return sink.hexdigest()
+        except PermissionError:
+            self.logger.warning(
+                f"{self.dev.ip}:The file cannot be opened. Permissions error."
+            )
+            return None
+        except Exception as e:
+            self.logger.error(f"{self.dev.ip}:Error: {e}")
+            return None
+
     def make_backup_restconf(self) -> bool:
         """
-        Not impemented yet.
+        The function creates the backup with one RESTCONF request,
+        over the shared keep-alive HTTPS connections.
+
+        :return bool: done or not.
         """
-        self.logger.info(f"{self.dev.ip}:Restconf not implemented yet.")
-        return False
+        self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
+        connection: ConnRESTCONF = ConnRESTCONF(
+            self.dev, self._http_pool, read_timeout, self._connect_timeout
+        )
+        output: str | None = connection.get_config()
+        self._add_timings(connection.timings)
+        self.error = connection.error
+        self._learn_timeout(connection, output, read_timeout)
+        return self._process_output(output)
 
-    def make_file_operations(self) -> bool:
+    def make_backup_netconf(self) -> bool:
+        """
+        The function creates the backup with the NETCONF get-config.
+        Sessions are reused when the connection pool is used.
+
+        :return bool: done or not.
+        """
+        self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
+        connection: ConnNETCONF = ConnNETCONF(
+            self.dev, self.pool, read_timeout, self._connect_timeout
+        )
+        output: str | None = connection.get_config()
+        self._add_timings(connection.timings)
+        self.error = connection.error
+        self._learn_timeout(connection, output, read_timeout)
+        return self._process_output(output)
+
+    def make_backup_api(self) -> bool:
+        """
+        The function creates the backup with the RouterOS API.
+        All sections are printed over one socket, sessions are
+        reused when the connection pool is used.
+
+        :return bool: done or not.
+        """
+        if len(self.dev.api_sections) == 0:
+            self.logger.warning(f"{self.dev.ip}:API not supported by vendor.")
+            self._set_status("failed")
+            return False
+        self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
+        connection: ConnRouterOS = ConnRouterOS(
+            self.dev,
+            self.pool,
+            read_timeout,
+            self._connect_timeout,
+            self._verify_certificates,
+        )
+        output: str | None = connection.get_config()
+        self._add_timings(connection.timings)
+        self.error = connection.error
+        self._learn_timeout(connection, output, read_timeout)
+        return self._process_output(output)
+
+    def make_backup_transfer(self) -> bool:
+        """
+        The function creates the backup from the configuration file
+        copied over SCP or SFTP. Blocks of the file go to the filter
+        as chunks, like the output of asyncssh.
+
+        :return bool: done or not.
+        """
+        if self.dev.transfer_path is None:
+            self.logger.warning(
+                f"{self.dev.ip}:File transfer not supported by vendor."
+            )
+            self._set_status("failed")
+            return False
+        self.logger.info(f"{self.dev.ip}:Attempting to create a backup.")
+        read_timeout: float = self.read_timeout
+        connection: ConnTransfer = ConnTransfer(
+            self.dev,
+            self.dev.connection,
+            read_timeout,
+            self._connect_timeout,
+            self._transfer_compression,
+        )
+        output: list[str] | None = connection.get_config()
+        self._add_timings(connection.timings)
+        self.error = connection.error
+        self._learn_timeout(connection, output, read_timeout)
+        return self._process_output(output)
+
+    def make_file_operations(self, config_hash: str) -> bool:
         """
         The function is responsible for save
         output to file and make git commit.
+
+        :param config_hash: hash of the filtered configuration.
         """
+        if self.chunk_store is not None:
+            return self.save_to_store(config_hash)
         self.logger.debug(
             f"{self.dev.ip}:Saving the configuration to a file."
         )
 
-        file_save: bool = self.save_to_file()
-        git_save: bool = self.commit_to_git()
+        with self._span("file"):
+            file_save: bool = self.save_to_file()
+        with self._span("git"):
+            git_save: bool = self.commit_to_git()
 
         if file_save and git_save:
             self.logger.debug(
                 f"{self.dev.ip}:File operations completed. Commited to git."
             )
+            if self.state is not None:
+                self.state.set(self.dev.ip, "config_hash", config_hash)
+                self.state.set(self.dev.ip, "storage_mode", self.storage_mode)
+                self._store_marker()
+            self._set_status("changed")
             return True
         elif file_save and not git_save:
             self.logger.warning(
                 f"{self.dev.ip}:File operations completed. "
                 "Can't commited to git."
             )
+            self._set_status("changed_not_commited")
             return True
         else:
             self.logger.error(f"{self.dev.ip}:Can't save config to file.")
+            self._set_status("failed")
+            return False
+
+    def config_unchanged(self, config_hash: str) -> bool:
+        """
+        The function compares the hash of the configuration
+        with the hash of the last stored configuration.
+
+        :param config_hash: hash of the filtered configuration.
+        :return: bool True if the stored file is up to date.
+        """
+        if self.state is None:
+            return False
+        stored_hash: str | None = self.state.get(self.dev.ip, "config_hash")
+        if stored_hash != config_hash:
+            return False
+        # the hash of another storage says nothing about this one,
+        # e.g. the shared repository after per_device commits
+        if (
+            self.state.get(self.dev.ip, "storage_mode", "per_device")
+            != self.storage_mode
+        ):
+            return False
+        if self.chunk_store is not None:
+            return self.chunk_store.has(self.store_key)
+        return self.config_file_path.is_file()
+
+    def save_to_store(self, config_hash: str) -> bool:
+        """
+        The function adds the filtered temporary file to the store
+        of compressed chunks. Git isn't used by the store.
+
+        :param config_hash: hash of the filtered configuration.
+        :return: bool done or not.
+        """
+        self.logger.debug(f"{self.dev.ip}:Saving the configuration to store.")
+        with self._span("file"):
+            stored: bool = self.chunk_store.put(
+                self.store_key, self.tmp_file_path, config_hash
+            )
+        self.tmp_file_path.unlink(missing_ok=True)
+        if not stored:
+            self.logger.error(f"{self.dev.ip}:Can't save config to store.")
+            self._set_status("failed")
             return False
+        if self.state is not None:
+            self.state.set(self.dev.ip, "config_hash", config_hash)
+            self.state.set(self.dev.ip, "storage_mode", self.storage_mode)
+            self._store_marker()
+        self._set_status("changed")
+        return True
+
+    def make_config_dir(self) -> None:
+        """
+        The function creates the folder of the device configuration.
+        """
+        self.logger.debug(f"{self.dev.ip}:Check if the folder exist.")
+        if not self.config_dir_path.is_dir():
+            self.logger.info(
+                f"{self.dev.ip}:The folder doesn't exist "
+                "or account doesn't have permissions."
+            )
+            self.logger.info(f"{self.dev.ip}:Creating a folder.")
+            self.config_dir_path.mkdir()
 
     def save_to_file(self) -> bool:
         """
-        The function that is responsible for creating and saving
-        data to the file.
+        The function replaces the configuration file
+        with the filtered temporary file.
 
         :return: bool done or not.
         """
@@ -134,25 +702,13 @@ class BackupTask:
             self.logger.info(
                 f"{self.dev.ip}:Saveing the configuration to file."
             )
-            self.logger.debug(f"{self.dev.ip}:Check if the folder exist.")
-            if not self.config_dir_path.is_dir():
-                self.logger.info(
-                    f"{self.dev.ip}:The folder doesn't exist "
-                    "or account doesn't have permissions."
-                )
-                self.logger.info(f"{self.dev.ip}:Creating a folder.")
-                self.config_dir_path.mkdir()
-            try:
-                self.logger.debug(f"{self.dev.ip}:Opening the file.")
-                with open(self.config_file_path, "w") as f:
-                    self.logger.debug(f"{self.dev.ip}:Writing config.")
-                    f.writelines(self.config_string)
-                return True
-            except PermissionError:
-                self.logger.warning(
-                    f"{self.dev.ip}:The file cannot be opened. Permissions error."
-                )
-                return False
+            self.tmp_file_path.replace(self.config_file_path)
+            return True
+        except PermissionError:
+            self.logger.warning(
+                f"{self.dev.ip}:The file cannot be replaced. Permissions error."
+            )
+            return False
         except Exception as e:
             self.logger.error(f"{self.dev.ip}:Error: {e}")
             return False
@@ -175,8 +731,21 @@ class BackupTask:
 
     def commit_to_git(self) -> bool:
         """
-        The function commit changes to git repo.
+        The function commit changes to git repo. When the shared
+        repository is used, the file is only staged for the run commit.
         """
+        if self.git_store is not None:
+            self.logger.debug(f"{self.dev.ip}:Staging file for run commit.")
+            self.git_store.stage(self.config_file_path)
+            return True
+        if self.process_stage is not None:
+            try:
+                return self.process_stage.run(
+                    commit_config, self.dev, self._configs_dir_path
+                )
+            except Exception as e:
+                self.logger.warning(f"{self.dev.ip}:Worker error: {e}")
+                return False
         try:
             self.logger.debug(f"{self.dev.ip}:Creating git repo object.")
             self.git_repo()
@@ -203,7 +772,9 @@ class BackupTask:
                 porcelain.commit(self.git_repo, message)
 
             if len(status.unstaged) != 0:
-                print(status.unstaged)
+                self.logger.debug(
+                    f"{self.dev.ip}:Unstaged files: {status.unstaged}"
+                )
                 commit()
             elif (
                 len(status.staged["add"]) != 0
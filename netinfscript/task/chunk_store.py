@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import hashlib
+import logging
+import marshal
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+from dulwich import porcelain
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE: bool = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE: bool = False
+
+STORE_DIR_NAME: str = ".netinfscript_store"
+STORE_VERSION: int = 1
+# chunk sizes in bytes, a chunk ends after a line whose crc32
+# matches CUT_MASK, so equal blocks of different files give equal chunks
+MIN_CHUNK_SIZE: int = 2048
+MAX_CHUNK_SIZE: int = 65536
+CUT_MASK: int = 0x1F
+# first byte of the stored chunk
+CODEC_ZSTD: bytes = b"z"
+CODEC_ZLIB: bytes = b"d"
+
+
+def split_chunks(data: bytes) -> Iterator[bytes]:
+    """
+    The function splits the text into chunks at line ends chosen
+    by the content of the lines, so an inserted line changes only
+    the chunk around it.
+
+    :param data: text of the configuration.
+    """
+    start: int = 0
+    end: int = 0
+    while end < len(data):
+        line_start: int = end
+        newline: int = data.find(b"\n", end)
+        end = len(data) if newline == -1 else newline + 1
+        size: int = end - start
+        if size >= MAX_CHUNK_SIZE or (
+            size >= MIN_CHUNK_SIZE
+            and zlib.crc32(data[line_start:end]) & CUT_MASK == 0
+        ):
+            yield data[start:end]
+            start = end
+    if start < len(data):
+        yield data[start:]
+
+
+class ChunkStore:
+    """
+    An object that stores configurations as compressed chunks
+    addressed by their sha256. Chunks shared by many devices
+    (e.g. configs made from one template) are stored once.
+
+    Chunks are appended to one pack file, so a large fleet doesn't
+    use an inode per file. Every stored version of a device is a list
+    of chunks, remembered with the time of the run. Plain files
+    or a git repository can be exported from the store.
+    """
+
+    def __init__(self, configs_dir_path: Path, level: int = 3) -> None:
+        """
+        :param configs_dir_path: folder where the store is created.
+        :param level: int compression level.
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.chunkstore"
+        )
+        self._store_path: Path = configs_dir_path / STORE_DIR_NAME
+        self._pack_path: Path = self._store_path / "chunks.pack"
+        self._index_path: Path = self._store_path / "index"
+        self._level: int = level
+        self._lock: Lock = Lock()
+        # sha256 -> (offset, length) in the pack file
+        self._chunks: dict[bytes, tuple[int, int]] = {}
+        # device key -> list of (run time, sha256 of text, chunks)
+        self._versions: dict[str, list[tuple[float, str, list[bytes]]]] = {}
+        self._run_time: float = time.time()
+        self._store_path.mkdir(parents=True, exist_ok=True)
+        (self._store_path / "tmp").mkdir(exist_ok=True)
+        self._load()
+
+    @property
+    def tmp_dir_path(self) -> Path:
+        """Get folder of the temporary files of the filtered configs."""
+        return self._store_path / "tmp"
+
+    def _load(self) -> None:
+        """
+        The function loads the index of the store. Chunks appended
+        to the pack after the last saved index are not used.
+        """
+        try:
+            with open(self._index_path, "rb") as f:
+                index: dict = marshal.load(f)
+            if index.get("version") != STORE_VERSION:
+                self.logger.warning("Wrong version of the store index.")
+                return
+            self._chunks = index["chunks"]
+            self._versions = index["versions"]
+        except FileNotFoundError:
+            self.logger.debug("Store index doesn't exist. Starting empty.")
+        except (EOFError, ValueError, TypeError, KeyError) as e:
+            self.logger.warning(f"Can't load store index: {e}.")
+
+    def begin_run(self) -> None:
+        """The function sets the time of the run of new versions."""
+        self._run_time = time.time()
+
+    def _compress(self, chunk: bytes) -> bytes:
+        """The function returns the compressed chunk with its codec."""
+        if ZSTD_AVAILABLE:
+            return CODEC_ZSTD + zstandard.ZstdCompressor(
+                level=self._level
+            ).compress(chunk)
+        return CODEC_ZLIB + zlib.compress(chunk, self._level)
+
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        """The function returns the chunk stored with any codec."""
+        if data[:1] == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is needed to read the store")
+            return zstandard.ZstdDecompressor().decompress(data[1:])
+        return zlib.decompress(data[1:])
+
+    def has(self, key: str) -> bool:
+        """The function checks if any version of the device is stored."""
+        with self._lock:
+            return len(self._versions.get(key, [])) > 0
+
+    def put(self, key: str, file_path: Path, config_hash: str) -> bool:
+        """
+        The function stores the file as the new version of the device.
+        Only chunks not stored yet are written.
+
+        :param key: path of the device file relative to the configs.
+        :param file_path: file with the filtered configuration.
+        :param config_hash: sha256 of the file.
+        :return: bool done or not.
+        """
+        with self._lock:
+            versions: list = self._versions.get(key, [])
+            if len(versions) > 0 and versions[-1][1] == config_hash:
+                self.logger.debug(f"{key}:Version already stored.")
+                return True
+        try:
+            data: bytes = file_path.read_bytes()
+            hashes: list[bytes] = []
+            new_chunks: list[tuple[bytes, bytes]] = []
+            for chunk in split_chunks(data):
+                digest: bytes = hashlib.sha256(chunk).digest()
+                hashes.append(digest)
+                if digest not in self._chunks:
+                    new_chunks.append((digest, self._compress(chunk)))
+            with self._lock:
+                with open(self._pack_path, "ab") as pack:
+                    for digest, compressed in new_chunks:
+                        # other device could add the chunk meanwhile
+                        if digest in self._chunks:
+                            continue
+                        self._chunks[digest] = (pack.tell(), len(compressed))
+                        pack.write(compressed)
+                self._versions.setdefault(key, []).append(
+                    (self._run_time, config_hash, hashes)
+                )
+            return True
+        except OSError as e:
+            self.logger.warning(f"Can't store {key}. Error: {e}")
+            return False
+
+    def read(self, key: str, version: int = -1) -> bytes | None:
+        """
+        The function returns the stored text of the device.
+
+        :param key: path of the device file relative to the configs.
+        :param version: int number of the version, -1 the last one.
+        """
+        with self._lock:
+            versions: list = self._versions.get(key, [])
+            if len(versions) == 0:
+                return None
+            hashes: list[bytes] = versions[version][2]
+            places: list[tuple[int, int]] = [self._chunks[h] for h in hashes]
+        parts: list[bytes] = []
+        with open(self._pack_path, "rb") as pack:
+            for offset, length in places:
+                pack.seek(offset)
+                parts.append(self._decompress(pack.read(length)))
+        return b"".join(parts)
+
+    def save(self) -> bool:
+        """
+        The function writes the index of the store. The index is
+        replaced at once, after the chunks are on the disk.
+
+        :return: bool done or not.
+        """
+        tmp_path: Path = self._index_path.with_suffix(".tmp")
+        try:
+            with self._lock:
+                with open(tmp_path, "wb") as f:
+                    marshal.dump(
+                        {
+                            "version": STORE_VERSION,
+                            "chunks": self._chunks,
+                            "versions": self._versions,
+                        },
+                        f,
+                    )
+            tmp_path.replace(self._index_path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't save store index. Error: {e}")
+            return False
+
+    def export_files(self, path: Path) -> int:
+        """
+        The function writes the last version of every device
+        as plain files, in the same layout as the files storage.
+
+        :return: int number of written files.
+        """
+        with self._lock:
+            keys: list[str] = list(self._versions)
+        for key in keys:
+            file_path: Path = path / key
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(self.read(key))
+        self.logger.info(f"Exported {len(keys)} files to {path}.")
+        return len(keys)
+
+    def export_git(self, path: Path) -> int:
+        """
+        The function writes the git repository with one commit
+        per run, with the devices changed in the run. The message
+        of the commit has the time of the run.
+
+        :return: int number of commits.
+        """
+        runs: dict[float, list[tuple[str, int]]] = {}
+        with self._lock:
+            for key, versions in self._versions.items():
+                for number, version in enumerate(versions):
+                    runs.setdefault(version[0], []).append((key, number))
+        path.mkdir(parents=True, exist_ok=True)
+        repo = porcelain.init(path)
+        try:
+            for run_time in sorted(runs):
+                files: list[str] = []
+                for key, number in runs[run_time]:
+                    file_path: Path = path / key
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    file_path.write_bytes(self.read(key, number))
+                    files.append(str(file_path))
+                porcelain.add(repo, paths=files)
+                date: str = datetime.fromtimestamp(run_time).isoformat(
+                    timespec="seconds"
+                )
+                porcelain.commit(
+                    repo, f"Backup {date}, {len(files)} devices".encode()
+                )
+        finally:
+            repo.close()
+        self.logger.info(f"Exported {len(runs)} commits to {path}.")
+        return len(runs)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+from netinfscript.devices.base_device import BaseDevice
+from netinfscript.task.device_state import DeviceState
+
+# weight of the last backup in the health score
+SMOOTHING: float = 0.3
+
+
+class DeviceHealth:
+    """
+    An object that keeps the health score of every device in the
+    state, from 0 (every backup fails) to 1 (every backup works).
+    Devices without history are healthy.
+    """
+
+    def __init__(
+        self, state: DeviceState, unhealthy_below: float = 0.3
+    ) -> None:
+        """
+        :param state: devices state where scores are stored.
+        :param unhealthy_below: float score of unhealthy devices.
+        """
+        self._state: DeviceState = state
+        self._unhealthy_below: float = unhealthy_below
+
+    @property
+    def state(self) -> DeviceState:
+        """Get the devices state with the scores."""
+        return self._state
+
+    def score(self, ip: str) -> float:
+        """The function returns the health score of the device."""
+        return self.state.get(ip, "health", 1.0)
+
+    def update(self, ip: str, backup_done: bool) -> None:
+        """The function adds the result of the backup to the score."""
+        score: float = (1 - SMOOTHING) * self.score(ip) + SMOOTHING * float(
+            backup_done
+        )
+        self.state.set(ip, "health", round(score, 3))
+
+    def is_unhealthy(self, ip: str) -> bool:
+        """The function checks if the device fails most of the time."""
+        return self.score(ip) < self._unhealthy_below
+
+    def sort(self, devices: list[BaseDevice]) -> list[BaseDevice]:
+        """
+        The function returns the devices from the healthiest, so
+        devices that fail don't keep workers busy before others.
+        The order of the devices with the same score is kept.
+        """
+        return sorted(devices, key=lambda dev: -self.score(dev.ip))
+
+
+if __name__ == "__main__":
+    pass
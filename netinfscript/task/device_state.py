@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+
+STATE_FILE_NAME: str = ".netinfscript_state.json"
+
+
+class DeviceState:
+    """
+    An object that keeps information about devices between runs,
+    e.g. the hash of the last stored configuration.
+    Data is stored in a json file in the configs folder.
+    """
+
+    def __init__(self, configs_dir_path: Path) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.devicestate"
+        )
+        self._state_file_path: Path = configs_dir_path / STATE_FILE_NAME
+        self._lock: Lock = Lock()
+        self._data: dict[str, dict] = {}
+        self._load()
+
+    @property
+    def state_file_path(self) -> Path:
+        """Get path of the state file."""
+        return self._state_file_path
+
+    def _load(self) -> None:
+        """
+        The function loads the state file. When the file doesn't
+        exist or is broken, the state starts empty.
+        """
+        try:
+            with open(self.state_file_path, "r") as f:
+                self._data = json.load(f)
+            self.logger.debug(f"Loaded state of {len(self._data)} devices.")
+        except FileNotFoundError:
+            self.logger.debug("State file doesn't exist. Starting empty.")
+        except (json.decoder.JSONDecodeError, OSError) as e:
+            self.logger.warning(
+                f"Can't load state file: {e}. Starting empty."
+            )
+
+    def reload(self) -> None:
+        """
+        The function drops changes not saved to the file
+        and loads the file again.
+        """
+        with self._lock:
+            self._data = {}
+        self._load()
+
+    def get(self, ip: str, key: str, default: object = None) -> object:
+        """
+        The function returns the stored value for the device.
+        """
+        with self._lock:
+            return self._data.get(ip, {}).get(key, default)
+
+    def set(self, ip: str, key: str, value: object) -> None:
+        """
+        The function stores the value for the device.
+        Safe to call from many threads.
+        """
+        with self._lock:
+            self._data.setdefault(ip, {})[key] = value
+
+    def save(self) -> bool:
+        """
+        The function writes the state to the file. The file is
+        replaced at once, so a broken run doesn't leave half of it.
+
+        :return: bool done or not.
+        """
+        tmp_path: Path = self.state_file_path.with_suffix(".tmp")
+        try:
+            with self._lock:
+                with open(tmp_path, "w") as f:
+                    json.dump(self._data, f)
+            tmp_path.replace(self.state_file_path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't save state file. Error: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from dulwich import porcelain
+from dulwich.repo import Repo
+
+
+class GitStore:
+    """
+    An object that keeps one git repository for all devices.
+    Files are collected during the run and commited once at the end.
+    """
+
+    def __init__(self, configs_dir_path: Path) -> None:
+        self.logger: logging = logging.getLogger("netinfscript.task.gitstore")
+        self._configs_dir_path: Path = configs_dir_path
+        self._staged_files: list[Path] = []
+        self._lock: Lock = Lock()
+
+    @property
+    def configs_dir_path(self) -> Path:
+        """Get path of the shared repository."""
+        return self._configs_dir_path
+
+    @property
+    def staged_files(self) -> list[Path]:
+        """Get files collected for the commit."""
+        return self._staged_files
+
+    def stage(self, file_path: Path) -> None:
+        """
+        The function remembers the file that will be
+        added to the commit. Safe to call from many threads.
+        """
+        with self._lock:
+            self._staged_files.append(file_path)
+
+    def _open_repo(self) -> Repo:
+        """
+        The funciton creates or opens the shared repo.
+        """
+        repo_path: Path = self.configs_dir_path / ".git"
+        if repo_path.exists():
+            return porcelain.open_repo(self.configs_dir_path)
+        self.logger.info("Creating the shared git repo.")
+        return porcelain.init(self.configs_dir_path)
+
+    def _head_tree(self, repo: Repo) -> bytes | None:
+        """
+        The function returns the tree id of the HEAD commit.
+        """
+        try:
+            return repo[repo.head()].tree
+        except KeyError:
+            return None
+
+    def commit(self) -> bool:
+        """
+        The function adds all collected files to the index and writes
+        a single commit if the tree changed.
+
+        :return: bool done or not.
+        """
+        with self._lock:
+            files: list[str] = [str(path) for path in self._staged_files]
+            self._staged_files = []
+        if len(files) == 0:
+            self.logger.info("Nothing to commit.")
+            return True
+        try:
+            repo: Repo = self._open_repo()
+        except Exception as e:
+            self.logger.warning(f"Can't creat git repo object. Error: {e}")
+            return False
+        try:
+            self.logger.debug(f"Adding {len(files)} files to git repo.")
+            porcelain.add(repo, paths=files)
+            tree_id: bytes = repo.open_index().commit(repo.object_store)
+            if tree_id == self._head_tree(repo):
+                self.logger.info("Nothing to commit.")
+                return True
+            message: bytes = (
+                f"Backup {datetime.now().isoformat(timespec='seconds')}, "
+                f"{len(files)} devices"
+            ).encode()
+            porcelain.commit(repo, message)
+            self.logger.info("Commit changes.")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't commit config files. Error: {e}")
+            return False
+        finally:
+            repo.close()
+
+
+if __name__ == "__main__":
+    pass
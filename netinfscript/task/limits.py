@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from threading import Condition, Lock
+from typing import AsyncIterator, Iterable, Iterator
+
+
+class TokenBucket:
+    """
+    An object that limits the rate of new connections. Every
+    connection takes one token, tokens come back at the rate,
+    up to the burst.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        :param rate: float tokens per second.
+        :param burst: int max number of tokens kept.
+        """
+        self._rate: float = rate
+        self._burst: int = max(burst, 1)
+        self._tokens: float = float(self._burst)
+        self._updated: float = time.monotonic()
+        self._lock: Lock = Lock()
+
+    def reserve(self) -> float:
+        """
+        The function takes a token, also one that comes in
+        the future, and returns seconds to wait for it.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+
+class ConcurrencyLimits:
+    """
+    An object that limits devices backed up at the same time behind
+    shared choke points: the site (the 'site' or 'group' key of the
+    device) and the AAA server (the 'aaa' key). The global limit is
+    the limit of the engine. New connections to every site and AAA
+    server can also be limited by a token bucket.
+
+    Places are taken when the device is handed to the engine, not
+    inside its workers. A device of a full site is put aside and
+    the next devices are handed out, so workers are never kept
+    waiting for one busy site while devices of other sites wait
+    in the list.
+    """
+
+    # devices put aside before the list stops being read
+    max_deferred: int = 10000
+
+    def __init__(
+        self,
+        per_site: int = 0,
+        per_aaa: int = 0,
+        connect_rate: float = 0,
+        connect_burst: int = 1,
+        site_limits: dict[str, int] | None = None,
+    ) -> None:
+        """
+        :param per_site: int max devices of one site, 0 - no limit.
+        :param per_aaa: int max devices of one AAA server, 0 - no limit.
+        :param connect_rate: float new connections per second to one
+            site or AAA server, 0 - no limit.
+        :param connect_burst: int connections started at once.
+        :param site_limits: dict site name -> max devices.
+        """
+        self.logger: logging = logging.getLogger("netinfscript.task.limits")
+        self._limits: dict[str, int] = {"site": per_site, "aaa": per_aaa}
+        self._site_limits: dict[str, int] = site_limits or {}
+        self._connect_rate: float = connect_rate
+        self._connect_burst: int = connect_burst
+        self._targets: dict[str, tuple[tuple[str, str], ...]] = {}
+        self._lock: Lock = Lock()
+        # notified when a place is given back
+        self._released: Condition = Condition(self._lock)
+        self._async_released: asyncio.Event | None = None
+        self._active: dict[tuple[str, str], int] = {}
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Get if any limit is set."""
+        return (
+            any(limit > 0 for limit in self._limits.values())
+            or len(self._site_limits) > 0
+            or self._connect_rate > 0
+        )
+
+    def register(self, ip: str, params: dict) -> None:
+        """
+        The function remembers the site and AAA server of the device.
+
+        :param ip: ip of the device.
+        :param params: parameters of the device from the devices file.
+        """
+        site: object = params.get("site") or params.get("group")
+        aaa: object = params.get("aaa")
+        targets: list[tuple[str, str]] = []
+        if isinstance(site, str):
+            targets.append(("site", site.lower()))
+        if isinstance(aaa, str):
+            targets.append(("aaa", aaa.lower()))
+        with self._lock:
+            if len(targets) > 0:
+                self._targets[ip] = tuple(targets)
+            else:
+                self._targets.pop(ip, None)
+
+    def register_all(self, devices_data: dict[str, dict]) -> None:
+        """The function remembers sites and AAA servers of all devices."""
+        for ip, params in devices_data.items():
+            if isinstance(params, dict):
+                self.register(ip, params)
+
+    def _limit(self, target: tuple[str, str]) -> int:
+        """The function returns the max devices of the target."""
+        if target[0] == "site" and target[1] in self._site_limits:
+            return self._site_limits[target[1]]
+        return self._limits[target[0]]
+
+    def _wait_time(self, targets: tuple[tuple[str, str], ...]) -> float:
+        """
+        The function takes connection tokens of all targets
+        and returns seconds to wait for the slowest one.
+        """
+        if self._connect_rate <= 0:
+            return 0.0
+        delay: float = 0.0
+        with self._lock:
+            buckets: list[TokenBucket] = [
+                self._buckets.setdefault(
+                    target,
+                    TokenBucket(self._connect_rate, self._connect_burst),
+                )
+                for target in targets
+            ]
+        for bucket in buckets:
+            delay = max(delay, bucket.reserve())
+        return delay
+
+    def _limited(self, ip: str) -> list[tuple[str, str]]:
+        """The function returns the targets of the device with a limit."""
+        return [
+            target
+            for target in self._targets.get(ip, ())
+            if self._limit(target) > 0
+        ]
+
+    def _acquire_locked(self, ip: str) -> bool:
+        """
+        The function takes places of the device at all its targets,
+        or none of them. The lock must be held.
+
+        :return: bool True if the places were taken.
+        """
+        targets: list[tuple[str, str]] = self._limited(ip)
+        for target in targets:
+            if self._active.get(target, 0) >= self._limit(target):
+                return False
+        for target in targets:
+            self._active[target] = self._active.get(target, 0) + 1
+        return True
+
+    def try_acquire(self, ip: str) -> bool:
+        """
+        The function takes places of the device without waiting.
+
+        :return: bool True if the places were taken.
+        """
+        with self._lock:
+            return self._acquire_locked(ip)
+
+    def release(self, ip: str) -> None:
+        """The function gives back places of the device."""
+        with self._lock:
+            for target in self._limited(ip):
+                self._active[target] = max(self._active.get(target, 0) - 1, 0)
+            self._released.notify_all()
+        if self._async_released is not None:
+            self._async_released.set()
+
+    def _take_deferred(self, deferred: deque) -> object | None:
+        """
+        The function returns the first device put aside whose
+        places are free now, and takes them. The lock must be held.
+        """
+        for dev in deferred:
+            if self._acquire_locked(dev.ip):
+                deferred.remove(dev)
+                return dev
+        return None
+
+    def schedule(self, devices: Iterable) -> Iterator:
+        """
+        The generator hands out devices of the threading engine.
+        Places of every device are taken before it is returned and
+        must be given back by the slot. Devices of full sites wait
+        aside, the generator waits only when all devices left are
+        put aside.
+
+        :param devices: devices of the run, objects with the ip.
+        """
+        deferred: deque = deque()
+        source: Iterator = iter(devices)
+        exhausted: bool = False
+        while True:
+            with self._lock:
+                dev: object | None = self._take_deferred(deferred)
+            if dev is not None:
+                yield dev
+                continue
+            if not exhausted and len(deferred) < self.max_deferred:
+                dev = next(source, None)
+                if dev is None:
+                    exhausted = True
+                elif self.try_acquire(dev.ip):
+                    yield dev
+                else:
+                    self.logger.debug(f"{dev.ip}:Limit reached. Deferred.")
+                    deferred.append(dev)
+                continue
+            if len(deferred) == 0:
+                return
+            with self._released:
+                while (dev := self._take_deferred(deferred)) is None:
+                    self._released.wait()
+            yield dev
+
+    async def async_schedule(self, devices: Iterable) -> AsyncIterator:
+        """
+        The generator hands out devices of the async engine, like
+        schedule, but waits for places in the event loop.
+
+        :param devices: devices of the run, objects with the ip.
+        """
+        if self._async_released is None:
+            self._async_released = asyncio.Event()
+        deferred: deque = deque()
+        source: Iterator = iter(devices)
+        exhausted: bool = False
+        while True:
+            with self._lock:
+                dev: object | None = self._take_deferred(deferred)
+            if dev is not None:
+                yield dev
+                continue
+            if not exhausted and len(deferred) < self.max_deferred:
+                dev = next(source, None)
+                if dev is None:
+                    exhausted = True
+                elif self.try_acquire(dev.ip):
+                    yield dev
+                else:
+                    self.logger.debug(f"{dev.ip}:Limit reached. Deferred.")
+                    deferred.append(dev)
+                continue
+            if len(deferred) == 0:
+                return
+            # places are given back only by coroutines of this loop,
+            # so none is missed between the check and the wait
+            self._async_released.clear()
+            await self._async_released.wait()
+
+    @contextmanager
+    def slot(self, ip: str) -> Iterator[None]:
+        """
+        The context manager keeps the places of the device taken
+        by schedule until the end, waiting for the connection token
+        first.
+        """
+        try:
+            delay: float = self._wait_time(self._targets.get(ip, ()))
+            if delay > 0:
+                self.logger.debug(f"{ip}:Connection delayed {delay:.2f}s.")
+                time.sleep(delay)
+            yield
+        finally:
+            self.release(ip)
+
+    @asynccontextmanager
+    async def async_slot(self, ip: str) -> AsyncIterator[None]:
+        """
+        The context manager keeps the places of the device taken
+        by async_schedule until the end, waiting for the connection
+        token first.
+        """
+        try:
+            delay: float = self._wait_time(self._targets.get(ip, ()))
+            if delay > 0:
+                self.logger.debug(f"{ip}:Connection delayed {delay:.2f}s.")
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self.release(ip)
+
+    def reset_async(self) -> None:
+        """
+        The function drops the asyncio event, it belongs
+        to the event loop of one run.
+        """
+        self._async_released = None
+
+
+if __name__ == "__main__":
+    pass
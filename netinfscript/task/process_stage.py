@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from netinfscript.agent.devices_load import VENDOR_CLASSES
+
+
+def init_worker(filter_rules: dict, normalize_rules: dict) -> None:
+    """
+    The function compiles the rules of every vendor in the worker
+    process, so workers filter the same way as the main process.
+    """
+    for vendor, vendor_class in VENDOR_CLASSES.items():
+        vendor_class.compile_filter(
+            filter_rules.get(vendor), normalize_rules.get(vendor)
+        )
+
+
+def _ready() -> bool:
+    """The function is sent to start the worker processes."""
+    return True
+
+
+class ProcessStage:
+    """
+    An object that offloads CPU-bound work (filtering, hashing, git
+    objects) to a pool of worker processes, so it doesn't share the
+    GIL with the threads doing network I/O.
+
+    It isn't a pipeline: the caller waits for the result of its work
+    and goes on with the next device only then. Every caller has one
+    task at a time, so tasks waiting for workers are limited by the
+    concurrency of the engine. Arguments and results are pickled,
+    the whole downloaded configuration is copied to the worker.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        filter_rules: dict | None = None,
+        normalize_rules: dict | None = None,
+    ) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.processstage"
+        )
+        self._workers: int = workers or cpu_count()
+        self._executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=init_worker,
+            initargs=(filter_rules or {}, normalize_rules or {}),
+        )
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker processes."""
+        return self._workers
+
+    def start(self) -> None:
+        """
+        The function starts the worker processes before any
+        network thread is started.
+        """
+        self.logger.debug(f"Starting {self.workers} worker processes.")
+        self._executor.submit(_ready).result()
+
+    def run(self, func: callable, *args) -> object:
+        """
+        The function sends the work to the worker processes
+        and waits for its result.
+
+        :param func: function to perform, must be picklable.
+        """
+        return self._executor.submit(func, *args).result()
+
+    def close(self) -> None:
+        """The function stops the worker processes."""
+        self.logger.debug("Stopping worker processes.")
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    pass
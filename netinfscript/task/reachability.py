@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import asyncio
+import logging
+from netinfscript.devices.base_device import BaseDevice
+
+
+class ReachabilitySweep:
+    """
+    An object that checks, before the backup, which devices accept
+    a TCP connection on their port. All connects are started in one
+    event loop, so the whole list is checked in about one timeout
+    and dead devices don't keep the workers until the connect
+    timeout of the session.
+    """
+
+    def __init__(self, timeout: float = 3, concurrency: int = 500) -> None:
+        """
+        :param timeout: float max seconds of one TCP connect.
+        :param concurrency: int max connects open at the same time.
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.reachability"
+        )
+        self._timeout: float = timeout
+        self._concurrency: int = max(concurrency, 1)
+
+    @property
+    def timeout(self) -> float:
+        """Get the max seconds of one TCP connect."""
+        return self._timeout
+
+    async def _check(
+        self, semaphore: asyncio.Semaphore, dev: BaseDevice
+    ) -> bool:
+        """
+        The function opens and closes the TCP connection
+        to the port of the device.
+
+        :return: bool True if the device accepted the connection.
+        """
+        async with semaphore:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(dev.ip, dev.port), self.timeout
+                )
+            except (asyncio.TimeoutError, OSError) as e:
+                self.logger.debug(f"{dev.ip}:Port {dev.port} unreachable. {e}")
+                return False
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+
+    async def _sweep(self, devices: list[BaseDevice]) -> list[bool]:
+        """The function checks all devices at once."""
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self._concurrency)
+        return await asyncio.gather(
+            *(self._check(semaphore, dev) for dev in devices)
+        )
+
+    def split(
+        self, devices: list[BaseDevice]
+    ) -> tuple[list[BaseDevice], list[BaseDevice]]:
+        """
+        The function divides the devices into reachable and
+        unreachable ones, keeping their order.
+
+        :param devices: devices of the run.
+        :return: lists of reachable and unreachable devices.
+        """
+        if len(devices) == 0:
+            return [], []
+        results: list[bool] = asyncio.run(self._sweep(devices))
+        reachable: list[BaseDevice] = []
+        unreachable: list[BaseDevice] = []
+        for dev, result in zip(devices, results):
+            (reachable if result else unreachable).append(dev)
+        return reachable, unreachable
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import heapq
+import logging
+import random
+import time
+from itertools import count
+from threading import Lock
+from netinfscript.devices.base_device import BaseDevice
+
+# errors of the connection that may pass after a while
+TRANSIENT_ERRORS: set[str] = {"timeout", "unreachable"}
+
+
+class RetryQueue:
+    """
+    An object that keeps devices whose backup failed with a transient
+    error. Every device waits an exponential backoff with a random
+    jitter before the next attempt, so the retries don't hit
+    the network all at once.
+    """
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 5,
+        backoff_max: float = 60,
+        jitter: float = 0.5,
+    ) -> None:
+        """
+        :param retries: int max number of retries of one device.
+        :param backoff: float seconds before the first retry.
+        :param backoff_max: float max seconds between retries.
+        :param jitter: float part of the backoff used as random shift.
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.retryqueue"
+        )
+        self._retries: int = retries
+        self._backoff: float = backoff
+        self._backoff_max: float = backoff_max
+        self._jitter: float = jitter
+        self._lock: Lock = Lock()
+        self._attempts: dict[str, int] = {}
+        # heap of (time of the retry, order, device)
+        self._queue: list[tuple[float, int, BaseDevice]] = []
+        self._order = count()
+
+    @property
+    def retries(self) -> int:
+        """Get the max number of retries of one device."""
+        return self._retries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def delay(self, attempt: int) -> float:
+        """
+        The function returns seconds before the retry.
+
+        :param attempt: int number of the retry, from 1.
+        """
+        delay: float = min(
+            self._backoff * 2 ** (attempt - 1), self._backoff_max
+        )
+        return delay * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def add(self, dev: BaseDevice, error: str | None) -> bool:
+        """
+        The function adds the failed device to the queue, when
+        the error is transient and retries are left.
+        Safe to call from many threads.
+
+        :return: bool True if the device will be retried.
+        """
+        if error not in TRANSIENT_ERRORS:
+            return False
+        with self._lock:
+            attempt: int = self._attempts.get(dev.ip, 0) + 1
+            if attempt > self.retries:
+                return False
+            self._attempts[dev.ip] = attempt
+            heapq.heappush(
+                self._queue,
+                (time.time() + self.delay(attempt), next(self._order), dev),
+            )
+        self.logger.debug(f"{dev.ip}:Retry {attempt} scheduled.")
+        return True
+
+    def pop_due(self) -> list[BaseDevice]:
+        """The function returns devices that should be retried now."""
+        now: float = time.time()
+        due: list[BaseDevice] = []
+        with self._lock:
+            while len(self._queue) > 0 and self._queue[0][0] <= now:
+                due.append(heapq.heappop(self._queue)[2])
+        return due
+
+    def seconds_to_next(self) -> float:
+        """The function returns seconds to the next retry."""
+        with self._lock:
+            if len(self._queue) == 0:
+                return 0.0
+            return max(0.0, self._queue[0][0] - time.time())
+
+    def clear(self) -> None:
+        """The function forgets devices and attempts of the run."""
+        with self._lock:
+            self._queue = []
+            self._attempts = {}
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+
+# phases of a device backup, in order
+PHASES: list[str] = ["connect", "command", "filter", "file", "git", "total"]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    The function returns the percentile of the values
+    (nearest rank).
+    """
+    if len(values) == 0:
+        return 0.0
+    values = sorted(values)
+    index: int = min(
+        len(values) - 1, int(round(pct / 100 * (len(values) - 1)))
+    )
+    return values[index]
+
+
+class RunReport:
+    """
+    An object that collects timing of every phase of every device
+    backup and writes the summary of the run.
+    """
+
+    def __init__(self) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.runreport"
+        )
+        self._lock: Lock = Lock()
+        self._started: float = time.time()
+        self._devices: dict[str, dict] = {}
+        self._run_phases: dict[str, float] = {}
+
+    def add(self, ip: str, phase: str, seconds: float) -> None:
+        """The function adds time spent by the device in the phase."""
+        with self._lock:
+            phases: dict = self._devices.setdefault(
+                ip, {"status": None, "phases": {}}
+            )["phases"]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def set_status(
+        self, ip: str, status: str, overwrite: bool = True
+    ) -> None:
+        """
+        The function sets the result of the device backup.
+
+        :param overwrite: bool replace the status already set.
+        """
+        with self._lock:
+            device: dict = self._devices.setdefault(
+                ip, {"status": None, "phases": {}}
+            )
+            if overwrite or device["status"] is None:
+                device["status"] = status
+
+    def add_run_phase(self, phase: str, seconds: float) -> None:
+        """The function adds time of work done once per run."""
+        with self._lock:
+            self._run_phases[phase] = (
+                self._run_phases.get(phase, 0.0) + seconds
+            )
+
+    @contextmanager
+    def span(self, ip: str, phase: str) -> Iterator[None]:
+        """The context manager that measures the phase of the device."""
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(ip, phase, time.perf_counter() - start)
+
+    def summary(self, slowest: int = 10) -> dict:
+        """
+        The function returns totals, percentiles and
+        the slowest devices of the run.
+        """
+        with self._lock:
+            devices: dict[str, dict] = {
+                ip: {"status": data["status"], "phases": dict(data["phases"])}
+                for ip, data in self._devices.items()
+            }
+            run_phases: dict[str, float] = dict(self._run_phases)
+        statuses: dict[str, int] = {}
+        for data in devices.values():
+            status: str = data["status"] or "unknown"
+            statuses[status] = statuses.get(status, 0) + 1
+        phases: dict[str, dict] = {}
+        for phase in PHASES:
+            values: list[float] = [
+                data["phases"][phase]
+                for data in devices.values()
+                if phase in data["phases"]
+            ]
+            phases[phase] = {
+                "count": len(values),
+                "total_s": round(sum(values), 4),
+                "p50_s": round(percentile(values, 50), 4),
+                "p90_s": round(percentile(values, 90), 4),
+                "p99_s": round(percentile(values, 99), 4),
+                "max_s": round(max(values, default=0.0), 4),
+            }
+        slowest_devices: list[dict] = [
+            {
+                "ip": ip,
+                "status": data["status"],
+                "phases": {
+                    phase: round(seconds, 4)
+                    for phase, seconds in data["phases"].items()
+                },
+            }
+            for ip, data in sorted(
+                devices.items(),
+                key=lambda item: item[1]["phases"].get("total", 0.0),
+                reverse=True,
+            )[:slowest]
+        ]
+        return {
+            "started": self._started,
+            "duration_s": round(time.time() - self._started, 4),
+            "devices": len(devices),
+            "statuses": statuses,
+            "phases": phases,
+            "run_phases": {
+                phase: round(seconds, 4)
+                for phase, seconds in run_phases.items()
+            },
+            "slowest": slowest_devices,
+        }
+
+    def write_json(self, path: Path, summary: dict) -> bool:
+        """
+        The function writes the summary as json.
+
+        :return: bool done or not.
+        """
+        try:
+            tmp_path: Path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(summary, f, indent=2)
+            tmp_path.replace(path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't write json report. Error: {e}")
+            return False
+
+    def write_prometheus(self, path: Path, summary: dict) -> bool:
+        """
+        The function writes the summary in the Prometheus textfile
+        collector format.
+
+        :return: bool done or not.
+        """
+        lines: list[str] = [
+            "# HELP netinfscript_run_duration_seconds Duration of the run.",
+            "# TYPE netinfscript_run_duration_seconds gauge",
+            f"netinfscript_run_duration_seconds {summary['duration_s']}",
+            "# HELP netinfscript_run_timestamp_seconds Start of the run.",
+            "# TYPE netinfscript_run_timestamp_seconds gauge",
+            f"netinfscript_run_timestamp_seconds {summary['started']}",
+            "# HELP netinfscript_devices Devices by backup result.",
+            "# TYPE netinfscript_devices gauge",
+        ]
+        for status, count in summary["statuses"].items():
+            lines.append(f'netinfscript_devices{{status="{status}"}} {count}')
+        lines.append(
+            "# HELP netinfscript_phase_seconds Time of device backup phases."
+        )
+        lines.append("# TYPE netinfscript_phase_seconds gauge")
+        for phase, stats in summary["phases"].items():
+            for stat in ["total_s", "p50_s", "p90_s", "p99_s", "max_s"]:
+                lines.append(
+                    f'netinfscript_phase_seconds{{phase="{phase}",'
+                    f'stat="{stat[:-2]}"}} {stats[stat]}'
+                )
+        lines.append(
+            "# HELP netinfscript_run_phase_seconds Time of work done once "
+            "per run."
+        )
+        lines.append("# TYPE netinfscript_run_phase_seconds gauge")
+        for phase, seconds in summary["run_phases"].items():
+            lines.append(
+                f'netinfscript_run_phase_seconds{{phase="{phase}"}} {seconds}'
+            )
+        try:
+            # the collector must never read a half written file
+            tmp_path: Path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            tmp_path.replace(path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Can't write prometheus report. Error: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import heapq
+import logging
+import random
+import time
+
+
+class Scheduler:
+    """
+    An object that decides when every device should be backed up.
+    Every device has its own interval. The first run of each device
+    is placed at a random point of its interval and every next run
+    is moved by a random jitter, so the load is spread evenly.
+    """
+
+    def __init__(
+        self,
+        default_interval: int = 86400,
+        jitter: float = 0.1,
+        group_intervals: dict[str, int] | None = None,
+    ) -> None:
+        """
+        :param default_interval: int seconds between backups.
+        :param jitter: float part of the interval used as random shift.
+        :param group_intervals: dict group name -> seconds.
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.scheduler"
+        )
+        self._default_interval: int = default_interval
+        self._jitter: float = jitter
+        self._group_intervals: dict[str, int] = group_intervals or {}
+        self._intervals: dict[str, int] = {}
+        # heap of (time of the next run, device ip)
+        self._queue: list[tuple[float, str]] = []
+
+    @property
+    def default_interval(self) -> int:
+        """Get seconds between backups of one device."""
+        return self._default_interval
+
+    def interval_for(self, params: dict) -> int:
+        """
+        The function returns the interval for the device.
+        The device 'interval' key wins over the 'group' interval.
+
+        :param params: device parameters from the devices file.
+        """
+        interval: int | None = params.get("interval")
+        if isinstance(interval, int) and interval > 0:
+            return interval
+        group: str | None = params.get("group")
+        # config.ini keys are lowercase
+        if group is not None and group.lower() in self._group_intervals:
+            return self._group_intervals[group.lower()]
+        return self.default_interval
+
+    def load(self, devices_data: dict[str, dict]) -> None:
+        """
+        The function (re)builds the schedule for the devices.
+        Devices that are already scheduled keep their next run
+        unless their interval changed.
+
+        :param devices_data: ip -> device parameters.
+        """
+        now: float = time.time()
+        next_runs: dict[str, float] = {ip: due for due, ip in self._queue}
+        intervals: dict[str, int] = {}
+        queue: list[tuple[float, str]] = []
+        for ip, params in devices_data.items():
+            interval: int = self.interval_for(params)
+            intervals[ip] = interval
+            if ip in next_runs and self._intervals.get(ip) == interval:
+                queue.append((next_runs[ip], ip))
+            else:
+                queue.append((now + random.uniform(0, interval), ip))
+        heapq.heapify(queue)
+        self._intervals = intervals
+        self._queue = queue
+        self.logger.info(f"Scheduled {len(queue)} devices.")
+
+    def pop_due(self) -> list[str]:
+        """
+        The function returns devices that should be backed up now
+        and schedules their next run.
+        """
+        now: float = time.time()
+        due: list[str] = []
+        while len(self._queue) > 0 and self._queue[0][0] <= now:
+            _, ip = heapq.heappop(self._queue)
+            due.append(ip)
+        for ip in due:
+            interval: int = self._intervals[ip]
+            shift: float = random.uniform(-self._jitter, self._jitter)
+            heapq.heappush(self._queue, (now + interval * (1 + shift), ip))
+        return due
+
+    def seconds_to_next(self) -> float:
+        """The function returns seconds to the next scheduled run."""
+        if len(self._queue) == 0:
+            return float(self.default_interval)
+        return max(0.0, self._queue[0][0] - time.time())
+
+
+if __name__ == "__main__":
+    pass
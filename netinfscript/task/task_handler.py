@@ -12,14 +12,40 @@
 # <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
 # License, Version 3.0.
 
+import asyncio
 import logging
+import signal
 import sys
+import time
+from contextlib import nullcontext
+from threading import BoundedSemaphore, Event
+from typing import AsyncIterator, Iterable
 from os import cpu_count
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, wait
+import urllib3
+from concurrent.futures import Future, ThreadPoolExecutor
 from netinfscript.devices.base_device import BaseDevice
 from netinfscript.task.backup_task import BackupTask
-from netinfscript.agent.devices_load import Devices_Load
+from netinfscript.task.git_store import GitStore
+from netinfscript.task.chunk_store import ChunkStore
+from netinfscript.task.device_state import DeviceState
+from netinfscript.task.scheduler import Scheduler
+from netinfscript.task.run_report import RunReport
+from netinfscript.task.timeout_model import TimeoutModel
+from netinfscript.task.process_stage import ProcessStage
+from netinfscript.task.retry_queue import RetryQueue
+from netinfscript.task.device_health import DeviceHealth
+from netinfscript.task.limits import ConcurrencyLimits
+from netinfscript.task.reachability import ReachabilitySweep
+from netinfscript.agent.devices_load import Devices_Load, VENDOR_CLASSES
+from netinfscript.agent.inventory_cache import InventoryCache
+from netinfscript.agent.device_selection import (
+    DeviceSelection,
+    InventoryIndex,
+)
+from netinfscript.connections.conn_async_ssh import ASYNCSSH_AVAILABLE
+from netinfscript.connections.conn_pool import ConnectionPool
+from netinfscript.connections.conn_restconf import make_http_pool
 
 
 class Multithreading:
@@ -44,15 +70,18 @@ class Multithreading:
 
         :return: None
         """
+        # limit of waiting tasks, so objects are taken from the list
+        # only when a thread is ready to work on them
+        slots: BoundedSemaphore = BoundedSemaphore(self._thread_num * 2)
         with ThreadPoolExecutor(max_workers=self._thread_num) as executor:
-            wait(
-                [
-                    executor.submit(self.func, i, *args, **kwargs)
-                    for i in self.lst
-                ]
-            )
+            for i in self.lst:
+                slots.acquire()
+                future: Future = executor.submit(
+                    self.func, i, *args, **kwargs
+                )
+                future.add_done_callback(lambda _: slots.release())
 
-    def execute(self, func: callable, lst: list, *args, **kwargs) -> None:
+    def execute(self, func: callable, lst: Iterable, *args, **kwargs) -> None:
         """
         The function begins the process of splitting
         the received function into multiple threads.
@@ -63,23 +92,182 @@ class Multithreading:
         :return: None
         """
         self.func = func
-        self.lst: list = lst
+        self.lst: Iterable = lst
         self._threading(*args, **kwargs)
 
 
+class AsyncExecution:
+    def __init__(self, max_concurrency: int = 200) -> None:
+        """
+        An object that is responsible for running a task
+        for many objects inside one event loop.
+
+        :param max_concurrency: int maximum number of coroutines
+                                running at the same time.
+        :return: None
+        """
+        self.logger: logging = logging.getLogger(
+            "netinfscript.AsyncExecution"
+        )
+        self._max_concurrency: int = max_concurrency
+
+    @staticmethod
+    async def _aiter(lst: Iterable) -> AsyncIterator:
+        """The generator returns objects of the list in the loop."""
+        for item in lst:
+            yield item
+
+    async def _worker(
+        self, iterator: AsyncIterator, lock: asyncio.Lock, *args, **kwargs
+    ) -> None:
+        """
+        The function takes objects from the shared iterator
+        and runs the coroutine for them, one after another.
+
+        :return: None
+        """
+        while True:
+            # the iterator may wait, only one worker can be inside
+            async with lock:
+                try:
+                    item: object = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+            try:
+                await self.func(item, *args, **kwargs)
+            except Exception as e:
+                self.logger.error(f"Task failed. Error: {e}")
+
+    async def _gather(self, *args, **kwargs) -> None:
+        """
+        The function starts max_concurrency workers. Objects are
+        taken from the list only when a worker is free. The list
+        can also be an async iterable. Blocking work of the workers,
+        like devices that need a privilege command, runs in threads
+        of the loop, one for every worker.
+
+        :return: None
+        """
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=self._max_concurrency,
+                thread_name_prefix="netinfscript-async",
+            )
+        )
+        iterator: AsyncIterator = (
+            aiter(self.lst)
+            if hasattr(self.lst, "__aiter__")
+            else self._aiter(self.lst)
+        )
+        lock: asyncio.Lock = asyncio.Lock()
+        await asyncio.gather(
+            *[
+                self._worker(iterator, lock, *args, **kwargs)
+                for _ in range(self._max_concurrency)
+            ]
+        )
+
+    def execute(self, func: callable, lst: Iterable, *args, **kwargs) -> None:
+        """
+        The function begins the process of running the received
+        coroutine function for every object in the event loop.
+
+        :param func: coroutine function to perform
+        :param lst: List of objects on which
+                    the sent function is to be executed.
+        :return: None
+        """
+        self.func = func
+        self.lst: Iterable = lst
+        asyncio.run(self._gather(*args, **kwargs))
+
+
 class TaskHandler:
     """
     An object respnsible for manage tasks.
     """
 
     def __init__(
-        self, devices_config_file: Path, configs_dir_path: Path
+        self,
+        devices_config_file: Path,
+        configs_dir_path: Path,
+        run_settings: dict | None = None,
     ) -> None:
         self.logger: logging = logging.getLogger(f"netinfscript.TaskHandler")
         self._devices_config_file: Path = devices_config_file
         self._configs_dir_path: Path = configs_dir_path
+        self._run_settings: dict = run_settings or {}
         self._created_devices_list: list = []
+        self._run_devices_list: Iterable[BaseDevice] = []
+        self._stop_event: Event = Event()
+        self._report: RunReport | None = None
+        self._git_store: GitStore | None = None
+        self._chunk_store: ChunkStore | None = None
+        if self.run_settings.get("storage_backend") == "chunks":
+            # git history is exported from the store on demand
+            self._chunk_store = ChunkStore(
+                self.configs_dir_path,
+                self.run_settings.get("compression_level", 3),
+            )
+        elif self.run_settings.get("git_mode") == "shared":
+            self._git_store = GitStore(self.configs_dir_path)
+        self._state: DeviceState | None = None
+        if self.run_settings.get("hash_index", True):
+            self._state = DeviceState(self.configs_dir_path)
+        self._timeout_model: TimeoutModel | None = None
+        if self.state is not None and self.run_settings.get(
+            "adaptive_timeout", True
+        ):
+            self._timeout_model = TimeoutModel(
+                self.state,
+                self.run_settings.get("read_timeout", 60),
+                self.run_settings.get("read_timeout_min", 10),
+                self.run_settings.get("read_timeout_max", 300),
+                self.run_settings.get("read_timeout_factor", 3.0),
+            )
+        self._health: DeviceHealth | None = None
+        if self.state is not None:
+            self._health = DeviceHealth(
+                self.state, self.run_settings.get("unhealthy_below", 0.3)
+            )
+        self._retry_queue: RetryQueue | None = None
+        if self.run_settings.get("retries", 2) > 0:
+            self._retry_queue = RetryQueue(
+                self.run_settings.get("retries", 2),
+                self.run_settings.get("retry_backoff", 5),
+                self.run_settings.get("retry_backoff_max", 60),
+            )
+        self._limits: ConcurrencyLimits | None = ConcurrencyLimits(
+            self.run_settings.get("limit_per_site", 0),
+            self.run_settings.get("limit_per_aaa", 0),
+            self.run_settings.get("connect_rate", 0),
+            self.run_settings.get("connect_burst", 1),
+            self.run_settings.get("site_limits", {}),
+        )
+        if not self._limits.enabled:
+            self._limits = None
+        self._preflight: ReachabilitySweep | None = None
+        if self.run_settings.get("preflight", False):
+            self._preflight = ReachabilitySweep(
+                self.run_settings.get("preflight_timeout", 3),
+                self.run_settings.get("preflight_concurrency", 500),
+            )
+        self._pool: ConnectionPool | None = None
+        if self.run_settings.get("pool", False):
+            self._pool = ConnectionPool(
+                self.run_settings.get("pool_idle_timeout", 300),
+                self.run_settings.get("pool_max_per_host", 2),
+                self.run_settings.get("pool_max_idle", 100),
+            )
+        # keep-alive HTTPS connections of RESTCONF devices
+        self._http_pool: urllib3.PoolManager = make_http_pool(
+            self.run_settings.get("pool_max_per_host", 2),
+            self.run_settings.get("verify_certificates", True),
+        )
+        self._process_stage: ProcessStage | None = None
+        self._selection: DeviceSelection | None = None
         self._exe_func: None | str = None
+        self.compile_filters()
 
     @property
     def devices_config_file(self) -> Path:
@@ -91,6 +279,90 @@ class TaskHandler:
         """Get the initialized variables."""
         return self._configs_dir_path
 
+    @property
+    def run_settings(self) -> dict:
+        """Get the settings of the task execution."""
+        return self._run_settings
+
+    @property
+    def git_store(self) -> GitStore | None:
+        """Get the shared git repository, if used."""
+        return self._git_store
+
+    @property
+    def chunk_store(self) -> ChunkStore | None:
+        """Get the store of compressed chunks."""
+        return self._chunk_store
+
+    @property
+    def state(self) -> DeviceState | None:
+        """Get the devices state stored between runs, if used."""
+        return self._state
+
+    @property
+    def health(self) -> DeviceHealth | None:
+        """Get the health scores of the devices, if used."""
+        return self._health
+
+    @property
+    def limits(self) -> ConcurrencyLimits | None:
+        """Get the limits of sites and AAA servers, if used."""
+        return self._limits
+
+    @property
+    def preflight(self) -> ReachabilitySweep | None:
+        """Get the pre-flight reachability sweep, if used."""
+        return self._preflight
+
+    @property
+    def retry_queue(self) -> RetryQueue | None:
+        """Get the queue of devices to retry, if used."""
+        return self._retry_queue
+
+    @property
+    def process_stage(self) -> ProcessStage | None:
+        """Get the worker processes of the CPU-bound work, if used."""
+        return self._process_stage
+
+    @property
+    def timeout_model(self) -> TimeoutModel | None:
+        """Get the model of the adaptive read timeout, if used."""
+        return self._timeout_model
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Get the SSH connection pool, if used."""
+        return self._pool
+
+    @property
+    def http_pool(self) -> urllib3.PoolManager:
+        """Get the pool of HTTPS connections of RESTCONF devices."""
+        return self._http_pool
+
+    @property
+    def report(self) -> RunReport | None:
+        """Get the report of the current run."""
+        return self._report
+
+    @property
+    def selection(self) -> DeviceSelection | None:
+        """Get the devices chosen for the run, None means all."""
+        return self._selection
+
+    @selection.setter
+    def selection(self, selection: DeviceSelection | None) -> None:
+        """Set the devices chosen for the run."""
+        if (
+            selection is not None
+            and selection.uses_state
+            and self.state is None
+        ):
+            self.logger.warning(
+                "Selection by the last backup needs the hash index. "
+                "Last results are not checked."
+            )
+        self._selection = selection
+
     @property
     def exe_func(self) -> str:
         """Get the task that need to be executed."""
@@ -109,15 +381,270 @@ class TaskHandler:
         self.logger.debug(f"Trying load devices from database.")
         # load devices
         try:
-            self.device_database_load()
-            ### send tuple for some reason
-            for ip in self.devices_loaded.devices_data.items():
-                _dev_obj = self.devices_loaded.create_devices(ip)
-                self._created_devices_list.append(_dev_obj)
+            if self.run_settings.get("stream_devices", False):
+                # devices are read and created when workers need them
+                self.devices_loaded: Devices_Load = Devices_Load(
+                    self.devices_config_file, stream=True
+                )
+                self._run_devices_list = (
+                    self.devices_loaded.iter_created_devices(
+                        None
+                        if self.selection is None and self.limits is None
+                        else self.is_selected
+                    )
+                )
+            else:
+                self.load_devices()
+                self._run_devices_list = self.order_devices(
+                    self._created_devices_list
+                )
         except Exception as e:
             self.logger.error(f"Can't load devices from database.")
             sys.exit(10)
         # ececute script
+        self.execute()
+        self.finish_run()
+
+    def compile_filters(self) -> None:
+        """
+        The function compiles the filter and normalize rules
+        of every vendor with the rules loaded from the config.
+        """
+        filter_rules: dict = self.run_settings.get("filter_rules", {})
+        normalize_rules: dict = self.run_settings.get("normalize_rules", {})
+        for vendor, vendor_class in VENDOR_CLASSES.items():
+            vendor_class.compile_filter(
+                filter_rules.get(vendor), normalize_rules.get(vendor)
+            )
+
+    def load_devices(self) -> None:
+        """
+        The function loads the devices file and creates device objects.
+        With the selection only the chosen devices are created.
+        """
+        self.device_database_load()
+        self._devices_mtime: float = self.devices_config_file.stat().st_mtime
+        ips: set[str] | None = None
+        if self.selection is not None:
+            ips = self.selection.select(
+                InventoryIndex(self.devices_loaded.devices_data), self.state
+            )
+            self.logger.info(f"Selected {len(ips)} devices.")
+        self._created_devices_list = self.devices_loaded.create_all_devices(
+            ips
+        )
+        if self.limits is not None:
+            self.limits.register_all(self.devices_loaded.devices_data)
+
+    def reload_devices_if_changed(self) -> bool:
+        """
+        The function loads the devices file again when it was modified.
+        When the new file can't be loaded, old devices are kept.
+
+        :return: bool True if devices were reloaded.
+        """
+        try:
+            mtime: float = self.devices_config_file.stat().st_mtime
+        except OSError as e:
+            self.logger.error(f"Can't check devices file: {e}")
+            return False
+        if mtime == self._devices_mtime:
+            return False
+        self.logger.info("Devices file changed. Loading devices.")
+        old_loaded: Devices_Load = self.devices_loaded
+        old_devices: list = self._created_devices_list
+        try:
+            self.load_devices()
+            return True
+        # Devices_Load exits on a broken file, the daemon must keep working
+        except (Exception, SystemExit) as e:
+            self.logger.error(f"Can't reload devices, keeping old ones: {e}")
+            self.devices_loaded = old_loaded
+            self._created_devices_list = old_devices
+            self._devices_mtime = mtime
+            return False
+
+    def run_daemon(self) -> None:
+        """
+        The function keeps the program running and backs up every device
+        when its interval passes. Devices and parsed inventory stay
+        in memory between cycles, pooled connections only until their
+        idle timeout.
+        """
+        self.logger.info("Starting daemon mode.")
+        try:
+            self.load_devices()
+        except Exception as e:
+            self.logger.error(f"Can't load devices from database.")
+            sys.exit(10)
+        for signal_number in [signal.SIGTERM, signal.SIGINT]:
+            signal.signal(signal_number, self._handle_stop_signal)
+        scheduler: Scheduler = Scheduler(
+            self.run_settings.get("daemon_interval", 86400),
+            self.run_settings.get("daemon_jitter", 0.1),
+            self.run_settings.get("daemon_group_intervals", {}),
+        )
+        scheduler.load(self.scheduled_devices())
+        if self.pool is not None and self.pool.idle_timeout < (
+            self.run_settings.get("daemon_interval", 86400)
+        ):
+            self.logger.info(
+                "Pooled connections are closed after "
+                f"{self.pool.idle_timeout}s, they are reused within "
+                "a cycle, not between cycles."
+            )
+        while not self._stop_event.is_set():
+            if self.reload_devices_if_changed():
+                scheduler.load(self.scheduled_devices())
+            due: set[str] = set(scheduler.pop_due())
+            if len(due) > 0:
+                self.logger.info(f"Backing up {len(due)} devices.")
+                self._run_devices_list = self.order_devices(
+                    [
+                        dev
+                        for dev in self._created_devices_list
+                        if dev.ip in due
+                    ]
+                )
+                self.execute()
+                self.finish_run()
+            self._stop_event.wait(min(scheduler.seconds_to_next(), 60))
+        self.logger.info("Daemon stopped.")
+
+    def scheduled_devices(self) -> dict[str, dict]:
+        """
+        The function returns entries of the devices file backed up
+        by the daemon, only the chosen ones with the selection.
+        """
+        if self.selection is None:
+            return self.devices_loaded.devices_data
+        ips: set[str] = {dev.ip for dev in self._created_devices_list}
+        return {
+            ip: params
+            for ip, params in self.devices_loaded.devices_data.items()
+            if ip in ips
+        }
+
+    def _handle_stop_signal(self, signal_number: int, frame: object) -> None:
+        """The function stops the daemon after the current cycle."""
+        self.logger.info(f"Received signal {signal_number}. Stopping.")
+        self._stop_event.set()
+
+    def start_process_stage(self) -> None:
+        """
+        The function starts the worker processes of the CPU-bound
+        work, when they are used. Workers are started once and kept
+        between daemon cycles.
+        """
+        if self.process_stage is not None or not self.run_settings.get(
+            "process_pool", False
+        ):
+            return
+        try:
+            self._process_stage = ProcessStage(
+                self.run_settings.get("process_workers"),
+                self.run_settings.get("filter_rules", {}),
+                self.run_settings.get("normalize_rules", {}),
+            )
+            self._process_stage.start()
+        except Exception as e:
+            self.logger.error(
+                f"Can't start worker processes: {e}. "
+                "Post-processing in threads."
+            )
+            self._process_stage = None
+
+    def order_devices(self, devices: list[BaseDevice]) -> list[BaseDevice]:
+        """
+        The function returns the devices from the healthiest,
+        devices that often fail are backed up last.
+        """
+        if self.health is None:
+            return devices
+        return self.health.sort(devices)
+
+    def execute(self) -> None:
+        """
+        The function executes the task for the devices of the run
+        and then retries devices that failed with a transient error.
+        """
+        self._report = RunReport()
+        if self.chunk_store is not None:
+            self.chunk_store.begin_run()
+        self.start_process_stage()
+        self.sweep_unreachable()
+        self.run_engine()
+        self.retry_failed()
+
+    def retry_failed(self) -> None:
+        """
+        The function backs up again devices from the retry queue,
+        every one after its backoff, until the queue is empty.
+        """
+        if self.retry_queue is None:
+            return
+        while len(self.retry_queue) > 0 and not self._stop_event.is_set():
+            self._stop_event.wait(self.retry_queue.seconds_to_next())
+            due: list[BaseDevice] = self.retry_queue.pop_due()
+            if len(due) > 0:
+                self.logger.info(f"Retrying backup of {len(due)} devices.")
+                self._run_devices_list = due
+                self.sweep_unreachable()
+                self.run_engine()
+        self.retry_queue.clear()
+
+    def sweep_unreachable(self) -> None:
+        """
+        The function checks with TCP connects which devices of the run
+        answer on their port. Unreachable devices are marked failed
+        at once, only reachable ones are given to the engine.
+        """
+        if self.preflight is None:
+            return
+        if not isinstance(self._run_devices_list, list):
+            self.logger.debug("Devices are streamed. Pre-flight skipped.")
+            return
+        started: float = time.perf_counter()
+        reachable, unreachable = self.preflight.split(self._run_devices_list)
+        self.report.add_run_phase("preflight", time.perf_counter() - started)
+        self.logger.info(
+            f"Pre-flight: {len(reachable)} devices reachable, "
+            f"{len(unreachable)} unreachable."
+        )
+        for dev in unreachable:
+            self.report.set_status(dev.ip, "unreachable")
+            self.record_backup(dev.ip, False)
+            if self.retry_queue is not None and self.retry_queue.add(
+                dev, "unreachable"
+            ):
+                self.logger.info(f"{dev.ip}:Unreachable, retry scheduled.")
+            else:
+                self.logger.warning(f"{dev.ip}:Unreachable. Backup skipped.")
+        self._run_devices_list = reachable
+
+    def run_engine(self) -> None:
+        """
+        The function chooses the engine and executes the task.
+        """
+        if self.run_settings.get("engine", "async") == "async":
+            if ASYNCSSH_AVAILABLE:
+                try:
+                    self.logger.debug("Trying creat object for asyncio.")
+                    self.tasks: AsyncExecution = AsyncExecution(
+                        self.run_settings.get("max_concurrency", 200)
+                    )
+                    self.execute_with_asyncio()
+                    self.logger.info("Backup task is done")
+                    return
+                except Exception as e:
+                    self.logger.error(
+                        f"Can't execute with asyncio: {e}. "
+                        "Falling back to multithreading."
+                    )
+            else:
+                self.logger.warning(
+                    "asyncssh is not installed. Using multithreading."
+                )
         try:
             self.logger.debug("Trying creat object for multithreading.")
             self.tasks: Multithreading = Multithreading()
@@ -129,33 +656,240 @@ class TaskHandler:
             )
             self.execute_without_threading()
 
+    def finish_run(self) -> None:
+        """
+        The function executes work that is done once per run,
+        after all devices are processed.
+        """
+        commited: bool = True
+        if self.git_store is not None:
+            self.logger.debug("Commiting the run to the shared git repo.")
+            started: float = time.perf_counter()
+            commited = self.git_store.commit()
+            self.report.add_run_phase(
+                "git_commit", time.perf_counter() - started
+            )
+            if not commited:
+                # hashes of the staged files must not be saved,
+                # the next run has to stage them again
+                self.logger.error("Can't commit the run to git.")
+                if self.state is not None:
+                    self.state.reload()
+        if self.chunk_store is not None:
+            self.logger.debug("Saving the index of the chunk store.")
+            started: float = time.perf_counter()
+            commited = self.chunk_store.save()
+            self.report.add_run_phase(
+                "store_save", time.perf_counter() - started
+            )
+            if not commited:
+                self.logger.error("Can't save the index of the store.")
+                if self.state is not None:
+                    self.state.reload()
+        if self.state is not None and commited:
+            self.logger.debug("Saving the devices state.")
+            started: float = time.perf_counter()
+            self.state.save()
+            self.report.add_run_phase(
+                "state_save", time.perf_counter() - started
+            )
+        if self.pool is not None:
+            self.pool.close_expired()
+        self.write_report()
+
+    def write_report(self) -> None:
+        """
+        The function logs the summary of the run and writes
+        the json and Prometheus reports, when they are configured.
+        """
+        summary: dict = self.report.summary(
+            self.run_settings.get("report_slowest", 10)
+        )
+        self.logger.info(
+            f"Run finished in {summary['duration_s']}s, "
+            f"{summary['devices']} devices: {summary['statuses']}."
+        )
+        if self.run_settings.get("report_json_path") is not None:
+            self.report.write_json(
+                self.run_settings["report_json_path"], summary
+            )
+        if self.run_settings.get("report_prometheus_path") is not None:
+            self.report.write_prometheus(
+                self.run_settings["report_prometheus_path"], summary
+            )
+
+    def export_store(self, path: Path, git: bool = False) -> bool:
+        """
+        The function exports configurations from the chunk store
+        as plain files or as a git repository with one commit per run.
+
+        :param path: folder of the export.
+        :param git: bool export the git repository.
+        :return: bool done or not.
+        """
+        if self.chunk_store is None:
+            self.logger.error("Export needs the 'chunks' storage backend.")
+            return False
+        try:
+            if git:
+                self.chunk_store.export_git(path)
+            else:
+                self.chunk_store.export_files(path)
+            return True
+        except Exception as e:
+            self.logger.error(f"Can't export the store to {path}: {e}")
+            return False
+
+    def close(self) -> None:
+        """
+        The function releases resources kept between tasks.
+        """
+        if self.pool is not None:
+            self.logger.debug("Closing the connection pool.")
+            self.pool.close_all()
+        self.http_pool.clear()
+        if self.process_stage is not None:
+            self.process_stage.close()
+            self._process_stage = None
+
     def device_database_load(self) -> None:
+        cache: InventoryCache | None = None
+        if self.run_settings.get("inventory_cache", False):
+            cache = InventoryCache(self.devices_config_file)
         self.devices_loaded: Devices_Load = Devices_Load(
-            self.devices_config_file
+            self.devices_config_file, cache=cache
         )
 
     def execute_with_threading(self) -> None:
         """The function that will execute task with multithreading."""
         if self.exe_func == "backup":
             self.logger.debug("Execut task with multithreading.")
-            self.tasks.execute(
-                self.devices_backup, self._created_devices_list
+            devices: Iterable[BaseDevice] = self._run_devices_list
+            if self.limits is not None:
+                devices = self.limits.schedule(devices)
+            self.tasks.execute(self.devices_backup, devices)
+
+    def execute_with_asyncio(self) -> None:
+        """The function that will execute task in the event loop."""
+        if self.exe_func == "backup":
+            self.logger.debug("Execut task with asyncio.")
+            devices: Iterable[BaseDevice] | AsyncIterator[BaseDevice] = (
+                self._run_devices_list
             )
+            if self.limits is not None:
+                self.limits.reset_async()
+                devices = self.limits.async_schedule(devices)
+            self.tasks.execute(self.devices_backup_async, devices)
 
     def execute_without_threading(self) -> None:
         """The function that will execute task without multithreading."""
         if self.exe_func == "backup":
             self.logger.debug("Execut task.")
-            for device in self._created_devices_list:
+            devices: Iterable[BaseDevice] = self._run_devices_list
+            if self.limits is not None:
+                devices = self.limits.schedule(devices)
+            for device in devices:
                 self.devices_backup(device)
 
+    def is_selected(self, ip: str, params: dict) -> bool:
+        """
+        The function checks if the streamed device is selected
+        and remembers its site and AAA server for the limits.
+        """
+        if self.limits is not None:
+            self.limits.register(ip, params)
+        if self.selection is None:
+            return True
+        return self.selection.matches(ip, params, self.state)
+
+    def record_backup(self, ip: str, backup_done: bool) -> None:
+        """
+        The function saves the result of the device backup in the state,
+        used to select devices for the next runs.
+        """
+        if self.state is None:
+            return
+        self.state.set(ip, "last_status", "ok" if backup_done else "failed")
+        self.health.update(ip, backup_done)
+        if backup_done:
+            self.state.set(ip, "last_success", round(time.time()))
+
+    def create_backup_task(self, dev: BaseDevice) -> BackupTask:
+        """
+        The function creates the backup task of the device.
+        Unhealthy devices get the short connect timeout.
+        """
+        connect_timeout: float | None = None
+        if self.health is not None and self.health.is_unhealthy(dev.ip):
+            connect_timeout = self.run_settings.get(
+                "unhealthy_connect_timeout", 5
+            )
+        return BackupTask(
+            dev,
+            self.configs_dir_path,
+            git_store=self.git_store,
+            state=self.state,
+            pool=self.pool,
+            report=self.report,
+            timeout_model=self.timeout_model,
+            read_timeout=self.run_settings.get("read_timeout", 60),
+            pipeline=self.run_settings.get("pipeline", False),
+            process_stage=self.process_stage,
+            connect_timeout=connect_timeout,
+            chunk_store=self.chunk_store,
+            http_pool=self.http_pool,
+            verify_certificates=self.run_settings.get(
+                "verify_certificates", True
+            ),
+            transfer_compression=self.run_settings.get(
+                "transfer_compression", False
+            ),
+            change_probe=self.run_settings.get("change_probe", False),
+        )
+
     def devices_backup(self, dev: BaseDevice) -> None:
         """The function that execute backup task."""
         self.logger.debug("Execut backup task.")
-        backup: BackupTask = BackupTask(dev, self.configs_dir_path)
-        backup_done: bool = backup.make_backup()
+        with (
+            nullcontext() if self.limits is None else self.limits.slot(dev.ip)
+        ):
+            backup: BackupTask = self.create_backup_task(dev)
+            with self.report.span(dev.ip, "total"):
+                backup_done: bool = backup.make_backup()
+        self.record_backup(dev.ip, backup_done)
+        if not backup_done:
+            self.report.set_status(dev.ip, "failed", overwrite=False)
+        if backup_done:
+            return
+        elif self.retry_queue is not None and self.retry_queue.add(
+            dev, backup.error
+        ):
+            self.logger.info(f"{dev.ip}:Backup failed, retry scheduled.")
+        else:
+            self.logger.error(
+                "Something goes wrong while trying create config backup."
+            )
+
+    async def devices_backup_async(self, dev: BaseDevice) -> None:
+        """The function that execute backup task in the event loop."""
+        self.logger.debug("Execut backup task.")
+        async with (
+            nullcontext()
+            if self.limits is None
+            else self.limits.async_slot(dev.ip)
+        ):
+            backup: BackupTask = self.create_backup_task(dev)
+            with self.report.span(dev.ip, "total"):
+                backup_done: bool = await backup.make_backup_async()
+        self.record_backup(dev.ip, backup_done)
+        if not backup_done:
+            self.report.set_status(dev.ip, "failed", overwrite=False)
         if backup_done:
             return
+        elif self.retry_queue is not None and self.retry_queue.add(
+            dev, backup.error
+        ):
+            self.logger.info(f"{dev.ip}:Backup failed, retry scheduled.")
         else:
             self.logger.error(
                 "Something goes wrong while trying create config backup."
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import logging
+from netinfscript.task.device_state import DeviceState
+
+# weight of the last download in the average time
+SMOOTHING: float = 0.3
+# slowest expected reading speed, characters per second
+MIN_READ_RATE: int = 20000
+
+
+class TimeoutModel:
+    """
+    An object that sets the read timeout of every device from the
+    time and size of its previous downloads, stored in the state.
+    Devices without history get the default timeout.
+    """
+
+    def __init__(
+        self,
+        state: DeviceState,
+        default_timeout: float = 60,
+        min_timeout: float = 10,
+        max_timeout: float = 300,
+        factor: float = 3.0,
+    ) -> None:
+        self.logger: logging = logging.getLogger(
+            "netinfscript.task.timeoutmodel"
+        )
+        self._state: DeviceState = state
+        self._default_timeout: float = default_timeout
+        self._min_timeout: float = min_timeout
+        self._max_timeout: float = max_timeout
+        self._factor: float = factor
+
+    @property
+    def state(self) -> DeviceState:
+        """Get the devices state with the history."""
+        return self._state
+
+    def read_timeout(self, ip: str) -> float:
+        """
+        The function returns the read timeout for the device:
+        the average download time times the factor, plus the time
+        of reading the last config size at the slowest speed.
+
+        :param ip: ip of the device.
+        """
+        fetch_seconds: float | None = self.state.get(ip, "fetch_seconds")
+        if fetch_seconds is None:
+            return self._default_timeout
+        config_size: int = self.state.get(ip, "config_size", 0)
+        timeout: float = (
+            self._factor * fetch_seconds + config_size / MIN_READ_RATE
+        )
+        return round(
+            min(max(timeout, self._min_timeout), self._max_timeout), 1
+        )
+
+    def learn(self, ip: str, seconds: float, size: int) -> None:
+        """
+        The function adds the successful download to the history.
+
+        :param ip: ip of the device.
+        :param seconds: time of the command phase.
+        :param size: number of characters of the output.
+        """
+        fetch_seconds: float | None = self.state.get(ip, "fetch_seconds")
+        if fetch_seconds is not None:
+            seconds = SMOOTHING * seconds + (1 - SMOOTHING) * fetch_seconds
+        self.state.set(ip, "fetch_seconds", round(seconds, 3))
+        self.state.set(ip, "config_size", size)
+
+    def learn_timeout(self, ip: str, timeout: float) -> None:
+        """
+        The function raises the history of the device that hit the
+        read timeout, so the next run waits longer for it.
+
+        :param ip: ip of the device.
+        :param timeout: the timeout that was too short.
+        """
+        self.logger.debug(f"{ip}:Read timeout {timeout}s was too short.")
+        self.state.set(
+            ip, "fetch_seconds", round(2 * timeout / self._factor, 3)
+        )
+
+
+if __name__ == "__main__":
+    pass
@@ -12,8 +12,11 @@
 # <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
 # License, Version 3.0.
 
+import hashlib
+import json
 import logging
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 
 
 logger = logging.getLogger("netinfscript.utils")
@@ -33,5 +36,130 @@ def get_and_valid_path(path: str) -> Path | None:
         return None
 
 
+def stream_json_object(
+    file: TextIO, chunk_size: int = 65536
+) -> Iterator[tuple[str, object]]:
+    """
+    The function reads a top level json object in chunks and
+    yields its (key, value) pairs one by one, so the whole
+    file is never kept in memory.
+
+    :param file: opened text file.
+    :param chunk_size: number of characters read at once.
+    :return: iterator of (key, value).
+    """
+    decoder: json.JSONDecoder = json.JSONDecoder()
+    buffer: str = ""
+    pos: int = 0
+    eof: bool = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk: str = file.read(chunk_size)
+        if len(chunk) == 0:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise json.JSONDecodeError("Unexpected end", buffer, pos)
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        if skip_whitespace() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", buffer, pos)
+        pos += 1
+
+    def decode() -> object:
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # the value may continue in the next chunk
+                if end < len(buffer) or not fill():
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+
+    expect("{")
+    if skip_whitespace() == "}":
+        return
+    while True:
+        key: object = decode()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting key", buffer, pos)
+        expect(":")
+        yield key, decode()
+        if skip_whitespace() == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    The function yields lines of the text read in chunks.
+    Lines may be split between chunks. Line endings are removed,
+    the whole text is never split into a list.
+
+    :param chunks: parts of the text, in order.
+    """
+    rest: str = ""
+    for chunk in chunks:
+        if len(rest) > 0:
+            chunk = rest + chunk
+        start: int = 0
+        while True:
+            end: int = chunk.find("\n", start)
+            if end == -1:
+                break
+            if end > start and chunk[end - 1] == "\r":
+                yield chunk[start : end - 1]
+            else:
+                yield chunk[start:end]
+            start = end + 1
+        rest = chunk[start:]
+    if len(rest) > 0:
+        yield rest[:-1] if rest.endswith("\r") else rest
+
+
+class HashingWriter:
+    """
+    An object that writes text to the file and computes
+    the sha256 of the written text at the same time.
+    Without the file only the hash is computed.
+    """
+
+    def __init__(self, file: TextIO | None = None) -> None:
+        self._file: TextIO | None = file
+        self._sha256 = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        """The function writes the text and updates the hash."""
+        self._sha256.update(text.encode())
+        if self._file is None:
+            return len(text)
+        return self._file.write(text)
+
+    def hexdigest(self) -> str:
+        """The function returns the hash of the written text."""
+        return self._sha256.hexdigest()
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+import argparse
+import json
+import sys
+from pathlib import Path
+import pytest
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import bench_backup  # noqa: E402
+from netinfscript.devices.base_device import BaseDevice  # noqa: E402
+from netinfscript.devices.cisco import Cisco  # noqa: E402
+from netinfscript.devices.juniper import Juniper  # noqa: E402
+from netinfscript.devices.mikrotik import Mikrotik  # noqa: E402
+from netinfscript.task.task_handler import TaskHandler  # noqa: E402
+
+DEVICE_CLASSES: dict[str, type[BaseDevice]] = {
+    "cisco": Cisco,
+    "juniper": Juniper,
+    "mikrotik": Mikrotik,
+}
+
+
+def make_device(
+    vendor: str = "cisco",
+    ip: str = "192.0.2.1",
+    name: str | None = "r1",
+    connection: str = "ssh",
+    privilege_cmd: str = "",
+) -> BaseDevice:
+    """The function returns the device object with test credentials."""
+    return DEVICE_CLASSES[vendor](
+        ip=ip,
+        port=22,
+        name=name,
+        vendor=vendor,
+        connection=connection,
+        username="test",
+        password="test",
+        privilege_cmd=privilege_cmd,
+        privilege_password=None,
+        key_file=None,
+        passphrase=None,
+    )
+
+
+class FakeLab:
+    """
+    An object that keeps the fake devices of the benchmark, the devices
+    file and the configs path of one test.
+    """
+
+    def __init__(self, work_dir: Path, **options) -> None:
+        args: argparse.Namespace = argparse.Namespace(
+            devices=options.get("devices", 3),
+            vendors=options.get("vendors", "cisco,juniper,mikrotik"),
+            config_lines=options.get("config_lines", 50),
+            latency=0.0,
+            fail_rate=options.get("fail_rate", 0.0),
+            connection=options.get("connection", "ssh"),
+        )
+        self.network, self.devices_data = bench_backup.build_network(args)
+        self.devices_file: Path = work_dir / "devices.json"
+        self.devices_file.write_text(json.dumps(self.devices_data))
+        self.configs_dir: Path = work_dir / "configs"
+        self.configs_dir.mkdir()
+
+    @property
+    def failing(self) -> int:
+        """Get the number of devices refusing the login."""
+        return sum(len(vendor.failing) for vendor in self.network.vendors)
+
+    def run(self, **run_settings) -> TaskHandler:
+        """The function runs one backup of all devices."""
+        settings: dict = {"engine": "async", "hash_index": True}
+        settings.update(run_settings)
+        task_handler: TaskHandler = TaskHandler(
+            self.devices_file, self.configs_dir, settings
+        )
+        task_handler.exe_func = "backup"
+        task_handler.exec_task()
+        task_handler.close()
+        return task_handler
+
+    def outcomes(self, task_handler: TaskHandler) -> dict:
+        """The function returns the outcomes counted like the benchmark."""
+        return bench_backup.count_outcomes(
+            task_handler.report.summary()["statuses"], self.configs_dir
+        )
+
+    def config_files(self, name: str = "*_conf.txt") -> dict[str, str]:
+        """The function returns stored files, outside of git folders."""
+        return {
+            str(path.relative_to(self.configs_dir)): path.read_text()
+            for path in sorted(self.configs_dir.rglob(name))
+            if ".git" not in path.parts
+        }
+
+
+@pytest.fixture
+def fake_lab(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    The fixture returns a function starting fake devices. Host keys
+    of the devices are trusted through a private HOME.
+    """
+    labs: list[FakeLab] = []
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def start(**options) -> FakeLab:
+        lab: FakeLab = FakeLab(tmp_path, **options)
+        (tmp_path / ".ssh").mkdir(exist_ok=True)
+        (tmp_path / ".ssh" / "known_hosts").write_text(
+            lab.network.known_hosts()
+        )
+        lab.network.start()
+        labs.append(lab)
+        return lab
+
+    yield start
+    for lab in labs:
+        lab.network.stop()
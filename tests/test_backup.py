@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""Backups of the fake devices of the benchmark, end to end."""
+
+import json
+import shutil
+import pytest
+from dulwich import porcelain
+
+
+@pytest.mark.parametrize("engine", ["async", "threading"])
+def test_every_device_is_stored(fake_lab, engine):
+    lab = fake_lab(devices=6)
+    outcomes = lab.outcomes(lab.run(engine=engine))
+    assert (outcomes["ok"], outcomes["failed"], outcomes["empty"]) == (6, 0, 0)
+    files = lab.config_files()
+    assert len(files) == 6
+    assert all(len(text.strip()) > 0 for text in files.values())
+
+
+@pytest.mark.parametrize("engine", ["async", "threading"])
+def test_refused_logins_are_failed_backups(fake_lab, engine):
+    lab = fake_lab(devices=4, vendors="cisco")
+    refused = lab.network.vendors[0].hosts[:2]
+    lab.network.vendors[0].failing.update(refused)
+    task_handler = lab.run(engine=engine)
+    outcomes = lab.outcomes(task_handler)
+    assert (outcomes["ok"], outcomes["failed"]) == (2, 2)
+    state = json.loads(
+        (lab.configs_dir / ".netinfscript_state.json").read_text()
+    )
+    assert {ip for ip in refused if state[ip]["last_status"] == "failed"} == (
+        set(refused)
+    )
+
+
+@pytest.mark.parametrize("engine", ["async", "threading"])
+def test_pipeline_stores_the_same_files(fake_lab, engine):
+    lab = fake_lab(devices=3)
+    settings = {"engine": engine, "change_probe": True}
+    lab.run(**settings)
+    plain = lab.config_files()
+    shutil.rmtree(lab.configs_dir)
+    lab.configs_dir.mkdir()
+    task_handler = lab.run(pipeline=True, **settings)
+    assert task_handler.report.summary()["statuses"] == {"changed": 3}
+    assert lab.config_files() == plain
+    task_handler = lab.run(pipeline=True, **settings)
+    assert task_handler.report.summary()["statuses"] == {"unchanged": 3}
+
+
+def test_async_engine_stores_privileged_devices(fake_lab):
+    lab = fake_lab(devices=6, vendors="cisco")
+    for params in lab.devices_data.values():
+        params["privilege"] = ["enable 15", None]
+    lab.devices_file.write_text(json.dumps(lab.devices_data))
+    task_handler = lab.run(engine="async", max_concurrency=3)
+    outcomes = lab.outcomes(task_handler)
+    assert (outcomes["ok"], outcomes["failed"]) == (6, 0)
+
+
+def test_switch_to_shared_repository_commits_every_device(fake_lab):
+    lab = fake_lab(devices=3)
+    lab.run(git_mode="per_device")
+    task_handler = lab.run(git_mode="shared")
+    assert task_handler.report.summary()["statuses"] == {"changed": 3}
+    repo = porcelain.open_repo(lab.configs_dir)
+    assert len(list(porcelain.ls_files(repo))) == 3
+    task_handler = lab.run(git_mode="shared")
+    assert task_handler.report.summary()["statuses"] == {"unchanged": 3}
+
+
+def test_restconf_stores_only_configuration(fake_lab):
+    lab = fake_lab(devices=3, connection="restconf")
+    outcomes = lab.outcomes(lab.run(verify_certificates=False))
+    assert (outcomes["ok"], outcomes["empty"]) == (3, 0)
+    assert not any("uptime" in text for text in lab.config_files().values())
+
+
+@pytest.mark.parametrize("connection", ["restconf", "netconf"])
+def test_model_driven_connections_store_every_device(fake_lab, connection):
+    lab = fake_lab(devices=3, connection=connection)
+    lab.run(verify_certificates=False)
+    files = lab.config_files()
+    assert len(files) == 3
+    assert all(len(text.strip()) > 0 for text in files.values())
+
+
+def test_api_dump_hides_secrets(fake_lab):
+    lab = fake_lab(devices=2, vendors="mikrotik", connection="api")
+    outcomes = lab.outcomes(lab.run())
+    assert (outcomes["ok"], outcomes["empty"]) == (2, 0)
+    for text in lab.config_files().values():
+        assert "private-key" not in text
+        assert "add name=wg1 listen-port=13231" in text
+        assert "set [ find default-name=ether0 ] name=ether0" in text
+
+
+@pytest.mark.parametrize("connection", ["scp", "sftp"])
+def test_file_transfer_stores_every_device(fake_lab, connection):
+    lab = fake_lab(devices=3, connection=connection)
+    lab.run()
+    files = lab.config_files()
+    assert len(files) == 3
+    assert all(len(text.strip()) > 0 for text in files.values())
+
+
+def test_change_probe_skips_unchanged_devices(fake_lab):
+    lab = fake_lab(devices=3)
+    lab.run(change_probe=True)
+    task_handler = lab.run(change_probe=True)
+    assert task_handler.report.summary()["statuses"] == {"unchanged": 3}
+    state = json.loads(
+        (lab.configs_dir / ".netinfscript_state.json").read_text()
+    )
+    markers = {
+        params["vendor"]: state[ip]["change_marker"]
+        for ip, params in lab.devices_data.items()
+    }
+    assert markers["cisco"] == "1736071200"
+    assert all(marker is not None for marker in markers.values())
+
+
+def test_preflight_marks_closed_ports_unreachable(fake_lab):
+    lab = fake_lab(devices=3, vendors="cisco")
+    closed = dict(next(iter(lab.devices_data.values())), port=1)
+    lab.devices_data["127.9.0.1"] = closed
+    lab.devices_file.write_text(json.dumps(lab.devices_data))
+    task_handler = lab.run(preflight=True, retries=0)
+    assert task_handler.report.summary()["statuses"] == {
+        "changed": 3,
+        "unreachable": 1,
+    }
+
+
+def test_site_limits_store_every_device(fake_lab):
+    lab = fake_lab(devices=6)
+    for i, params in enumerate(lab.devices_data.values()):
+        params["site"] = "busy" if i < 4 else f"site-{i}"
+    lab.devices_file.write_text(json.dumps(lab.devices_data))
+    for engine in ["async", "threading"]:
+        task_handler = lab.run(
+            engine=engine, max_concurrency=2, limit_per_site=1
+        )
+        outcomes = lab.outcomes(task_handler)
+        assert (outcomes["ok"], outcomes["failed"]) == (6, 0)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""Filters and change markers of the vendors, the RouterOS dump."""
+
+import io
+import pytest
+from netinfscript.connections.conn_routeros import ConnRouterOS
+from netinfscript.connections.conn_ssh import ConnSSH
+from netinfscript.devices.normalize_rules import NormalizeRules
+from conftest import make_device
+
+CISCO_CONFIG: str = (
+    "Building configuration...\r\n"
+    "\r\n"
+    "Current configuration : 1234 bytes\r\n"
+    "!\r\n"
+    "!\r\n"
+    "hostname r1\r\n"
+    "ntp clock-period 17179865\r\n"
+    "end\r\n"
+)
+
+
+def test_cisco_filter_drops_volatile_lines():
+    dev = make_device("cisco")
+    config = dev.config_filternig(CISCO_CONFIG)
+    assert "Building configuration" not in config
+    assert "Current configuration" not in config
+    assert "hostname r1" in config
+    assert "17179865" not in config
+
+
+@pytest.mark.parametrize("vendor", ["cisco", "juniper", "mikrotik"])
+def test_filter_in_chunks_is_the_same(vendor):
+    dev = make_device(vendor)
+    sink = io.StringIO()
+    chunks = [CISCO_CONFIG[i : i + 7] for i in range(0, len(CISCO_CONFIG), 7)]
+    dev.write_filtered(chunks, sink, batch_size=2)
+    assert sink.getvalue() == dev.config_filternig(CISCO_CONFIG)
+
+
+def test_rules_of_the_config_are_added_to_the_vendor():
+    dev = make_device("cisco")
+    try:
+        # rules that aren't valid regular expressions are skipped
+        type(dev).compile_filter({"drop": ["^hostname", "("]})
+        config = dev.config_filternig(CISCO_CONFIG)
+        assert "hostname r1" not in config
+        assert "Building configuration" not in config
+    finally:
+        type(dev).compile_filter()
+    assert "hostname r1" in dev.config_filternig(CISCO_CONFIG)
+
+
+@pytest.mark.parametrize(
+    "vendor, header, config",
+    [
+        (
+            "juniper",
+            "## Last commit: 2026-01-05 10:00:00 UTC by bench",
+            "set system host-name r1",
+        ),
+        (
+            "juniper",
+            "## Last changed: 2026-01-05 10:00:00 UTC",
+            "version 23.2R1.14;",
+        ),
+        (
+            "mikrotik",
+            "# 2026-01-05 10:00:00 by RouterOS 7.14",
+            "/system identity",
+        ),
+        (
+            "mikrotik",
+            "# jan/05/2026 10:00:00 by RouterOS 6.49.10",
+            "set name=r1",
+        ),
+    ],
+)
+def test_vendor_normalize_rules_drop_export_time(vendor, header, config):
+    dev = make_device(vendor)
+    normalizer = NormalizeRules.merge(type(dev).normalize_rules)
+    assert list(normalizer.apply([header, config])) == [config]
+
+
+def test_cisco_change_marker():
+    dev = make_device("cisco")
+    assert dev.change_marker("Configuration ID : 1736071200\r\n") == (
+        "1736071200"
+    )
+    invalid = "            ^\r\n% Invalid input detected at '^' marker.\r\n"
+    assert dev.change_marker(invalid) is None
+
+
+def test_marker_without_pattern_is_hash_of_output():
+    dev = make_device("mikrotik")
+    assert dev.change_marker("") is None
+    assert dev.change_marker("a\r\n") == dev.change_marker("a")
+    assert dev.change_marker("a") != dev.change_marker("b")
+
+
+def test_ssh_enters_privilege_mode_with_its_command():
+    class Session:
+        enabled_with: str | None = None
+
+        def check_enable_mode(self) -> bool:
+            return False
+
+        def enable(self, cmd: str) -> None:
+            self.enabled_with = cmd
+
+    conn = ConnSSH(make_device(privilege_cmd="enable 5"), "show run")
+    conn._connection = Session()
+    conn._set_privilege()
+    assert conn._connection.enabled_with == "enable 5"
+    assert conn.privilege_cmd == "enable 5"
+
+
+def test_restconf_asks_only_for_configuration():
+    for vendor in ["cisco", "juniper", "mikrotik"]:
+        dev = make_device(vendor, connection="restconf")
+        assert dev.restconf_path.endswith("?content=config")
+
+
+def test_routeros_dump():
+    conn = ConnRouterOS(make_device("mikrotik", connection="api"))
+    dump = conn.render(
+        {
+            "/interface ethernet": [
+                {".id": "*1", "name": "wan", "default-name": "ether1"},
+            ],
+            "/interface wireguard": [
+                {".id": "*2", "name": "wg1", "private-key": "secret"},
+            ],
+            "/ip address": [
+                {
+                    ".id": "*3",
+                    "address": "192.0.2.1/24",
+                    "dynamic": "false",
+                    "invalid": "false",
+                    "running": "true",
+                },
+                {".id": "*4", "address": "198.51.100.1/24", "dynamic": "true"},
+            ],
+            "/ip dhcp-client": [
+                {".id": "*5", "interface": "wan", "address": "203.0.113.7"},
+            ],
+            "/ip service": [
+                {".id": "*6", "name": "telnet", "disabled": "yes"},
+            ],
+            "/snmp community": [
+                {".id": "*7", "name": "public", "default": "true"},
+            ],
+            "/user group": [{".id": "*8", "name": "full", "builtin": "true"}],
+            "/ip dns": [{"servers": "192.0.2.53"}],
+            "/routing bgp connection": None,
+        }
+    )
+    assert dump.splitlines() == [
+        "/interface ethernet",
+        "set [ find default-name=ether1 ] name=wan",
+        "/interface wireguard",
+        "add name=wg1",
+        "/ip address",
+        "add address=192.0.2.1/24",
+        "/ip dhcp-client",
+        "add interface=wan",
+        "/ip service",
+        "set [ find name=telnet ] disabled=yes",
+        "/snmp community",
+        "set [ find default=yes ] name=public",
+        "/ip dns",
+        "set servers=192.0.2.53",
+    ]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""Inventory cache of the devices file."""
+
+import json
+import stat
+from netinfscript.agent.devices_load import Devices_Load
+from netinfscript.agent.inventory_cache import InventoryCache
+
+
+def write_devices(path, key_file):
+    path.write_text(
+        json.dumps(
+            {
+                "192.0.2.1": {
+                    "name": "r1",
+                    "vendor": "cisco",
+                    "port": None,
+                    "connection": "ssh",
+                    "username": "admin",
+                    "password": "secret",
+                    "privilege": None,
+                    "key_file": str(key_file),
+                    "passphrase": None,
+                }
+            }
+        )
+    )
+
+
+def load(devices_file):
+    loaded = Devices_Load(devices_file, cache=InventoryCache(devices_file))
+    return loaded, loaded.create_all_devices()
+
+
+def test_cache_is_private_and_out_of_configs(tmp_path):
+    configs_dir = tmp_path / "configs"
+    configs_dir.mkdir()
+    devices_file = tmp_path / "devices.json"
+    write_devices(devices_file, tmp_path / "key")
+    load(devices_file)
+    cache = tmp_path / ".devices.json.cache"
+    assert stat.S_IMODE(cache.stat().st_mode) == 0o600
+    assert list(configs_dir.iterdir()) == []
+
+
+def test_cache_is_used_until_the_file_changes(tmp_path):
+    devices_file = tmp_path / "devices.json"
+    key_file = tmp_path / "key"
+    key_file.write_text("key")
+    write_devices(devices_file, key_file)
+    loaded, devices = load(devices_file)
+    assert loaded._cached_parametrs is None
+    loaded, cached_devices = load(devices_file)
+    assert loaded._cached_parametrs is not None
+    assert cached_devices[0].key_file == devices[0].key_file == key_file
+    assert cached_devices[0].password == "secret"
+    write_devices(devices_file, tmp_path / "other")
+    loaded, devices = load(devices_file)
+    assert loaded._cached_parametrs is None
+    assert devices[0].key_file is None
+
+
+def test_key_file_created_later_rebuilds_the_cache(tmp_path):
+    devices_file = tmp_path / "devices.json"
+    key_file = tmp_path / "key"
+    write_devices(devices_file, key_file)
+    _, devices = load(devices_file)
+    assert devices[0].key_file is None
+    loaded, _ = load(devices_file)
+    assert loaded._cached_parametrs is not None
+    key_file.write_text("key")
+    loaded, devices = load(devices_file)
+    assert loaded._cached_parametrs is None
+    assert devices[0].key_file == key_file
+    loaded, devices = load(devices_file)
+    assert loaded._cached_parametrs is not None
+    assert devices[0].key_file == key_file
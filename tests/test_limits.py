@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+
+"""Site and AAA limits."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from netinfscript.task.limits import ConcurrencyLimits, TokenBucket
+
+
+def limits_of_sites(sites: dict[str, str]) -> ConcurrencyLimits:
+    """The function returns limits of one device per site."""
+    limits = ConcurrencyLimits(per_site=1)
+    limits.register_all({ip: {"site": site} for ip, site in sites.items()})
+    return limits
+
+
+def test_places_are_taken_and_given_back():
+    limits = limits_of_sites({"a1": "a", "a2": "a", "b1": "b"})
+    assert limits.try_acquire("a1")
+    assert not limits.try_acquire("a2")
+    assert limits.try_acquire("b1")
+    # devices without a site have no limit
+    assert limits.try_acquire("other")
+    limits.release("a1")
+    assert limits.try_acquire("a2")
+
+
+def test_site_limit_overrides_per_site():
+    limits = ConcurrencyLimits(per_site=1, site_limits={"big": 2})
+    limits.register_all({"1": {"group": "Big"}, "2": {"group": "big"}})
+    assert limits.try_acquire("1") and limits.try_acquire("2")
+
+
+def test_schedule_puts_busy_site_aside():
+    limits = limits_of_sites({"a1": "a", "a2": "a", "b1": "b"})
+    devices = [SimpleNamespace(ip=ip) for ip in ["a1", "a2", "b1"]]
+    schedule = limits.schedule(devices)
+    assert next(schedule).ip == "a1"
+    # a2 waits for its site, b1 isn't kept behind it
+    assert next(schedule).ip == "b1"
+    timer = threading.Timer(0.1, limits.release, ["a1"])
+    timer.start()
+    assert next(schedule).ip == "a2"
+    assert next(schedule, None) is None
+
+
+def test_async_schedule_puts_busy_site_aside():
+    limits = limits_of_sites({"a1": "a", "a2": "a", "b1": "b"})
+    devices = [SimpleNamespace(ip=ip) for ip in ["a1", "a2", "b1"]]
+
+    async def run() -> list[str]:
+        handed: list[str] = []
+        async for dev in limits.async_schedule(devices):
+            handed.append(dev.ip)
+            if dev.ip == "b1":
+                asyncio.get_running_loop().call_later(
+                    0.1, limits.release, "a1"
+                )
+        return handed
+
+    limits.reset_async()
+    assert asyncio.run(run()) == ["a1", "b1", "a2"]
+
+
+def test_token_bucket_spreads_connections():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.05 < bucket.reserve() <= 0.1
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""Retries and backoff of failed devices."""
+
+from netinfscript.task.retry_queue import RetryQueue
+from conftest import make_device
+
+
+def test_only_transient_errors_are_retried():
+    queue = RetryQueue(retries=2, backoff=0, jitter=0)
+    dev = make_device()
+    assert not queue.add(dev, "auth")
+    assert not queue.add(dev, None)
+    assert queue.add(dev, "timeout")
+    assert queue.add(dev, "unreachable")
+    assert not queue.add(dev, "timeout")
+    assert queue.pop_due() == [dev, dev]
+    assert len(queue) == 0
+
+
+def test_retry_backoff_grows_to_the_max():
+    queue = RetryQueue(backoff=5, backoff_max=12, jitter=0)
+    assert [queue.delay(attempt) for attempt in [1, 2, 3]] == [5, 10, 12]
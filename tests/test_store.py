@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2025 Mateusz Krupczyński
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the licenses; if not, see
+# <http://www.gnu.org/licenses/> for a copy of the GNU General Public License
+# License, Version 3.0.
+
+"""Storage of the configurations and the device state."""
+
+import hashlib
+from dulwich import porcelain
+from netinfscript.task.backup_task import BackupTask
+from netinfscript.task.chunk_store import ChunkStore
+from netinfscript.task.device_state import DeviceState
+from netinfscript.task.git_store import GitStore
+from conftest import make_device
+
+
+def test_shared_repository_has_one_commit_per_run(tmp_path):
+    store = GitStore(tmp_path)
+    for ip in ["192.0.2.1", "192.0.2.2"]:
+        (tmp_path / ip).mkdir()
+        (tmp_path / ip / f"{ip}_conf.txt").write_text(f"hostname {ip}\n")
+        store.stage(tmp_path / ip / f"{ip}_conf.txt")
+    assert store.commit()
+    assert store.staged_files == []
+    repo = porcelain.open_repo(tmp_path)
+    head = repo.head()
+    assert len(list(porcelain.ls_files(repo))) == 2
+    # the same files are not a new commit
+    store.stage(tmp_path / "192.0.2.1" / "192.0.2.1_conf.txt")
+    assert store.commit()
+    assert repo.head() == head
+    (tmp_path / "192.0.2.1" / "192.0.2.1_conf.txt").write_text("end\n")
+    store.stage(tmp_path / "192.0.2.1" / "192.0.2.1_conf.txt")
+    assert store.commit()
+    assert repo[repo.head()].parents == [head]
+    repo.close()
+
+
+def test_state_is_kept_between_runs(tmp_path):
+    state = DeviceState(tmp_path)
+    state.set("192.0.2.1", "config_hash", "abc")
+    assert state.save()
+    assert DeviceState(tmp_path).get("192.0.2.1", "config_hash") == "abc"
+    state.set("192.0.2.1", "config_hash", "def")
+    state.reload()
+    assert state.get("192.0.2.1", "config_hash") == "abc"
+
+
+def test_broken_state_file_starts_empty(tmp_path):
+    state = DeviceState(tmp_path)
+    state.state_file_path.write_text("{broken")
+    assert DeviceState(tmp_path).get("192.0.2.1", "config_hash") is None
+
+
+def test_same_hash_and_stored_file_is_unchanged(tmp_path):
+    state = DeviceState(tmp_path)
+    backup = BackupTask(make_device(), tmp_path, state=state)
+    state.set(backup.dev.ip, "config_hash", "abc")
+    # the stored file was removed
+    assert not backup.config_unchanged("abc")
+    backup.config_dir_path.mkdir()
+    backup.config_file_path.write_text("hostname r1")
+    assert backup.config_unchanged("abc")
+    assert not backup.config_unchanged("def")
+    assert not BackupTask(make_device(), tmp_path).config_unchanged("abc")
+
+
+def test_unchanged_config_is_not_written(tmp_path, monkeypatch):
+    state = DeviceState(tmp_path)
+    config = "hostname r1\r\nend\r\n"
+    assert BackupTask(make_device(), tmp_path, state=state)._process_output(
+        config
+    )
+    backup = BackupTask(make_device(), tmp_path, state=state)
+
+    def write(output):
+        raise AssertionError("the file was written")
+
+    monkeypatch.setattr(backup, "filter_to_file", write)
+    assert backup._process_output(config)
+    assert not backup.tmp_file_path.exists()
+
+
+def test_hash_of_other_storage_mode_is_a_change(tmp_path):
+    state = DeviceState(tmp_path)
+    backup = BackupTask(make_device(), tmp_path, state=state)
+    backup.make_config_dir()
+    backup.config_file_path.write_text("hostname r1")
+    state.set(backup.dev.ip, "config_hash", "abc")
+    # entries of older versions have no storage mode
+    assert backup.config_unchanged("abc")
+    shared = BackupTask(
+        make_device(), tmp_path, state=state, git_store=GitStore(tmp_path)
+    )
+    assert shared.storage_mode == "shared"
+    assert not shared.config_unchanged("abc")
+    state.set(backup.dev.ip, "storage_mode", "shared")
+    assert shared.config_unchanged("abc")
+    assert not backup.config_unchanged("abc")
+
+
+def test_chunk_store_versions(tmp_path):
+    store = ChunkStore(tmp_path)
+    text = b"".join(
+        b"interface %d\n description link\n" % i for i in range(500)
+    )
+    source = tmp_path / "config.txt"
+    source.write_bytes(text)
+    config_hash = hashlib.sha256(text).hexdigest()
+    assert store.put("r1/r1_conf.txt", source, config_hash)
+    # the same text is not a new version
+    assert store.put("r1/r1_conf.txt", source, config_hash)
+    source.write_bytes(text + b"end\n")
+    assert store.put("r1/r1_conf.txt", source, "other")
+    assert store.save()
+    reopened = ChunkStore(tmp_path)
+    assert reopened.has("r1/r1_conf.txt")
+    assert not reopened.has("r2/r2_conf.txt")
+    assert reopened.read("r1/r1_conf.txt", 0) == text
+    assert reopened.read("r1/r1_conf.txt") == text + b"end\n"
+    assert reopened.read("r1/r1_conf.txt", 1) == text + b"end\n"
+
+
+def test_chunk_store_keeps_shared_chunks_once(tmp_path):
+    store = ChunkStore(tmp_path)
+    text = b"".join(b"line %d of the template\n" % i for i in range(5000))
+    source = tmp_path / "config.txt"
+    source.write_bytes(text)
+    config_hash = hashlib.sha256(text).hexdigest()
+    store.put("r1/r1_conf.txt", source, config_hash)
+    pack = tmp_path / ".netinfscript_store" / "chunks.pack"
+    size = pack.stat().st_size
+    store.put("r2/r2_conf.txt", source, config_hash)
+    assert pack.stat().st_size == size
+    assert store.read("r2/r2_conf.txt") == text
+
+
+def test_chunk_store_exports_files(tmp_path):
+    store = ChunkStore(tmp_path / "configs")
+    source = tmp_path / "config.txt"
+    source.write_text("hostname r1\n")
+    store.put("r1/r1_conf.txt", source, "abc")
+    assert store.export_files(tmp_path / "export") == 1
+    assert (tmp_path / "export" / "r1" / "r1_conf.txt").read_text() == (
+        "hostname r1\n"
+    )